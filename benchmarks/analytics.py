@@ -0,0 +1,74 @@
+"""Compare the usage ledger's pure Python and NumPy group-bys.
+
+Usage: python benchmarks/analytics.py [turns ...]
+
+Fills a UsageLedger with synthetic turns (three models, a skill event
+every 40 turns after an overhead segment of 10, a new session every
+2,000) and times each breakdown from scratch with every installed
+analytics backend, at 10k, 100k and 1M turns by default. This is what
+the Aggregator pays when pricing changes; merges only pass over new rows.
+"""
+import random
+import sys
+import time
+
+import superpowers_dashboard.ledger as ledger
+from superpowers_dashboard.analytics import _select_backend
+from superpowers_dashboard.config import DEFAULT_PRICING
+
+MODELS = list(DEFAULT_PRICING)
+START_MS = 1_770_000_000_000
+
+VIEWS = {
+    "by skill event": lambda usage: usage.by_skill_event(),
+    "by model": lambda usage: usage.by_model(),
+    "by session": lambda usage: usage.by_session(),
+    "by hour": lambda usage: usage.by_hour(),
+    "cost by skill event": lambda usage: usage.costs_by("skill_event", DEFAULT_PRICING),
+    "cost by segment": lambda usage: usage.costs_by("segment", DEFAULT_PRICING),
+    "cost by model": lambda usage: usage.costs_by("model", DEFAULT_PRICING),
+    "cost by session": lambda usage: usage.costs_by("session", DEFAULT_PRICING),
+}
+
+
+def build(turns: int) -> ledger.UsageLedger:
+    rng = random.Random(0)
+    usage = ledger.UsageLedger()
+    for t in range(turns):
+        overhead = t % 40 < 10
+        usage.append(
+            START_MS + t * 15_000, MODELS[rng.randrange(3)], f"session-{t // 2000}",
+            ledger.OVERHEAD if overhead else t // 40, t // 40 if overhead else ledger.NO_SEGMENT,
+            rng.randrange(1, 2000), rng.randrange(1, 4000), rng.randrange(150_000), rng.randrange(20_000),
+        )
+    usage.column("ts_ms")  # move the last batch into the columns
+    return usage
+
+
+def best_ms(view, usage) -> float:
+    times = []
+    for _ in range(3):
+        usage._views.clear()  # time a full pass, not the remembered result
+        start = time.perf_counter()
+        view(usage)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    backends = [b for b in ("python", "numpy") if _select_backend(b)[0] == b]
+    for turns in sizes:
+        usage = build(turns)
+        print(f"{turns:,} turns ({usage.nbytes / 1e6:.1f} MB of columns), ms")
+        print(f"  {'':<20}" + "".join(f"{b:>10}" for b in backends))
+        for name, view in VIEWS.items():
+            row = []
+            for backend in backends:
+                _, ledger.group_sums, ledger.group_costs = _select_backend(backend)
+                row.append(best_ms(view, usage))
+            print(f"  {name:<20}" + "".join(f"{ms:10.1f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
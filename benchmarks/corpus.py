@@ -0,0 +1,78 @@
+"""Synthetic Claude Code session corpus for benchmarks.
+
+The mix mirrors real transcripts: assistant turns with usage and tool calls,
+multi-kilobyte user tool_result entries (file reads, command output),
+streaming progress entries, hook progress, turn durations, file-history
+snapshots, periodic skill invocations and Task dispatches.
+"""
+import json
+import random
+from pathlib import Path
+
+MODELS = ["claude-opus-4-6", "claude-haiku-4-5-20251001", "claude-sonnet-4-5-20250929"]
+TOOLS = ["Read", "Bash", "Grep", "Edit", "Glob"]
+
+
+def write_session(path: Path, turns: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    with open(path, "w") as fh:
+        def emit(entry):
+            fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+        for t in range(turns):
+            ts = f"2026-02-{1 + seed % 28:02d}T{t // 3600 % 24:02d}:{t // 60 % 60:02d}:{t % 60:02d}.000Z"
+            if t % 40 == 0:
+                tid = f"toolu_skill_{seed}_{t}"
+                emit({"type": "assistant", "message": {"model": MODELS[0], "content": [
+                    {"type": "tool_use", "id": tid, "name": "Skill", "input": {"skill": "superpowers:brainstorming", "args": "idea"}}],
+                    "usage": {"input_tokens": 10, "output_tokens": 5}}, "timestamp": ts})
+                emit({"type": "user", "message": {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": tid, "content": "Launching skill: superpowers:brainstorming"}]}, "timestamp": ts})
+                emit({"type": "user", "isMeta": True, "message": {"role": "user", "content": [
+                    {"type": "text", "text": "# brainstorming\n" + "skill body " * 400}]}, "timestamp": ts})
+            if t % 25 == 5:
+                tid = f"toolu_task_{seed}_{t}"
+                emit({"type": "assistant", "message": {"model": MODELS[0], "content": [
+                    {"type": "tool_use", "id": tid, "name": "Task", "input": {
+                        "description": f"Implement Task {t // 25}: part", "subagent_type": "general-purpose",
+                        "model": "sonnet", "prompt": "Do the thing " * 200}}],
+                    "usage": {"input_tokens": 20, "output_tokens": 40}}, "timestamp": ts})
+                emit({"type": "user", "message": {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": tid, "content": [
+                        {"type": "text", "text": "Summary of work\n" * 200},
+                        {"type": "text", "text": f"agentId: {seed:03x}{t:05x} (for resuming to continue this agent's work if needed)"}]}]},
+                    "timestamp": ts})
+            tid = f"toolu_{seed}_{t}"
+            emit({"parentUuid": "p", "isSidechain": False, "userType": "external", "cwd": "/work/project",
+                  "sessionId": "session", "version": "2.1.0", "gitBranch": "main",
+                  "message": {"model": rng.choice(MODELS), "id": "msg", "type": "message", "role": "assistant", "content": [
+                      {"type": "text", "text": "Let me look at that. " * 30},
+                      {"type": "tool_use", "id": tid, "name": rng.choice(TOOLS), "input": {"file_path": "/work/project/module.py"}}],
+                      "stop_reason": "tool_use",
+                      "usage": {"input_tokens": rng.randint(1, 500), "output_tokens": rng.randint(1, 900),
+                                "cache_read_input_tokens": rng.randint(0, 90000), "cache_creation_input_tokens": rng.randint(0, 2000)}},
+                  "requestId": "req", "type": "assistant", "uuid": "u", "timestamp": ts})
+            emit({"parentUuid": "p", "isSidechain": False, "userType": "external", "cwd": "/work/project",
+                  "sessionId": "session", "version": "2.1.0", "gitBranch": "main", "type": "user",
+                  "message": {"role": "user", "content": [
+                      {"type": "tool_result", "tool_use_id": tid, "content": "    line of source code here\n" * rng.randint(50, 3000)}]},
+                  "toolUseResult": {"stdout": "x" * rng.randint(100, 20000), "stderr": ""},
+                  "uuid": "u", "timestamp": ts})
+            for _ in range(3):
+                emit({"type": "progress", "data": {"type": "bash_progress", "output": "o" * 200}, "toolUseID": tid, "timestamp": ts})
+            if t % 10 == 0:
+                emit({"type": "progress", "data": {"type": "hook_progress", "hookEventName": "PreToolUse", "hookType": "command"}, "timestamp": ts})
+            emit({"type": "system", "subtype": "turn_duration", "durationMs": rng.randint(500, 90000), "timestamp": ts})
+            emit({"type": "file-history-snapshot", "messageId": "m", "snapshot": {"trackedFileBackups": {"a.py": "b" * 500}}})
+
+
+def build_corpus(directory: Path, files: int = 4, turns: int = 1500) -> list[Path]:
+    """Write ``files`` sessions into ``directory`` (reusing them if present)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(files):
+        path = directory / f"session-{i:03d}.jsonl"
+        if not path.exists():
+            write_session(path, turns, seed=i)
+        paths.append(path)
+    return paths
@@ -0,0 +1,51 @@
+"""Measure JSONL ingestion throughput (MB/s) of SessionParser.
+
+Usage: python benchmarks/ingest.py [corpus_dir]
+
+Compares the stdlib decoder with and without the byte-level prefilter, and
+any faster decoder backend that is installed.
+"""
+import importlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from corpus import build_corpus
+
+import superpowers_dashboard.decoding as decoding
+import superpowers_dashboard.watcher as watcher
+from superpowers_dashboard.tail import TailReader
+
+
+def ingest(paths: list[Path], prefilter: bool) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        parser = watcher.SessionParser()
+        if not prefilter:
+            parser.wants_line = lambda line: True
+        with TailReader(path) as reader:
+            for line in reader.iter_lines():
+                parser.process_line(line)
+    return time.perf_counter() - start
+
+
+def main():
+    corpus_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(tempfile.gettempdir()) / "superdash-bench-corpus"
+    paths = build_corpus(corpus_dir)
+    total_mb = sum(p.stat().st_size for p in paths) / 1e6
+    print(f"corpus: {len(paths)} files, {total_mb:.0f} MB")
+    for backend in ["json", "orjson", "msgspec"]:
+        name, loads, errors = decoding._select_backend(backend)
+        if name != backend:
+            continue
+        watcher.loads, watcher.DECODE_ERRORS = loads, errors
+        for prefilter in (False, True):
+            best = min(ingest(paths, prefilter) for _ in range(3))
+            label = f"{backend:<8} prefilter={'on ' if prefilter else 'off'}"
+            print(f"  {label}  {total_mb / best:7.0f} MB/s  ({best:.2f}s)")
+    importlib.reload(watcher)
+
+
+if __name__ == "__main__":
+    main()
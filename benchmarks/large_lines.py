@@ -0,0 +1,58 @@
+"""Measure peak memory while ingesting very long JSONL lines.
+
+Usage: python benchmarks/large_lines.py [megabytes]
+
+Writes a session whose assistant and user lines each carry a single huge
+string (as a large file read or base64 image would), then parses it with and
+without the streaming path for oversized lines and reports the tracemalloc
+peak of each run.
+"""
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from superpowers_dashboard.tail import DEFAULT_MAX_LINE_BYTES, TailReader
+from superpowers_dashboard.watcher import SessionParser
+
+
+def write_session(path: Path, megabytes: int) -> None:
+    blob = "line of file content\n" * (megabytes * (1 << 20) // 21)
+    with open(path, "w") as fh:
+        fh.write(json.dumps({"type": "assistant", "message": {"model": "claude-opus-4-6", "content": [
+            {"type": "tool_use", "id": "toolu_task", "name": "Task", "input": {"description": "d", "prompt": blob}}],
+            "usage": {"input_tokens": 10, "output_tokens": 5}}, "timestamp": "2026-02-07T10:00:00.000Z"}) + "\n")
+        fh.write(json.dumps({"type": "user", "message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": "toolu_task", "content": blob + "agentId: abc123 (for resuming)"}]},
+            "toolUseResult": {"content": blob}, "timestamp": "2026-02-07T10:00:01.000Z"}) + "\n")
+
+
+def measure(path: Path, max_line_bytes: int) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    parser = SessionParser()
+    with TailReader(path, max_line_bytes=max_line_bytes) as reader:
+        for line in reader.iter_lines():
+            parser.process_line(line)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert parser.agent_id_map == {"toolu_task": "abc123"}
+    return peak / 1e6, elapsed
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    path = Path(tempfile.gettempdir()) / f"superdash-large-lines-{megabytes}.jsonl"
+    if not path.exists():
+        write_session(path, megabytes)
+    print(f"session: {path.stat().st_size / 1e6:.0f} MB in 2 lines")
+    for label, limit in [("whole-line decode", 1 << 62), ("streaming", DEFAULT_MAX_LINE_BYTES)]:
+        peak, elapsed = measure(path, limit)
+        print(f"  {label:<18} peak {peak:8.1f} MB  ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
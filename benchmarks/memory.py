@@ -0,0 +1,198 @@
+"""Measure bytes per retained event at 100k events.
+
+Usage: python benchmarks/memory.py [count]
+
+Builds ``count`` events of each kind from freshly decoded JSON values, as
+ingestion does, and reports tracemalloc bytes per event for the parser's
+slotted classes (names interned, models as a bitmask) and for plain
+dataclasses with a per-instance __dict__ and a models set, as they were,
+plus the usage ledger's cost per assistant turn.
+"""
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+
+from superpowers_dashboard.ledger import OVERHEAD, UsageLedger
+from superpowers_dashboard.timestamps import stamp
+from superpowers_dashboard.watcher import CompactionEvent, OverheadSegment, SkillEvent, SubagentDetail, SubagentEvent
+
+MODELS = ["claude-opus-4-6", "claude-haiku-4-5-20251001", "claude-sonnet-4-5-20250929"]
+
+
+@dataclass
+class PlainSkillEvent:
+    skill_name: str
+    args: str
+    timestamp: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    models: set = field(default_factory=set)
+    duration_ms: int = 0
+    ts_ms: int = field(default=0, init=False)
+    clock: str = field(default="", init=False)
+
+    def __post_init__(self):
+        self.ts_ms, self.clock = stamp(self.timestamp)
+
+
+@dataclass
+class PlainCompactionEvent:
+    timestamp: str
+    pre_tokens: int
+    trigger: str
+    kind: str = "compaction"
+    ts_ms: int = field(default=0, init=False)
+    clock: str = field(default="", init=False)
+
+    def __post_init__(self):
+        self.ts_ms, self.clock = stamp(self.timestamp)
+
+
+@dataclass
+class PlainSubagentEvent:
+    timestamp: str
+    description: str
+    subagent_type: str
+    model: str
+    tool_use_id: str = ""
+    detail: object = None
+    role: str = ""
+    status: str = "running"
+    session_id: str = ""
+    ts_ms: int = field(default=0, init=False)
+    clock: str = field(default="", init=False)
+
+    def __post_init__(self):
+        self.ts_ms, self.clock = stamp(self.timestamp)
+
+
+@dataclass
+class PlainSubagentDetail:
+    agent_id: str
+    skills_invoked: list = field(default_factory=list)
+    tool_counts: dict = field(default_factory=dict)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    duration_ms: int = 0
+    cost: float = 0.0
+    finished: bool = False
+
+
+@dataclass
+class PlainOverheadSegment:
+    timestamp: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    duration_ms: int = 0
+    tool_count: int = 0
+    ts_ms: int = field(default=0, init=False)
+    clock: str = field(default="", init=False)
+
+    def __post_init__(self):
+        self.ts_ms, self.clock = stamp(self.timestamp)
+
+
+def records(count: int) -> list[dict]:
+    """Decoded per-event values; every string is a separate copy, as from JSON."""
+    lines = [json.dumps({
+        "skill": "brainstorming", "args": f"idea {i}", "model": MODELS[i % 3], "model2": MODELS[(i + 1) % 3],
+        "timestamp": f"2026-02-07T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}.{i % 1000:03d}Z",
+        "description": f"Implement Task {i}: part", "subagent_type": "general-purpose", "trigger": "auto",
+        "tool_use_id": f"toolu_{i:020d}", "agent_id": f"{i:016x}",
+    }) for i in range(count)]
+    return [json.loads(line) for line in lines]
+
+
+def skill_events(recs, slotted):
+    events = []
+    for r in recs:
+        if slotted:
+            event = SkillEvent(skill_name=sys.intern(r["skill"]), args=r["args"], timestamp=r["timestamp"], input_tokens=100)
+            event.add_model(r["model"])
+            event.add_model(r["model2"])
+        else:
+            event = PlainSkillEvent(skill_name=r["skill"], args=r["args"], timestamp=r["timestamp"], input_tokens=100)
+            event.models.add(r["model"])
+            event.models.add(r["model2"])
+        events.append(event)
+    return events
+
+
+def subagent_events(recs, slotted):
+    if slotted:
+        return [SubagentEvent(
+            timestamp=r["timestamp"], description=r["description"], subagent_type=sys.intern(r["subagent_type"]),
+            model=sys.intern(r["model"]), tool_use_id=r["tool_use_id"], session_id="s1",
+        ) for r in recs]
+    return [PlainSubagentEvent(
+        timestamp=r["timestamp"], description=r["description"], subagent_type=r["subagent_type"],
+        model=r["model"], tool_use_id=r["tool_use_id"], session_id="s1",
+    ) for r in recs]
+
+
+def subagent_details(recs, slotted):
+    cls = SubagentDetail if slotted else PlainSubagentDetail
+    return [cls(agent_id=r["agent_id"], input_tokens=1000, output_tokens=100) for r in recs]
+
+
+def compactions(recs, slotted):
+    if slotted:
+        return [CompactionEvent(timestamp=r["timestamp"], pre_tokens=150_000, trigger=sys.intern(r["trigger"])) for r in recs]
+    return [PlainCompactionEvent(timestamp=r["timestamp"], pre_tokens=150_000, trigger=r["trigger"]) for r in recs]
+
+
+def overhead_segments(recs, slotted):
+    cls = OverheadSegment if slotted else PlainOverheadSegment
+    return [cls(timestamp=r["timestamp"], input_tokens=1000, tool_count=3) for r in recs]
+
+
+def bytes_per_event(build, recs, slotted) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    events = build(recs, slotted)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del events
+    return (after - before) / len(recs)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    recs = records(count)
+    print(f"{count:,} events of each kind, bytes per event (including its own strings)")
+    print(f"  {'':<18} {'plain':>8} {'slotted':>8}")
+    for name, build in [
+        ("SkillEvent", skill_events),
+        ("SubagentEvent", subagent_events),
+        ("SubagentDetail", subagent_details),
+        ("CompactionEvent", compactions),
+        ("OverheadSegment", overhead_segments),
+    ]:
+        plain = bytes_per_event(build, recs, slotted=False)
+        slotted = bytes_per_event(build, recs, slotted=True)
+        change = 1 - slotted / plain
+        print(f"  {name:<18} {plain:8.0f} {slotted:8.0f}  ({abs(change):.0%} {'less' if change >= 0 else 'more'})")
+    print(f"UsageLedger: {ledger_bytes_per_turn(recs):.0f} bytes per assistant turn")
+
+
+def ledger_bytes_per_turn(recs) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    ledger = UsageLedger()
+    for i, r in enumerate(recs):
+        ledger.append(i, r["model"], "s1", OVERHEAD, i // 20, 1000, 100, 50_000, 300)
+    len(ledger.column("ts_ms"))  # move the last batch into the columns
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(recs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Running totals over a SessionParser, kept current from its events."""
+from typing import NamedTuple
+
+from superpowers_dashboard.costs import model_rates, resolve_model
+from superpowers_dashboard.events import SessionEvent, SkillStarted, TokensAccrued
+from superpowers_dashboard.ledger import OVERHEAD
+from superpowers_dashboard.watcher import SessionParser, SubagentEvent
+
+
+class SubagentTotals(NamedTuple):
+    """Aggregate metrics over subagents whose transcript has been read."""
+    count: int = 0
+    skills_used: int = 0  # subagents that invoked at least one skill
+    cost: float = 0.0
+    tokens: int = 0  # input + output
+
+
+def _display_name(model_id: str) -> str:
+    return model_id.split("-")[1] if "-" in model_id else model_id
+
+
+class _SubagentShare(NamedTuple):
+    display_name: str
+    input_tokens: int
+    output_tokens: int
+    cost: float
+    used_skills: bool
+
+
+class Aggregator:
+    """Totals, per-skill cost and per-model usage of one parser, updated per event.
+
+    Every assistant turn is priced at the rates of the model that served
+    it. ``attach`` reads per skill event and per model costs off the
+    parser's usage ledger, which prices each turn once however often the
+    parser is merged, and then subscribes to the parser, so each
+    SkillStarted or TokensAccrued prices just its own turn (O(1)) and
+    reading the aggregates does no pricing. Subagent details are not
+    parser events; report them with ``update_subagent``.
+
+    Call ``attach`` again whenever the parser is replaced or merged into,
+    since merging emits no events.
+    """
+
+    def __init__(self, pricing: dict, parser: SessionParser | None = None):
+        self.pricing = pricing
+        self.parser = SessionParser()
+        self._unsubscribe = None
+        self.attach(parser if parser is not None else self.parser)
+
+    def attach(self, parser: SessionParser):
+        """Rebuild from ``parser``'s current state and follow its events."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+        self.parser = parser
+        self._rates: dict[str, tuple] = {}  # model id -> (pricing key, rates)
+        self.total_input = parser.overhead_tokens["input"]
+        self.total_output = parser.overhead_tokens["output"]
+        self.total_cache_read = parser.overhead_tokens["cache_read"]
+        event_costs = parser.usage.costs_by("skill_event", self.pricing)
+        self.overhead_cost = event_costs.get(OVERHEAD, 0.0)
+        self._event_costs: list[float] = []
+        self._skill_costs: dict[str, float] = {}
+        for index, event in enumerate(parser.skill_events):
+            self.total_input += event.input_tokens
+            self.total_output += event.output_tokens
+            self.total_cache_read += event.cache_read_tokens
+            cost = event_costs.get(index, 0.0)
+            self._event_costs.append(cost)
+            self._skill_costs[event.skill_name] = self._skill_costs.get(event.skill_name, 0) + cost
+        self._segment_costs: dict[int, float] = {}  # by ledger segment number
+        self._segments_priced = 0  # overhead segments closed when _segment_costs was read
+        self._models: dict[str, list] = {}  # pricing key -> [input, output, cost]
+        model_costs = parser.usage.costs_by("model", self.pricing)
+        for model, (input_tokens, output_tokens, _, _) in parser.usage.by_model().items():
+            if model:
+                totals = self._models.setdefault(resolve_model(model), [0, 0, 0.0])
+                totals[0] += input_tokens
+                totals[1] += output_tokens
+                totals[2] += model_costs[model]
+        self._subagents: dict[int, _SubagentShare] = {}  # by id() of the SubagentEvent
+        self._subagent_models: dict[str, list] = {}  # display name -> [input, output, cost]
+        self.subagent_totals = SubagentTotals()
+        for subagent in parser.subagents:
+            self.update_subagent(subagent)
+        self._unsubscribe = parser.subscribe(self._on_event)
+
+    def reprice(self, pricing: dict):
+        """Switch to ``pricing``, recomputing every cost from the retained token counts.
+
+        Subagent costs are read from their details, so update those first.
+        """
+        self.pricing = pricing
+        self.attach(self.parser)
+
+    def _cost(self, model: str, input_tokens: int, output_tokens: int, cache_read: int, cache_write: int) -> float:
+        priced = self._rates.get(model)
+        if priced is None:
+            priced = self._rates[model] = (resolve_model(model), model_rates(model, self.pricing))
+        input_rate, output_rate, cache_read_rate, cache_write_rate = priced[1]
+        return (
+            input_tokens * input_rate + output_tokens * output_rate
+            + cache_read * cache_read_rate + cache_write * cache_write_rate
+        ) / 1_000_000
+
+    def _add_model(self, model: str, input_tokens: int, output_tokens: int, cache_read: int, cache_write: int) -> float:
+        """Add tokens of ``model`` to its per-model totals; return their cost."""
+        cost = self._cost(model, input_tokens, output_tokens, cache_read, cache_write)
+        totals = self._models.setdefault(self._rates[model][0], [0, 0, 0.0])
+        totals[0] += input_tokens
+        totals[1] += output_tokens
+        totals[2] += cost
+        return cost
+
+    def _on_event(self, event: SessionEvent):
+        if isinstance(event, (TokensAccrued, SkillStarted)):
+            self.total_input += event.input_tokens
+            self.total_output += event.output_tokens
+            self.total_cache_read += event.cache_read_tokens
+            tokens = (event.input_tokens, event.output_tokens, event.cache_read_tokens, event.cache_write_tokens)
+            if event.model:
+                cost = self._add_model(event.model, *tokens)
+            else:
+                cost = self._cost(event.model, *tokens)
+        if isinstance(event, TokensAccrued):
+            if event.skill_index is None:
+                self.overhead_cost += cost
+            else:
+                self._add_event_cost(event.skill_index, cost)
+        elif isinstance(event, SkillStarted):
+            # Skill events are only ever appended between attaches
+            self._event_costs.append(0.0)
+            self._add_event_cost(event.index, cost)
+
+    def _add_event_cost(self, index: int, cost: float):
+        self._event_costs[index] += cost
+        name = self.parser.skill_events[index].skill_name
+        self._skill_costs[name] = self._skill_costs.get(name, 0) + cost
+
+    def update_subagent(self, subagent: SubagentEvent):
+        """Fold a subagent's (possibly updated) transcript detail into the totals."""
+        old = self._subagents.pop(id(subagent), None)
+        count, skills_used, cost, tokens = self.subagent_totals
+        if old is not None:
+            count -= 1
+            skills_used -= old.used_skills
+            cost -= old.cost
+            tokens -= old.input_tokens + old.output_tokens
+            self._add_model_share(old, -1)
+        detail = subagent.detail
+        if detail is not None:
+            share = _SubagentShare(
+                _display_name(subagent.model), detail.input_tokens, detail.output_tokens,
+                detail.cost, bool(detail.skills_invoked),
+            )
+            self._subagents[id(subagent)] = share
+            count += 1
+            skills_used += share.used_skills
+            cost += share.cost
+            tokens += share.input_tokens + share.output_tokens
+            self._add_model_share(share, 1)
+        self.subagent_totals = SubagentTotals(count, skills_used, cost, tokens)
+
+    def _add_model_share(self, share: _SubagentShare, sign: int):
+        totals = self._subagent_models.setdefault(share.display_name, [0, 0, 0.0])
+        totals[0] += sign * share.input_tokens
+        totals[1] += sign * share.output_tokens
+        totals[2] += sign * share.cost
+
+    def event_cost(self, index: int) -> float:
+        """Cost of ``parser.skill_events[index]``."""
+        return self._event_costs[index]
+
+    def segment_cost(self, index: int) -> float:
+        """Cost of ``parser.overhead_segments[index]``.
+
+        Segments no longer change once closed, so the ledger's costs per
+        segment are only read again once another one has closed.
+        """
+        if index >= self._segments_priced:
+            self._segment_costs = self.parser.usage.costs_by("segment", self.pricing)
+            self._segments_priced = len(self.parser.overhead_segments)
+        return self._segment_costs.get(self.parser.segment_numbers[index], 0.0)
+
+    @property
+    def total_cost(self) -> float:
+        return sum(self._skill_costs.values()) + self.overhead_cost
+
+    def per_skill(self) -> list[dict]:
+        """Cost per skill name, most expensive first."""
+        return [{"name": k, "cost": v} for k, v in sorted(self._skill_costs.items(), key=lambda x: -x[1])]
+
+    def model_stats(self) -> list[dict]:
+        """Tokens and cost per model, subagents folded in, most expensive first."""
+        model_stats = [
+            {"model": _display_name(model), "input_tokens": input_tokens, "output_tokens": output_tokens, "cost": cost}
+            for model, (input_tokens, output_tokens, cost) in self._models.items()
+        ]
+        for display_name, (input_tokens, output_tokens, cost) in self._subagent_models.items():
+            if not (input_tokens or output_tokens or cost):
+                continue
+            existing = next((m for m in model_stats if m["model"] == display_name), None)
+            if existing:
+                existing["input_tokens"] += input_tokens
+                existing["output_tokens"] += output_tokens
+                existing["cost"] += cost
+            else:
+                model_stats.append({
+                    "model": display_name,
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "cost": cost,
+                })
+        model_stats.sort(key=lambda m: -m["cost"])
+        return model_stats
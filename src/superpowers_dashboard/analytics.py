@@ -0,0 +1,104 @@
+"""Group-by arithmetic over usage ledger columns, backend chosen once at import time.
+
+Uses NumPy when installed and falls back to pure Python loops. Set
+``SUPERDASH_ANALYTICS=python`` (or ``numpy``) to force a specific backend.
+
+Both backends take ``array`` columns of equal length and a column of
+integer keys, optionally rounded down to a multiple of ``bucket``:
+
+- ``group_sums(keys, columns, bucket=1)`` gives ``{key: [sum per column]}``;
+- ``group_costs(keys, models, columns, rates, bucket=1)`` gives
+  ``{key: dollars}``, where ``rates[m]`` holds the per-million-token rate
+  of each column for model number ``m``.
+
+Costs are computed from each key's token totals per model, so no row is
+priced on its own.
+"""
+import os
+from array import array
+from typing import Callable, Iterable
+
+
+def _bucketed(keys: Iterable[int], bucket: int) -> Iterable[int]:
+    return keys if bucket == 1 else (key - key % bucket for key in keys)
+
+
+def sum_by(keys: Iterable, columns: list[array], bucket: int = 1) -> dict:
+    """``group_sums`` in pure Python, for keys of any hashable kind."""
+    # Collecting each key's rows first leaves the additions to sum() in C
+    rows: dict = {}
+    for i, key in enumerate(_bucketed(keys, bucket)):
+        indices = rows.get(key)
+        if indices is None:
+            rows[key] = [i]
+        else:
+            indices.append(i)
+    return {key: [sum(map(column.__getitem__, indices)) for column in columns] for key, indices in rows.items()}
+
+
+def _python_group_costs(
+    keys: array, models: array, columns: list[array], rates: list[tuple[float, ...]], bucket: int = 1,
+) -> dict[int, float]:
+    costs: dict[int, float] = {}
+    for (key, model), totals in sum_by(zip(_bucketed(keys, bucket), models), columns).items():
+        cost = sum(tokens * rate for tokens, rate in zip(totals, rates[model])) / 1_000_000
+        costs[key] = costs.get(key, 0.0) + cost
+    return costs
+
+
+def _numpy_functions(np) -> tuple[Callable, Callable]:
+    def view(column: array):
+        return np.frombuffer(column, dtype=column.typecode)
+
+    def index(keys: array, bucket: int):
+        """Distinct keys, and each row's position among them."""
+        values = view(keys)
+        if bucket != 1:
+            values = values - values % bucket
+        low, high = int(values.min()), int(values.max())
+        if high - low < 4 * len(values) + 1024:
+            # Dense keys (model, session and skill event numbers) index a bincount directly
+            return np.arange(low, high + 1), (values - low).astype(np.intp)
+        return np.unique(values, return_inverse=True)
+
+    def sums(rows, size: int, columns: list[array]):
+        # float64 weights are exact up to 2**53, far beyond any token total
+        return np.stack([np.bincount(rows, weights=view(c), minlength=size) for c in columns], axis=-1)
+
+    def group_sums(keys: array, columns: list[array], bucket: int = 1) -> dict:
+        if not len(keys):
+            return {}
+        labels, rows = index(keys, bucket)
+        present = np.bincount(rows, minlength=len(labels)) > 0
+        totals = np.rint(sums(rows, len(labels), columns)).astype(np.int64)
+        return dict(zip(labels[present].tolist(), totals[present].tolist()))
+
+    def group_costs(
+        keys: array, models: array, columns: list[array], rates: list[tuple[float, ...]], bucket: int = 1,
+    ) -> dict[int, float]:
+        if not len(keys):
+            return {}
+        labels, rows = index(keys, bucket)
+        present = np.bincount(rows, minlength=len(labels)) > 0
+        model_count = len(rates)
+        # Token matrix per key and model, times each model's rate vector
+        tokens = sums(rows * model_count + view(models), len(labels) * model_count, columns)
+        tokens = tokens.reshape(len(labels), model_count, len(columns))
+        costs = np.einsum("kmc,mc->k", tokens, np.asarray(rates, dtype=np.float64)) / 1_000_000
+        return dict(zip(labels[present].tolist(), costs[present].tolist()))
+
+    return group_sums, group_costs
+
+
+def _select_backend(preferred: str = "") -> tuple[str, Callable, Callable]:
+    if preferred in ("", "numpy"):
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            return ("numpy", *_numpy_functions(numpy))
+    return "python", sum_by, _python_group_costs
+
+
+BACKEND, group_sums, group_costs = _select_backend(os.environ.get("SUPERDASH_ANALYTICS", ""))
@@ -0,0 +1,162 @@
+"""Persistent per-session parse checkpoints for fast startup."""
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+
+from superpowers_dashboard.tail import TailReader
+from superpowers_dashboard.watcher import SessionParser
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "superdash"
+
+# Bump whenever SessionParser (or anything it holds) changes shape, so
+# checkpoints pickled by an older version are rebuilt instead of loaded.
+CACHE_VERSION = 13
+
+# Bytes just before the checkpoint offset that must still match before
+# appended data is parsed on top of a checkpoint.
+DIGEST_WINDOW = 4096
+
+
+@dataclass
+class Checkpoint:
+    """Parse state of one session file up to ``offset`` bytes."""
+    path: str
+    inode: int
+    size: int
+    mtime_ns: int
+    offset: int
+    digest: str
+    parser: SessionParser | None = None
+
+
+def _prefix_digest(f, offset: int) -> str:
+    start = max(0, offset - DIGEST_WINDOW)
+    f.seek(start)
+    return hashlib.blake2b(f.read(offset - start), digest_size=16).hexdigest()
+
+
+class CheckpointCache:
+    """Stores a pickled ``SessionParser`` per session file under ``cache_dir``.
+
+    A checkpoint is keyed by the file's (inode, size, mtime). If the key still
+    matches, the file is unchanged. If only size and mtime moved on, the file
+    was appended to and is resumed from the checkpoint once the bytes just
+    before the checkpoint offset are confirmed unchanged. Anything else, and
+    any entry that fails to load, is discarded and rebuilt.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, path: Path) -> Path:
+        name = hashlib.sha1(os.fsencode(path.resolve())).hexdigest()
+        return self.cache_dir / f"{name}.pkl"
+
+    def load(self, path: Path) -> Checkpoint | None:
+        """Return a still-valid checkpoint for ``path``, or None."""
+        return self._load(path, with_parser=True)
+
+    def peek(self, path: Path) -> Checkpoint | None:
+        """Validate the checkpoint for ``path`` without unpickling its parser.
+
+        The file holds a small header pickle followed by the parser pickle,
+        so this only reads the header.
+        """
+        return self._load(path, with_parser=False)
+
+    def _load(self, path: Path, with_parser: bool) -> Checkpoint | None:
+        entry = self._entry_path(path)
+        try:
+            with open(entry, "rb") as f:
+                header = pickle.load(f)
+                if header.get("version") != CACHE_VERSION:
+                    raise ValueError("stale cache version")
+                checkpoint = Checkpoint(**header["checkpoint"])
+                if checkpoint.path != str(path.resolve()):
+                    raise ValueError("mismatched cache entry")
+                if with_parser:
+                    checkpoint.parser = pickle.load(f)
+                    if not isinstance(checkpoint.parser, SessionParser):
+                        raise ValueError("malformed cache entry")
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._discard(entry)
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                st = os.fstat(f.fileno())
+                if st.st_ino != checkpoint.inode or st.st_size < checkpoint.offset:
+                    raise ValueError("file replaced or truncated")
+                unchanged = st.st_size == checkpoint.size and st.st_mtime_ns == checkpoint.mtime_ns
+                if not unchanged and _prefix_digest(f, checkpoint.offset) != checkpoint.digest:
+                    raise ValueError("file rewritten")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._discard(entry)
+            return None
+        return checkpoint
+
+    def store(self, path: Path, parser: SessionParser, offset: int):
+        """Write a checkpoint for ``path`` covering its first ``offset`` bytes."""
+        try:
+            with open(path, "rb") as f:
+                st = os.fstat(f.fileno())
+                digest = _prefix_digest(f, offset)
+            header = {
+                "version": CACHE_VERSION,
+                "checkpoint": {
+                    "path": str(path.resolve()),
+                    "inode": st.st_ino,
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "offset": offset,
+                    "digest": digest,
+                },
+            }
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry = self._entry_path(path)
+            tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(parser, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _discard(entry: Path):
+        try:
+            entry.unlink()
+        except OSError:
+            pass
+
+
+def parse_session_file(path: Path, cache: CheckpointCache | None = None) -> tuple[SessionParser, TailReader]:
+    """Parse one session file on its own, resuming from a checkpoint if possible.
+
+    Returns the file's parser and a reader positioned after the last complete
+    line, ready for tailing. The checkpoint is refreshed whenever new bytes
+    were parsed.
+    """
+    checkpoint = cache.load(path) if cache is not None else None
+    if checkpoint is not None:
+        parser, offset = checkpoint.parser, checkpoint.offset
+    else:
+        parser, offset = SessionParser(session_id=path.stem), 0
+
+    reader = TailReader(path, offset=offset)
+    for line in reader.iter_lines():
+        parser.process_line(line)
+    if reader.rotated:
+        # Changed underneath us between validation and reading: start over
+        reader.close()
+        return parse_session_file(path, cache)
+
+    if cache is not None and (checkpoint is None or reader.offset != checkpoint.offset):
+        cache.store(path, parser, reader.offset)
+    return parser, reader
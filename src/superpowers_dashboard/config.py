@@ -25,6 +25,8 @@ DEFAULT_PRICING = {
 
 DEFAULT_CONFIG_PATH = Path.home() / ".config" / "superpowers-dashboard" / "config.toml"
 
+RATES = ("input", "output", "cache_read", "cache_write")
+
 
 def load_config(config_path: Path = DEFAULT_CONFIG_PATH) -> dict:
     """Load config from TOML file, falling back to defaults."""
@@ -37,3 +39,54 @@ def load_config(config_path: Path = DEFAULT_CONFIG_PATH) -> dict:
             config["pricing"].update(user_config["pricing"])
 
     return config
+
+
+def _valid_pricing(pricing: dict) -> bool:
+    """Whether every model in ``pricing`` has all four numeric rates."""
+    return all(
+        isinstance(rates, dict) and all(isinstance(rates.get(rate), (int, float)) for rate in RATES)
+        for rates in pricing.values()
+    )
+
+
+class ConfigFile:
+    """The config file, loaded again whenever it changes on disk.
+
+    Changes are detected by comparing the file's modification time and
+    size with those of the last load, so ``reload`` is cheap enough to
+    call on every poll.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CONFIG_PATH):
+        self.path = path
+        self._signature: tuple[int, int] | None = None
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def load(self) -> dict:
+        self._signature = self._stat()
+        return load_config(self.path)
+
+    def reload(self) -> dict | None:
+        """The config now on disk if the file changed since the last load, else None.
+
+        A file that does not parse, or that gives a model incomplete rates
+        (say, saved halfway through an edit), is ignored until it changes
+        again.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return None
+        self._signature = signature
+        try:
+            config = load_config(self.path)
+        except (OSError, tomllib.TOMLDecodeError):
+            return None
+        if not _valid_pricing(config["pricing"]):
+            return None
+        return config
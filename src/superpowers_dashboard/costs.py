@@ -1,4 +1,5 @@
 """Cost calculation from token counts and pricing config."""
+from superpowers_dashboard.config import RATES
 
 # Map short model names used in subagent dispatches to full pricing keys
 MODEL_ALIASES = {
@@ -15,6 +16,15 @@ def resolve_model(model: str) -> str:
     return MODEL_ALIASES.get(model, model)
 
 
+def model_rates(model: str, pricing: dict) -> tuple[float, float, float, float]:
+    """Input, output, cache read and cache write rates per million tokens of
+    ``model`` (resolved as by ``resolve_model``); zeros if it has no pricing."""
+    rates = pricing.get(resolve_model(model))
+    if rates is None:
+        return (0.0, 0.0, 0.0, 0.0)
+    return tuple(rates[rate] for rate in RATES)
+
+
 def calculate_cost(
     model: str,
     input_tokens: int,
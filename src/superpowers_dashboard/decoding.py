@@ -0,0 +1,33 @@
+"""JSON decoder backend, chosen once at import time.
+
+Uses orjson or msgspec when installed and falls back to the standard
+library. Set ``SUPERDASH_JSON=json`` (or ``orjson``/``msgspec``) to force a
+specific backend.
+
+``DECODE_ERRORS`` is the tuple of exception classes ``loads`` raises on
+malformed input; unpack it when combining with other exceptions.
+"""
+import json
+import os
+from typing import Any, Callable
+
+
+def _select_backend(preferred: str = "") -> tuple[str, Callable[[str | bytes], Any], tuple[type[Exception], ...]]:
+    candidates = [preferred] if preferred else ["orjson", "msgspec"]
+    for name in candidates:
+        if name == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                continue
+            return "orjson", orjson.loads, (orjson.JSONDecodeError,)
+        if name == "msgspec":
+            try:
+                import msgspec
+            except ImportError:
+                continue
+            return "msgspec", msgspec.json.Decoder().decode, (msgspec.DecodeError,)
+    return "json", json.loads, (json.JSONDecodeError, UnicodeDecodeError)
+
+
+BACKEND, loads, DECODE_ERRORS = _select_backend(os.environ.get("SUPERDASH_JSON", ""))
@@ -0,0 +1,266 @@
+"""Cheap, change-aware discovery of session and subagent transcript files."""
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from superpowers_dashboard.watcher import _cwd_to_project_dir_name
+
+# Directory mtimes come from a coarse clock, so a file created in the same
+# tick as a scan can leave the mtime unchanged. A listing whose mtime is this
+# recent is not trusted and gets rescanned on the next refresh.
+RACY_WINDOW_NS = 1_000_000_000
+
+
+def _dir_mtime_ns(path: Path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class SubagentIndex:
+    """Maps agent ids to transcript paths in one ``<session>/subagents/`` directory.
+
+    ``refresh`` costs a single stat of the directory unless its mtime changed,
+    in which case the listing is rebuilt with one ``os.scandir`` pass.
+    Lookups are dictionary hits. Callbacks registered with ``wait_for`` run
+    from the refresh that first sees their transcript.
+    """
+
+    def __init__(self, session_dir: Path):
+        self.directory = session_dir / "subagents"
+        self._mtime_ns: int | None = None
+        self._paths: dict[str, Path] = {}
+        self._waiters: dict[str, list[Callable[[Path], None]]] = {}
+
+    def refresh(self) -> bool:
+        """Rescan the directory if it changed; return whether it was rescanned."""
+        mtime_ns = _dir_mtime_ns(self.directory)
+        if mtime_ns is None or mtime_ns == self._mtime_ns:
+            return False
+        paths: dict[str, Path] = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("agent-") and name.endswith(".jsonl"):
+                        paths[name[len("agent-"):-len(".jsonl")]] = Path(entry.path)
+        except OSError:
+            return False
+        self._paths = paths
+        self._mtime_ns = None if time.time_ns() - mtime_ns < RACY_WINDOW_NS else mtime_ns
+        for agent_id in [a for a in self._waiters if a in paths]:
+            for callback in self._waiters.pop(agent_id):
+                callback(paths[agent_id])
+        return True
+
+    @property
+    def waiting(self) -> bool:
+        """Whether any ``wait_for`` callback is still pending."""
+        return bool(self._waiters)
+
+    def get(self, agent_id: str) -> Path | None:
+        """Transcript path for ``agent_id`` as of the last refresh."""
+        return self._paths.get(agent_id)
+
+    def wait_for(self, agent_id: str, callback: Callable[[Path], None]):
+        """Call ``callback(path)`` once ``agent_id``'s transcript exists.
+
+        Runs immediately if it is already indexed.
+        """
+        path = self._paths.get(agent_id)
+        if path is not None:
+            callback(path)
+        else:
+            self._waiters.setdefault(agent_id, []).append(callback)
+
+
+class SessionFile(NamedTuple):
+    """A session transcript as seen by the last directory scan."""
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class SessionDelta:
+    """Sessions that appeared or disappeared since the previous refresh."""
+    added: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+class _Listing:
+    """Cached ``*.jsonl`` entries of one directory, valid while its mtime holds."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.mtime_ns: int | None = None
+        self.files: dict[str, SessionFile] = {}
+        self.generation = 0  # bumped on every rescan
+
+    def refresh(self, restat: bool = False) -> bool:
+        """Rescan if the directory changed; return whether it was rescanned.
+
+        Appending to a file does not change the directory's mtime, so with
+        ``restat`` an unchanged listing has its entries' stats refreshed,
+        which counts as a rescan if any changed.
+        """
+        mtime_ns = _dir_mtime_ns(self.path)
+        if mtime_ns is None:
+            if not self.files:
+                return False
+            self.files = {}
+            self.mtime_ns = None
+            self.generation += 1
+            return True
+        if mtime_ns == self.mtime_ns:
+            return restat and self._restat()
+        files: dict[str, SessionFile] = {}
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if not entry.name.endswith(".jsonl"):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    files[entry.name] = SessionFile(Path(entry.path), st.st_size, st.st_mtime_ns)
+        except OSError:
+            return False
+        self.files = files
+        self.mtime_ns = None if time.time_ns() - mtime_ns < RACY_WINDOW_NS else mtime_ns
+        self.generation += 1
+        return True
+
+    def _restat(self) -> bool:
+        files: dict[str, SessionFile] = {}
+        for name, cached in self.files.items():
+            try:
+                st = os.stat(cached.path)
+            except OSError:
+                continue
+            files[name] = SessionFile(cached.path, st.st_size, st.st_mtime_ns)
+        if files == self.files:
+            return False
+        self.files = files
+        self.generation += 1
+        return True
+
+    @property
+    def latest_mtime_ns(self) -> int:
+        return max((f.mtime_ns for f in self.files.values()), default=0)
+
+
+class _SubdirListing:
+    """Cached subdirectories of one directory, valid while its mtime holds."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.mtime_ns: int | None = None
+        self.dirs: list[Path] = []
+
+    def refresh(self) -> bool:
+        """Rescan if the directory changed; return whether it was rescanned."""
+        mtime_ns = _dir_mtime_ns(self.path)
+        if mtime_ns == self.mtime_ns and mtime_ns is not None:
+            return False
+        dirs: list[Path] = []
+        if mtime_ns is not None:
+            try:
+                with os.scandir(self.path) as it:
+                    dirs = [Path(e.path) for e in it if e.is_dir()]
+            except OSError:
+                pass
+        self.dirs = dirs
+        self.mtime_ns = None if mtime_ns is None or time.time_ns() - mtime_ns < RACY_WINDOW_NS else mtime_ns
+        return True
+
+
+class SessionDiscovery:
+    """Keeps the list of session files for a project up to date, cheaply.
+
+    The project is the one matching ``project_cwd`` when it exists, otherwise
+    the one with the most recently modified session, as with
+    ``find_project_sessions`` and ``find_latest_project_sessions``. Listings
+    are cached per directory and rescanned with ``os.scandir`` only when the
+    directory's mtime changes, so an idle refresh costs a few stats no matter
+    how many sessions are on disk. File sizes and mtimes are those seen by
+    the last rescan of their directory, or by the last ``refresh(restat=True)``,
+    which also stats every file it considers.
+    """
+
+    def __init__(self, base_dir: Path | None = None, project_cwd: str | None = None):
+        if base_dir is None:
+            base_dir = Path.home() / ".claude" / "projects"
+        if project_cwd is None:
+            project_cwd = str(Path.cwd())
+        self.base_dir = base_dir
+        self.preferred_dir = base_dir / _cwd_to_project_dir_name(project_cwd)
+        self.project_dir: Path | None = None
+        self.files: list[SessionFile] = []  # oldest first
+        self._listings: dict[Path, _Listing] = {}
+        self._projects = _SubdirListing(base_dir)
+        self._built_from: tuple[Path | None, int] = (None, 0)
+
+    @property
+    def sessions(self) -> list[Path]:
+        """Session paths of the current project, oldest first."""
+        return [f.path for f in self.files]
+
+    def _listing(self, path: Path) -> _Listing:
+        listing = self._listings.get(path)
+        if listing is None:
+            listing = self._listings[path] = _Listing(path)
+        return listing
+
+    def _choose_project(self, restat: bool) -> Path | None:
+        """Pick the project directory, refreshing the listings it looked at."""
+        preferred = self._listing(self.preferred_dir)
+        preferred.refresh(restat)
+        if preferred.files:
+            return self.preferred_dir
+        if self._projects.refresh():
+            keep = set(self._projects.dirs) | {self.preferred_dir}
+            for stale in [p for p in self._listings if p not in keep]:
+                del self._listings[stale]
+        latest: Path | None = None
+        latest_mtime = 0
+        for project_dir in self._projects.dirs:
+            listing = self._listing(project_dir)
+            listing.refresh(restat)
+            if listing.latest_mtime_ns > latest_mtime:
+                latest, latest_mtime = project_dir, listing.latest_mtime_ns
+        return latest
+
+    def refresh(self, restat: bool = False) -> SessionDelta:
+        """Bring ``files`` up to date and return what was added or removed.
+
+        Pass ``restat`` when the order of ``files`` and the choice of
+        project must reflect appends made since their directory last changed.
+        """
+        project_dir = self._choose_project(restat)
+        listing = self._listings.get(project_dir) if project_dir is not None else None
+        built_from = (project_dir, listing.generation if listing is not None else 0)
+        if built_from == self._built_from:
+            return SessionDelta()
+        self._built_from = built_from
+        files: list[SessionFile] = []
+        if listing is not None:
+            files = sorted(listing.files.values(), key=lambda f: (f.mtime_ns, f.path.name))
+        before = {f.path for f in self.files}
+        after = {f.path for f in files}
+        delta = SessionDelta(
+            added=[f.path for f in files if f.path not in before],
+            removed=[f.path for f in self.files if f.path not in after],
+        )
+        self.project_dir = project_dir
+        self.files = files
+        return delta
@@ -0,0 +1,91 @@
+"""Typed deltas emitted by SessionParser as it ingests lines.
+
+Each event describes one change to parser state, so a subscriber can keep
+its own derived state up to date in O(1) per event instead of rescanning
+the parser's lists. The lists stay the source of truth; events are only
+built while someone is subscribed.
+"""
+from dataclasses import dataclass
+from typing import Callable, Union
+
+
+@dataclass(frozen=True, slots=True)
+class SkillStarted:
+    """A skill was invoked; ``index`` is its position in ``skill_events``.
+
+    The token counts are those of the turn that made the Skill call, made
+    with ``model``. They are part of the skill's totals and ``model_usage``
+    but are not reported separately as TokensAccrued.
+    """
+    session_id: str
+    timestamp: str
+    skill_name: str
+    args: str
+    index: int
+    model: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class TokensAccrued:
+    """An assistant turn's usage, added to a skill event or to overhead."""
+    session_id: str
+    timestamp: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int
+    cache_write_tokens: int
+    skill_index: int | None = None  # position in skill_events; None for overhead
+
+
+@dataclass(frozen=True, slots=True)
+class SubagentDispatched:
+    """A Task tool call dispatched a subagent."""
+    session_id: str
+    timestamp: str
+    tool_use_id: str
+    description: str
+    subagent_type: str
+    model: str
+
+
+@dataclass(frozen=True, slots=True)
+class SubagentResolved:
+    """A dispatched subagent's agent id became known, or its result arrived."""
+    session_id: str
+    tool_use_id: str
+    agent_id: str | None
+    status: str  # "running" while only the agent id is known, then "complete"
+
+
+@dataclass(frozen=True, slots=True)
+class Compaction:
+    """The context was compacted, microcompacted or cleared."""
+    session_id: str
+    timestamp: str
+    kind: str
+    pre_tokens: int
+    trigger: str
+
+
+@dataclass(frozen=True, slots=True)
+class HookFired:
+    session_id: str
+    timestamp: str
+    event: str
+    hook_type: str
+
+
+@dataclass(frozen=True, slots=True)
+class ToolUsed:
+    session_id: str
+    timestamp: str
+    name: str
+
+
+SessionEvent = Union[SkillStarted, TokensAccrued, SubagentDispatched, SubagentResolved, Compaction, HookFired, ToolUsed]
+Subscriber = Callable[[SessionEvent], None]
@@ -39,11 +39,10 @@ def build_task_groups(
         role = classify_role(desc, stype)
         entry_with_role = {**entry, "role": role}
 
-        # Detect status: has token data = complete, otherwise = running
-        if entry.get("total_tokens", 0) > 0:
-            entry_with_role["status"] = "complete"
-        else:
-            entry_with_role["status"] = "running"
+        # Prefer the status the parser determined; without one, having
+        # token data is taken to mean the subagent is done
+        if "status" not in entry:
+            entry_with_role["status"] = "complete" if entry.get("total_tokens", 0) > 0 else "running"
 
         task_num = extract_task_number(desc)
         if task_num is None:
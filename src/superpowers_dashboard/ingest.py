@@ -0,0 +1,368 @@
+"""Background ingestion: parsing, tailing and subagent tracking off the UI thread."""
+import threading
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from superpowers_dashboard.aggregates import Aggregator
+from superpowers_dashboard.cache import CheckpointCache
+from superpowers_dashboard.config import ConfigFile
+from superpowers_dashboard.costs import calculate_cost, resolve_model
+from superpowers_dashboard.discovery import SessionDiscovery, SubagentIndex
+from superpowers_dashboard.inotify import ChangeNotifier
+from superpowers_dashboard.loader import bytes_to_parse, load_sessions
+from superpowers_dashboard.scheduler import TailScheduler
+from superpowers_dashboard.snapshot import DashboardSnapshot, LoadProgress, build_snapshot
+from superpowers_dashboard.timeline import ParserTimeline
+from superpowers_dashboard.versions import VersionTracker
+from superpowers_dashboard.watcher import SessionParser, SubagentEvent, SubagentTranscript
+
+# Poll interval when no change notification is available, and the slower
+# safety-net poll kept alongside inotify.
+POLL_INTERVAL = 0.5
+NOTIFY_FALLBACK_POLL_INTERVAL = 5.0
+
+# Older sessions are backfilled in batches of at most this many files or,
+# beyond the first file, this many bytes still to parse, so progress and
+# totals update every second or so.
+BACKFILL_BATCH_FILES = 32
+BACKFILL_BATCH_BYTES = 256 * 1024 * 1024
+
+
+class IngestWorker:
+    """Owns the parser and everything that feeds it, on a thread of its own.
+
+    The worker loads the project's newest session first, then backfills
+    the older ones newest-first in batches while it tails every session
+    and the transcripts of running subagents, woken by inotify or a poll
+    timer. After each change it builds a ``DashboardSnapshot`` and
+    calls ``on_snapshot`` (from the worker thread) unless the previous one
+    has not been collected yet; the UI picks up the latest with
+    ``take_snapshot`` whenever it gets round to it, so bursts of writes
+    coalesce instead of queueing renders.
+
+    When given the ``config`` file, the worker checks it on every poll and
+    re-prices everything from retained token counts when it changes.
+
+    ``load``, ``backfill`` and ``poll`` can also be called directly,
+    without the thread.
+    """
+
+    def __init__(
+        self,
+        discovery: SessionDiscovery,
+        pricing: dict,
+        on_snapshot: Callable[[], None] = lambda: None,
+        checkpoints: CheckpointCache | None = None,
+        config: ConfigFile | None = None,
+    ):
+        self.discovery = discovery
+        self.pricing = pricing
+        self._config = config
+        self.parser = SessionParser()
+        self.aggregator = Aggregator(pricing, self.parser)
+        self.versions = VersionTracker(self.parser)
+        self.timeline = ParserTimeline(self.parser)
+        self._header: tuple = ()  # session id and progress last published
+        self._on_snapshot = on_snapshot
+        self._checkpoints = checkpoints
+        self._scheduler = TailScheduler()
+        self._session_path: Path | None = None
+        self._backfill: list[Path] = []  # sessions still to load, oldest first
+        self._pending_bytes: dict[Path, int] = {}
+        self._session_total = 0
+        # Transcripts of subagents still running, by Task tool_use_id
+        self._subagent_transcripts: dict[str, SubagentTranscript] = {}
+        self._subagent_indexes: dict[str, SubagentIndex] = {}  # by session id
+        self._awaiting_transcripts: set[str] = set()  # tool_use_ids waiting on an index
+        self._notifier: ChangeNotifier | None = None
+        self._poll_interval = POLL_INTERVAL
+
+        self._thread: threading.Thread | None = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._snapshot: DashboardSnapshot | None = None
+        self._notified = False  # on_snapshot called and snapshot not yet taken
+        self._error: BaseException | None = None
+
+    # -- UI thread -------------------------------------------------------
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="superdash-ingest", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def wake(self):
+        """Ask for a poll as soon as possible. Safe from any thread."""
+        self._wake.set()
+
+    def take_snapshot(self) -> DashboardSnapshot | None:
+        """Collect the latest snapshot, or None if nothing changed since the last one.
+
+        Re-raises an exception that stopped the worker thread.
+        """
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            snapshot, self._snapshot = self._snapshot, None
+            self._notified = False
+        return snapshot
+
+    # -- worker thread ---------------------------------------------------
+
+    def _run(self):
+        try:
+            self.load()
+            self._publish()
+            while not self._stopping:
+                if not self._backfill:
+                    self._wake.wait(self._poll_interval)
+                    self._wake.clear()
+                    if self._stopping:
+                        break
+                repriced = self.reload_config()
+                backfilled = self.backfill()
+                if self.poll() or backfilled or repriced:
+                    self._publish()
+        except BaseException as exc:
+            with self._lock:
+                self._error = exc
+            self._on_snapshot()
+        finally:
+            self.close()
+
+    def _publish(self):
+        session_id = self._session_path.stem if self._session_path else ""
+        progress = self.progress
+        if (session_id, progress) != self._header:
+            self._header = (session_id, progress)
+            self.versions.bump("header")
+        self.versions.sync()
+        snapshot = build_snapshot(self.aggregator, session_id, progress, self.versions.current, self.timeline)
+        with self._lock:
+            self._snapshot = snapshot
+            notify = not self._notified
+            self._notified = True
+        if notify:
+            self._on_snapshot()
+
+    def close(self):
+        """Release files and the notifier; called by the thread as it exits."""
+        if self._notifier is not None:
+            self._notifier.stop()
+            self._notifier = None
+        self._scheduler.clear()
+        self._forget_subagents()
+
+    def _start_watching(self, project_dir: Path):
+        """Wake from inotify when available, otherwise keep polling on a timer."""
+        if self._thread is None or self._notifier is not None:
+            return
+        notifier = ChangeNotifier(project_dir, self.wake)
+        if notifier.start():
+            self._notifier = notifier
+            self._poll_interval = NOTIFY_FALLBACK_POLL_INTERVAL
+
+    @property
+    def progress(self) -> LoadProgress | None:
+        """How much of the history is loaded, or None once all of it is."""
+        if not self._backfill:
+            return None
+        return LoadProgress(
+            loaded=self._session_total - len(self._backfill),
+            total=self._session_total,
+            bytes_left=sum(self._pending_bytes.get(p, 0) for p in self._backfill),
+        )
+
+    def load(self):
+        """Load the newest session and queue the older ones for ``backfill``.
+
+        A snapshot showing the load's progress is published before the
+        newest session is parsed, and another once it is.
+        """
+        self.discovery.refresh(restat=True)  # the newest session is the one last written to
+        session_paths = self.discovery.sessions
+        self._backfill = list(session_paths)
+        self._session_total = len(session_paths)
+        self._pending_bytes = {p: bytes_to_parse(p, self._checkpoints) for p in session_paths}
+        if session_paths:
+            self._publish()
+            self._session_path = session_paths[-1]
+            self.backfill(max_files=1)
+            self._start_watching(session_paths[-1].parent)
+        self._resolve_subagent_details()
+
+    def backfill(self, max_files: int = BACKFILL_BATCH_FILES, max_bytes: int = BACKFILL_BATCH_BYTES) -> bool:
+        """Load the next batch of queued sessions, newest first; return whether
+        there was one.
+
+        Unchanged files come straight from the checkpoint cache, appended
+        files only parse their new bytes, and large batches are parsed in
+        worker processes. The batch is merged in ahead of everything loaded
+        so far, and its files are tailed from where their parse ended.
+        """
+        if not self._backfill:
+            return False
+        newest = self._backfill.pop()
+        batch = [newest]
+        size = self._pending_bytes.pop(newest, 0)
+        while self._backfill and len(batch) < max_files and size < max_bytes:
+            path = self._backfill.pop()
+            size += self._pending_bytes.pop(path, 0)
+            batch.append(path)
+        batch.reverse()
+
+        older, offsets = load_sessions(batch, self._checkpoints, isolate=True)
+        if older is not None:
+            if self._scheduler:  # something is loaded already, and it is later
+                older.merge(self.parser)
+            self._set_parser(older)
+        for path, offset in offsets.items():
+            self._scheduler.track(path, offset, active=path == self._session_path)
+        return True
+
+    def _reload_sessions(self):
+        """Rebuild parser state from scratch after a session file was rewritten."""
+        self._scheduler.clear()
+        self._forget_subagents()
+        self._set_parser(SessionParser())
+        self.load()
+
+    def _forget_subagents(self):
+        """Close subagent transcripts and drop lookups waiting on the current parser's subagents."""
+        for transcript in self._subagent_transcripts.values():
+            transcript.close()
+        self._subagent_transcripts.clear()
+        self._awaiting_transcripts.clear()
+        self._subagent_indexes.clear()  # with their wait_for callbacks
+
+    def _set_parser(self, parser: SessionParser):
+        """Adopt ``parser``, which replaced or was merged into the current one."""
+        self.parser = parser
+        self.aggregator.attach(parser)
+        self.versions.attach(parser)
+        self.timeline.attach(parser)
+
+    def reload_config(self) -> bool:
+        """Re-price everything if the config file changed; return whether it did."""
+        config = self._config.reload() if self._config is not None else None
+        if config is None:
+            return False
+        self.reprice(config["pricing"])
+        return True
+
+    def reprice(self, pricing: dict):
+        """Recompute every cost under ``pricing`` from retained token counts.
+
+        Nothing is re-parsed: subagent detail costs are recomputed first,
+        then the aggregator rebuilds its totals in one pass over the parser.
+        """
+        self.pricing = pricing
+        for event in self.parser.subagents:
+            if event.detail is not None:
+                event.detail.cost = self._subagent_cost(event)
+        self.aggregator.reprice(pricing)
+        self.versions.bump("timeline", "stats", "header")
+
+    def poll(self) -> bool:
+        """Read new lines from every session, pick up new sessions and advance
+        running subagents; return whether anything changed."""
+        delta = self.discovery.refresh()
+        for path in delta.removed:
+            self._scheduler.untrack(path)
+            if path in self._backfill:
+                self._backfill.remove(path)
+        if delta.added:
+            # A session that shows up with a large backlog (one resumed from
+            # elsewhere, or the project changed) is parsed like the history
+            added, offsets = load_sessions(delta.added, self._checkpoints, isolate=True)
+            if added is not None:
+                self.parser.merge(added)
+                self._set_parser(self.parser)
+            for path, offset in offsets.items():
+                self._scheduler.track(path, offset, active=True)
+            self._start_watching(delta.added[-1].parent)
+
+        result = self._scheduler.poll(self.parser)
+        if result.rotated:
+            # Truncated or replaced: lines already parsed are no longer valid
+            self._reload_sessions()
+            result.lines += 1
+        self._session_path = self._scheduler.most_recent or self._session_path
+        return bool(self._resolve_subagent_details() or result.lines or delta)
+
+    def _subagent_index(self, session_id: str) -> SubagentIndex | None:
+        """The subagent directory index of a session in the current project."""
+        index = self._subagent_indexes.get(session_id)
+        if index is None and session_id and self.discovery.project_dir is not None:
+            index = SubagentIndex(self.discovery.project_dir / session_id)
+            index.refresh()
+            self._subagent_indexes[session_id] = index
+        return index
+
+    def _resolve_subagent_details(self) -> bool:
+        """Tail the transcripts of dispatched subagents and cost their usage.
+
+        Once a subagent's agent id is known it waits on its session's
+        SubagentIndex, which opens its transcript as soon as the file shows
+        up. Open transcripts are read incrementally on every poll, so running
+        subagents show live tokens and cost. A transcript is closed once the
+        Task's result has arrived, since the result is written after the
+        transcript's last line.
+        Returns whether any subagent detail changed.
+        """
+        for index in self._subagent_indexes.values():
+            if index.waiting:
+                index.refresh()
+        changed = False
+
+        for event in self.parser.subagents:
+            transcript = self._subagent_transcripts.get(event.tool_use_id)
+            if transcript is None:
+                if event.detail is not None or not event.tool_use_id:
+                    continue
+                if event.tool_use_id in self._awaiting_transcripts:
+                    continue
+                agent_id = self.parser.agent_id_map.get(event.tool_use_id)
+                if not agent_id:
+                    continue
+                index = self._subagent_index(event.session_id)
+                if index is None:
+                    continue
+                self._awaiting_transcripts.add(event.tool_use_id)
+                index.wait_for(agent_id, partial(self._open_transcript, event.tool_use_id))
+                transcript = self._subagent_transcripts.get(event.tool_use_id)
+                if transcript is None:
+                    continue
+
+            if transcript.update() or event.detail is not transcript.detail:
+                event.detail = transcript.detail
+                event.detail.cost = self._subagent_cost(event)
+                self.aggregator.update_subagent(event)
+                self.versions.bump("timeline", "stats")
+                changed = True
+            if event.status != "running":
+                transcript.close()
+                del self._subagent_transcripts[event.tool_use_id]
+        return changed
+
+    def _subagent_cost(self, event: SubagentEvent) -> float:
+        detail = event.detail
+        return calculate_cost(
+            resolve_model(event.model),
+            detail.input_tokens, detail.output_tokens,
+            detail.cache_read_tokens, detail.cache_write_tokens,
+            self.pricing,
+        )
+
+    def _open_transcript(self, tool_use_id: str, path: Path):
+        """Start tailing a subagent transcript once the index has found it."""
+        self._awaiting_transcripts.discard(tool_use_id)
+        self._subagent_transcripts[tool_use_id] = SubagentTranscript(path)
@@ -0,0 +1,229 @@
+"""Linux inotify change notification for session and subagent transcripts.
+
+Uses libc through ctypes, so there is no native dependency. On platforms
+without inotify, ``ChangeNotifier.start`` returns False and callers keep
+polling instead.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+IN_MODIFY = 0x00000002
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+# Project directory: session files change, session directories appear.
+PROJECT_MASK = IN_MODIFY | IN_CREATE | IN_MOVED_TO | IN_DELETE
+# <session>/: only interested in the subagents/ directory appearing.
+SESSION_DIR_MASK = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR
+# <session>/subagents/: transcript files appear and grow.
+SUBAGENTS_MASK = IN_MODIFY | IN_CREATE | IN_MOVED_TO
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_init1.restype = ctypes.c_int
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_add_watch.restype = ctypes.c_int
+    return libc
+
+
+_libc = _load_libc()
+
+
+def inotify_available() -> bool:
+    """Return whether this platform supports inotify."""
+    return _libc is not None
+
+
+class Inotify:
+    """A non-blocking inotify file descriptor."""
+
+    def __init__(self):
+        if _libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        return wd
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """Drain pending events as (wd, mask, name) tuples."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            if not data:
+                return events
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = data[pos:pos + length].rstrip(b"\0").decode(errors="replace")
+                pos += length
+                events.append((wd, mask, name))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class ChangeNotifier:
+    """Calls ``callback`` from a background thread when transcripts change.
+
+    Watches the project directory for session JSONL writes and new session
+    directories, each ``<session>/`` for its ``subagents/`` directory, and
+    each ``<session>/subagents/`` for transcript writes. Bursts of events
+    are coalesced for ``debounce`` seconds into a single callback.
+    """
+
+    def __init__(self, project_dir: Path, callback: Callable[[], None], debounce: float = 0.01):
+        self.project_dir = project_dir
+        self._callback = callback
+        self._debounce = debounce
+        self._inotify: Inotify | None = None
+        self._thread: threading.Thread | None = None
+        self._stop_r = self._stop_w = -1
+        self._watches: dict[int, tuple[str, Path]] = {}  # wd -> (kind, path)
+
+    def start(self) -> bool:
+        """Start watching; returns False when inotify cannot be used."""
+        try:
+            self._inotify = Inotify()
+            self._watch(self.project_dir, "project", PROJECT_MASK)
+        except OSError:
+            self._close_fds()
+            return False
+        for child in self._iter_dirs(self.project_dir):
+            self._watch_session_dir(child)
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="superdash-inotify", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if self._thread is not None:
+            os.write(self._stop_w, b"x")
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._close_fds()
+
+    def _close_fds(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        for fd in (self._stop_r, self._stop_w):
+            if fd >= 0:
+                os.close(fd)
+        self._stop_r = self._stop_w = -1
+
+    @staticmethod
+    def _iter_dirs(path: Path):
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield Path(entry.path)
+        except OSError:
+            return
+
+    def _watch(self, path: Path, kind: str, mask: int) -> bool:
+        try:
+            wd = self._inotify.add_watch(path, mask)
+        except OSError:
+            if kind == "project":
+                raise
+            return False
+        self._watches[wd] = (kind, path)
+        return True
+
+    def _watch_session_dir(self, session_dir: Path):
+        self._watch(session_dir, "session", SESSION_DIR_MASK)
+        subagents = session_dir / "subagents"
+        if subagents.is_dir():
+            self._watch(subagents, "subagents", SUBAGENTS_MASK)
+
+    def _handle(self, events: list[tuple[int, int, str]]) -> bool:
+        """Update watches for new directories; return whether anything relevant changed."""
+        changed = False
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                changed = True
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            kind, path = self._watches.get(wd, ("", None))
+            if path is None:
+                continue
+            if mask & IN_ISDIR:
+                if kind == "project" and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_session_dir(path / name)
+                    changed = True
+                elif kind == "session" and name == "subagents":
+                    self._watch(path / name, "subagents", SUBAGENTS_MASK)
+                    changed = True
+            elif name.endswith(".jsonl"):
+                changed = True
+        return changed
+
+    def _run(self):
+        fd = self._inotify.fd
+        while True:
+            readable, _, _ = select.select([fd, self._stop_r], [], [])
+            if self._stop_r in readable:
+                return
+            changed = self._handle(self._inotify.read_events())
+            # Coalesce the rest of a write burst into the same wake-up, but
+            # never hold a continuous stream back longer than the window
+            deadline = time.monotonic() + self._debounce
+            while (remaining := deadline - time.monotonic()) > 0:
+                readable, _, _ = select.select([fd, self._stop_r], [], [], remaining)
+                if self._stop_r in readable:
+                    return
+                if not readable:
+                    break
+                changed = self._handle(self._inotify.read_events()) or changed
+            if changed:
+                try:
+                    self._callback()
+                except Exception:
+                    # The consumer is shutting down; stop delivering events
+                    return
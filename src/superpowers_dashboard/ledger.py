@@ -0,0 +1,231 @@
+"""Append-only, columnar record of every assistant turn's token usage."""
+from array import array
+from typing import Iterable
+
+from superpowers_dashboard.analytics import group_costs, group_sums, sum_by
+from superpowers_dashboard.costs import model_rates
+from superpowers_dashboard.symbols import SymbolTable
+
+OVERHEAD = -1  # skill_event column value of turns made with no skill active
+NO_SEGMENT = -1  # segment column value of turns billed to a skill event
+
+HOUR_MS = 3_600_000
+
+# Column name -> array typecode: 38 bytes a turn
+COLUMNS = {
+    "ts_ms": "q",
+    "model": "H",  # number in UsageLedger.models
+    "session": "I",  # number in UsageLedger.sessions
+    "skill_event": "i",  # position in SessionParser.skill_events, or OVERHEAD
+    "segment": "i",  # number of the overhead segment (see SessionParser.segment_numbers), or NO_SEGMENT
+    "input_tokens": "I",
+    "output_tokens": "I",
+    "cache_read_tokens": "I",
+    "cache_write_tokens": "I",
+}
+TOKEN_COLUMNS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
+
+# Appended rows are moved into the columns this many at a time, or
+# sooner when the columns are read.
+_BATCH = 4096
+
+
+class UsageLedger:
+    """One row per assistant turn, stored as typed ``array`` columns.
+
+    Each row holds the turn's epoch-millisecond time, model and session
+    (numbered in the ledger's own symbol tables), the skill event or
+    overhead segment the turn was billed to and its four token counts.
+    Every breakdown is one linear pass over the columns (vectorized when
+    NumPy is installed, see ``superpowers_dashboard.analytics``), so adding
+    one needs no re-parse.
+
+    ``sums_by`` and ``costs_by`` remember their result and later only pass
+    over rows appended since, and ``extend`` carries the results of the
+    ledger it absorbs along, so following a ledger as it grows and merges
+    reads each row once.
+    """
+
+    def __init__(self):
+        self.models = SymbolTable()
+        self.sessions = SymbolTable()
+        self._columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        self._pending: list[tuple] = []
+        # (column, bucket, priced) -> (pricing or None, rows covered, result)
+        self._views: dict[tuple, tuple] = {}
+
+    def __getstate__(self) -> dict:
+        self._flush()
+        state = self.__dict__.copy()
+        state["_views"] = {}  # cheap to rebuild, and holds the caller's pricing
+        return state
+
+    def __len__(self) -> int:
+        return len(self._columns["ts_ms"]) + len(self._pending)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns' data."""
+        self._flush()
+        return sum(column.itemsize * len(column) for column in self._columns.values())
+
+    def column(self, name: str) -> array:
+        """The column ``name`` (see COLUMNS), holding every row appended so far."""
+        self._flush()
+        return self._columns[name]
+
+    def append(
+        self, ts_ms: int, model: str, session_id: str, skill_event: int, segment: int,
+        input_tokens: int, output_tokens: int, cache_read_tokens: int, cache_write_tokens: int,
+    ):
+        self._pending.append((
+            ts_ms, model, session_id, skill_event, segment,
+            input_tokens, output_tokens, cache_read_tokens, cache_write_tokens,
+        ))
+        if len(self._pending) >= _BATCH:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        ts_ms, models, sessions, *rest = zip(*rows)
+        columns = self._columns
+        columns["ts_ms"].extend(ts_ms)
+        columns["model"].extend(_numbers(models, self.models))
+        columns["session"].extend(_numbers(sessions, self.sessions))
+        for name, values in zip(("skill_event", "segment", *TOKEN_COLUMNS), rest):
+            columns[name].extend(values)
+
+    def extend(self, other: "UsageLedger", skill_event_offset: int = 0, segment_offset: int = 0):
+        """Append ``other``'s rows, whose skill events now start at
+        ``skill_event_offset`` and overhead segments at ``segment_offset``."""
+        self._flush()
+        other._flush()
+        offsets = {"skill_event": skill_event_offset, "segment": segment_offset}
+        # Bring our results up to date, then add other's on top: rows other
+        # already read are not read again
+        views = {}
+        for key, (pricing, rows, view) in other._views.items():
+            column, bucket, _ = key
+            combined = self._view(column, bucket, pricing)
+            _add_view(combined, _shifted(view, offsets.get(column, 0)))
+            views[key] = (pricing, len(self) + rows, combined)
+
+        columns, others = self._columns, other._columns
+        columns["ts_ms"].extend(others["ts_ms"])
+        columns["model"].extend(_renumber(others["model"], self.models, other.models))
+        columns["session"].extend(_renumber(others["session"], self.sessions, other.sessions))
+        for name, offset in offsets.items():
+            if offset:
+                # OVERHEAD and NO_SEGMENT are both -1 and stay so
+                columns[name].extend(array("i", [i + offset if i >= 0 else i for i in others[name]]))
+            else:
+                columns[name].extend(others[name])
+        for name in TOKEN_COLUMNS:
+            columns[name].extend(others[name])
+        self._views.update(views)
+
+    # -- views -----------------------------------------------------------
+
+    def totals(self) -> tuple[int, int, int, int]:
+        """Input, output, cache read and cache write tokens over all turns."""
+        self._flush()
+        return tuple(sum(self._columns[name]) for name in TOKEN_COLUMNS)
+
+    def _token_columns(self) -> list[array]:
+        self._flush()
+        return [self._columns[name] for name in TOKEN_COLUMNS]
+
+    def _named(self, column: str, groups: dict) -> dict:
+        """``groups`` keyed by name rather than number, for the model and session columns."""
+        table = {"model": self.models, "session": self.sessions}.get(column)
+        if table is None:
+            return groups
+        return {table.names[number]: value for number, value in groups.items()}
+
+    def group_by(self, keys: Iterable) -> dict:
+        """Token totals per key, given one key per row: {key: [in, out, cache_read, cache_write]}."""
+        return sum_by(keys, self._token_columns())
+
+    def sums_by(self, column: str, bucket: int = 1) -> dict:
+        """Token totals per value of ``column`` (rounded down to a multiple of ``bucket``)."""
+        return {key: list(totals) for key, totals in self._view(column, bucket, None).items()}
+
+    def costs_by(self, column: str, pricing: dict, bucket: int = 1) -> dict:
+        """Dollars per value of ``column`` under ``pricing``, each turn at its own model's rates."""
+        return dict(self._view(column, bucket, pricing))
+
+    def _view(self, column: str, bucket: int, pricing: dict | None) -> dict:
+        """The remembered result for ``column``, extended over the rows appended since."""
+        self._flush()
+        key = (column, bucket, pricing is not None)
+        cached = self._views.get(key)
+        rows, view = (cached[1], cached[2]) if cached is not None and cached[0] is pricing else (0, {})
+        if rows < len(self):
+            _add_view(view, self._compute(column, bucket, pricing, rows))
+            self._views[key] = (pricing, len(self), view)
+        return view
+
+    def _compute(self, column: str, bucket: int, pricing: dict | None, start: int) -> dict:
+        """``column``'s breakdown over the rows from ``start`` on."""
+        def rows(name: str) -> array:
+            return self._columns[name][start:] if start else self._columns[name]
+
+        columns = [rows(name) for name in TOKEN_COLUMNS]
+        if pricing is None:
+            return self._named(column, group_sums(rows(column), columns, bucket))
+        rates = [model_rates(name, pricing) for name in self.models.names]
+        return self._named(column, group_costs(rows(column), rows("model"), columns, rates, bucket))
+
+    def by_model(self) -> dict[str, list[int]]:
+        """Token totals per model id, counting every turn (Skill calls included)."""
+        return self.sums_by("model")
+
+    def by_session(self) -> dict[str, list[int]]:
+        return self.sums_by("session")
+
+    def by_skill_event(self) -> dict[int, list[int]]:
+        """Token totals per skill event position; OVERHEAD for turns with no skill."""
+        return self.sums_by("skill_event")
+
+    def by_segment(self) -> dict[int, list[int]]:
+        """Token totals per overhead segment number; NO_SEGMENT for turns billed to a skill."""
+        return self.sums_by("segment")
+
+    def by_hour(self) -> dict[int, list[int]]:
+        """Token totals per hour, keyed by the hour's start in epoch milliseconds."""
+        return self.sums_by("ts_ms", HOUR_MS)
+
+
+def _add_view(view: dict, more: dict):
+    """Add ``more`` (sums or costs by key) into ``view``."""
+    for key, value in more.items():
+        mine = view.get(key)
+        if mine is None:
+            view[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(mine, list):
+            view[key] = [a + b for a, b in zip(mine, value)]
+        else:
+            view[key] = mine + value
+
+
+def _shifted(view: dict, offset: int) -> dict:
+    """``view`` with its non-negative keys moved ``offset`` along."""
+    if not offset:
+        return view
+    return {key + offset if key >= 0 else key: value for key, value in view.items()}
+
+
+def _numbers(names: tuple[str, ...], table: SymbolTable):
+    """The numbers of ``names`` in ``table``, numbering any it has not seen."""
+    distinct = {name: table.number(name) for name in dict.fromkeys(names)}
+    return map(distinct.__getitem__, names)
+
+
+def _renumber(column: array, table: SymbolTable, other_table: SymbolTable) -> array:
+    """``column``, numbered in ``other_table``, renumbered for ``table``."""
+    numbers = [table.number(name) for name in other_table.names]
+    if numbers == list(range(len(numbers))):
+        return column
+    return array(column.typecode, map(numbers.__getitem__, column))
@@ -0,0 +1,94 @@
+"""Parallel loading of session history into a single merged parser."""
+import contextlib
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from superpowers_dashboard.cache import CheckpointCache, parse_session_file
+from superpowers_dashboard.watcher import SessionParser
+
+# Below this many bytes left to parse, spawning worker processes costs more
+# than it saves.
+POOL_MIN_BYTES = 16 * 1024 * 1024
+
+
+def _ensure_resource_tracker():
+    """Start multiprocessing's resource tracker with the real stderr.
+
+    Spawned processes need the tracker, which is handed ``sys.stderr``'s file
+    descriptor. Inside a running Textual app ``sys.stderr`` is a capture
+    object whose ``fileno()`` is -1, and starting the tracker fails.
+    """
+    from multiprocessing import resource_tracker
+
+    with contextlib.redirect_stderr(sys.__stderr__):
+        resource_tracker.ensure_running()
+
+
+def _parse_in_worker(path: Path, cache: CheckpointCache | None) -> tuple[SessionParser, int]:
+    parser, reader = parse_session_file(path, cache)
+    offset = reader.offset
+    reader.close()
+    return parser, offset
+
+
+def bytes_to_parse(path: Path, cache: CheckpointCache | None) -> int:
+    """Bytes of ``path`` past its checkpoint, i.e. what loading it would parse."""
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return 0
+    checkpoint = cache.peek(path) if cache is not None else None
+    return size - checkpoint.offset if checkpoint is not None else size
+
+
+def load_sessions(
+    session_paths: list[Path],
+    cache: CheckpointCache | None = None,
+    max_workers: int | None = None,
+    pool_min_bytes: int = POOL_MIN_BYTES,
+    isolate: bool = False,
+) -> tuple[SessionParser | None, dict[Path, int]]:
+    """Parse session files independently and merge them in the given order.
+
+    Files with a lot left to parse are spread over a process pool; cached or
+    small files are handled inline. With ``isolate``, a large backlog goes to
+    a worker process even when only one fits: a caller on a background
+    thread then waits on the pool instead of holding the GIL against the UI
+    thread for the whole parse. ``session_paths`` must be chronological,
+    since ``SessionParser.merge`` applies session-boundary rules in order.
+
+    Returns the merged parser and, for each file parsed, the offset just
+    past its last complete line, from which it can be tailed. Returns
+    (None, {}) when none of the files exist.
+    """
+    paths = [p for p in session_paths if p.exists()]
+    if not paths:
+        return None, {}
+
+    pending = {p: bytes_to_parse(p, cache) for p in paths}
+    heavy = [p for p in paths if pending[p] > 0]
+    workers = min(max_workers or os.cpu_count() or 1, len(heavy))
+    results: dict[Path, tuple[SessionParser, int]] = {}
+    if (workers > 1 or isolate and workers == 1) and sum(pending[p] for p in heavy) >= pool_min_bytes:
+        # Spawn rather than fork: the app may already be running threads
+        context = multiprocessing.get_context("spawn")
+        _ensure_resource_tracker()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # Largest first so one big file doesn't start last and straggle
+            heavy.sort(key=lambda p: -pending[p])
+            futures = {p: pool.submit(_parse_in_worker, p, cache) for p in heavy}
+            for path, future in futures.items():
+                results[path] = future.result()
+
+    merged: SessionParser | None = None
+    offsets: dict[Path, int] = {}
+    for path in paths:
+        parser, offsets[path] = results.get(path) or _parse_in_worker(path, cache)
+        if merged is None:
+            merged = parser
+        else:
+            merged.merge(parser)
+    return merged, offsets
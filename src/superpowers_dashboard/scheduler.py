@@ -0,0 +1,133 @@
+"""Tailing every session file of a project, each from its own byte offset."""
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from superpowers_dashboard.tail import TailReader
+from superpowers_dashboard.watcher import SessionParser
+
+# A session that grew within this many seconds is polled on every call.
+HOT_WINDOW = 120.0
+# Idle sessions checked per call, in rotation.
+COLD_BATCH = 16
+
+
+@dataclass
+class PollResult:
+    """What one ``TailScheduler.poll`` call ingested."""
+    lines: int = 0
+    rotated: list[Path] = field(default_factory=list)  # rewritten; already-parsed lines are invalid
+
+
+class _TailedSession:
+    __slots__ = ("path", "reader", "last_active")
+
+    def __init__(self, path: Path, offset: int, last_active: float):
+        self.path = path
+        self.reader = TailReader(path, offset=offset)
+        self.last_active = last_active
+
+
+class TailScheduler:
+    """Feeds new lines from every session file of a project into one parser.
+
+    Each session keeps its own TailReader and byte offset, so every byte is
+    ingested exactly once whichever file is written to, and lines are routed
+    to their session with ``SessionParser.select_session``. Sessions that
+    grew recently are polled on every call, most recently active first. Idle
+    sessions are checked ``cold_batch`` at a time in rotation with their file
+    closed in between, so a long history costs a few stats per poll while a
+    resumed session is still picked up within a few polls.
+    """
+
+    def __init__(
+        self,
+        hot_window: float = HOT_WINDOW,
+        cold_batch: int = COLD_BATCH,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._hot_window = hot_window
+        self._cold_batch = cold_batch
+        self._clock = clock
+        self._hot: dict[Path, _TailedSession] = {}
+        self._cold: deque[_TailedSession] = deque()
+
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._cold)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._hot or any(s.path == path for s in self._cold)
+
+    @property
+    def most_recent(self) -> Path | None:
+        """The session that most recently had lines appended, if any is hot."""
+        if not self._hot:
+            return None
+        return max(self._hot.values(), key=lambda s: s.last_active).path
+
+    def track(self, path: Path, offset: int = 0, active: bool = False):
+        """Start tailing ``path`` from ``offset``; ``active`` polls it from the first call."""
+        if path in self:
+            return
+        if active:
+            self._hot[path] = _TailedSession(path, offset, self._clock())
+        else:
+            self._cold.append(_TailedSession(path, offset, float("-inf")))
+
+    def untrack(self, path: Path):
+        session = self._hot.pop(path, None)
+        if session is None:
+            session = next((s for s in self._cold if s.path == path), None)
+            if session is None:
+                return
+            self._cold.remove(session)
+        session.reader.close()
+
+    def clear(self):
+        for session in [*self._hot.values(), *self._cold]:
+            session.reader.close()
+        self._hot.clear()
+        self._cold.clear()
+
+    def poll(self, parser: SessionParser) -> PollResult:
+        """Feed whatever was appended to hot sessions and the next idle batch."""
+        now = self._clock()
+        result = PollResult()
+        for session in list(self._hot.values()):
+            if now - session.last_active >= self._hot_window:
+                del self._hot[session.path]
+                session.reader.close()
+                self._cold.append(session)
+
+        for session in sorted(self._hot.values(), key=lambda s: -s.last_active):
+            self._ingest(session, parser, now, result)
+
+        for _ in range(min(self._cold_batch, len(self._cold))):
+            session = self._cold.popleft()
+            if self._ingest(session, parser, now, result):
+                self._hot[session.path] = session
+            else:
+                session.reader.close()
+                self._cold.append(session)
+        return result
+
+    def _ingest(self, session: _TailedSession, parser: SessionParser, now: float, result: PollResult) -> bool:
+        """Feed one session's new lines; return whether there were any."""
+        reader = session.reader
+        count = 0
+        for line in reader.iter_lines():
+            if reader.rotated:
+                break
+            if count == 0:
+                parser.select_session(session.path.stem)
+            parser.process_line(line)
+            count += 1
+        if reader.rotated:
+            result.rotated.append(session.path)
+            return False
+        if count:
+            session.last_active = now
+            result.lines += count
+        return count > 0
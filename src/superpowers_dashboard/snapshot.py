@@ -0,0 +1,198 @@
+"""Immutable view of parser state, built off the UI thread and rendered on it."""
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from superpowers_dashboard.aggregates import Aggregator, SubagentTotals
+from superpowers_dashboard.grouping import build_task_groups
+from superpowers_dashboard.timeline import ParserTimeline, merge
+from superpowers_dashboard.versions import WidgetVersions
+from superpowers_dashboard.watcher import CompactionEvent
+
+
+class LoadProgress(NamedTuple):
+    """How far loading the session history has got."""
+    loaded: int  # sessions
+    total: int
+    bytes_left: int  # still to parse, not counting checkpointed bytes
+
+    def describe(self) -> str:
+        return f"loading {self.loaded}/{self.total} sessions, {format_size(self.bytes_left)} left"
+
+
+def format_size(count: int) -> str:
+    """Format a byte count, e.g. 1300000000 -> '1.3 GB'."""
+    size = float(count)
+    for unit in ("B", "KB", "MB"):
+        if size < 1000:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} GB"
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Everything the widgets show, derived from one consistent parser state.
+
+    Snapshots share nothing mutable with the parser that produced them, so
+    the UI can render one while the ingestion thread keeps parsing.
+    """
+    session_id: str = ""
+    active_skill: str | None = None
+    used_skills: frozenset[str] = frozenset()
+    entries: tuple[dict, ...] = ()  # workflow timeline, sorted by timestamp
+    total_cost: float = 0.0
+    total_input: int = 0
+    total_output: int = 0
+    total_cache_read: int = 0
+    per_skill: tuple[dict, ...] = ()
+    tool_counts: dict[str, int] = field(default_factory=dict)
+    subagent_count: int = 0
+    compactions: tuple[CompactionEvent, ...] = ()
+    context_tokens: int = 0
+    session_count: int = 0
+    skill_count: int = 0
+    subagent_totals: SubagentTotals = SubagentTotals()
+    model_stats: tuple[dict, ...] = ()
+    loading: LoadProgress | None = None  # None once the whole history is loaded
+    versions: WidgetVersions = WidgetVersions()
+
+
+def build_snapshot(
+    aggregator: Aggregator,
+    session_id: str = "",
+    loading: LoadProgress | None = None,
+    versions: WidgetVersions = WidgetVersions(),
+    timeline: ParserTimeline | None = None,
+) -> DashboardSnapshot:
+    """Derive the workflow timeline, totals and per-model stats of ``aggregator.parser``.
+
+    Costs and totals come from the aggregator's running state rather than
+    being repriced here, and entries come out of ``timeline`` (a
+    ParserTimeline on the same parser) already in time order.
+    """
+    parser = aggregator.parser
+    if timeline is None:
+        timeline = ParserTimeline(parser)
+    else:
+        timeline.sync()
+
+    # Build workflow entries (skills)
+    skill_entries = []
+    last_skill = None
+    for ts_ms, i in timeline["skill_events"]:
+        event = parser.skill_events[i]
+        total_tokens = event.input_tokens + event.output_tokens + event.cache_read_tokens + event.cache_write_tokens
+        entry = {
+            "kind": "skill",
+            "timestamp": event.timestamp,
+            "ts_ms": ts_ms,
+            "clock": event.clock,
+            "skill_name": event.skill_name,
+            "args": event.args,
+            "total_tokens": total_tokens,
+            "cost": aggregator.event_cost(i),
+            "duration_seconds": event.duration_ms / 1000.0,
+            "is_active": event.skill_name == parser.active_skill and i == len(parser.skill_events) - 1,
+        }
+        if i == len(parser.skill_events) - 1:
+            last_skill = entry
+        skill_entries.append((ts_ms, entry))
+
+    # Add overhead segments
+    overhead_entries = []
+    for ts_ms, i in timeline["overhead_segments"]:
+        seg = parser.overhead_segments[i]
+        tool_summary = f"tools({seg.tool_count})" if seg.tool_count else ""
+        overhead_entries.append((ts_ms, {
+            "kind": "overhead",
+            "timestamp": seg.timestamp,
+            "ts_ms": ts_ms,
+            "clock": seg.clock,
+            "input_tokens": seg.input_tokens,
+            "output_tokens": seg.output_tokens,
+            "cost": aggregator.segment_cost(i),
+            "duration_seconds": seg.duration_ms / 1000.0,
+            "tool_summary": tool_summary,
+        }))
+
+    # Build subagent entries with role/status for grouping
+    subagent_entries_for_grouping = []
+    for _, i in timeline["subagents"]:
+        s = parser.subagents[i]
+        status = s.status
+        if s.detail is not None:
+            detail = s.detail
+            if detail.finished:
+                status = "complete"
+            sa_total = detail.input_tokens + detail.output_tokens + detail.cache_read_tokens + detail.cache_write_tokens
+            subagent_entries_for_grouping.append({
+                "kind": "subagent",
+                "timestamp": s.timestamp,
+                "ts_ms": s.ts_ms,
+                "description": s.description,
+                "subagent_type": s.subagent_type,
+                "total_tokens": sa_total,
+                "cost": detail.cost,
+                "skills_invoked": list(detail.skills_invoked),
+                "status": status,
+            })
+        else:
+            subagent_entries_for_grouping.append({
+                "kind": "subagent",
+                "timestamp": s.timestamp,
+                "ts_ms": s.ts_ms,
+                "description": s.description,
+                "subagent_type": s.subagent_type,
+                "total_tokens": 0,
+                "cost": 0,
+                "skills_invoked": [],
+                "status": status,
+            })
+
+    # Group subagents by task number
+    task_groups, ungrouped = build_task_groups(subagent_entries_for_grouping)
+
+    # Attach task groups to their parent skill entry
+    if task_groups and last_skill is not None:
+        last_skill["task_groups"] = task_groups
+
+    # Add compaction events to timeline
+    compaction_entries = []
+    for ts_ms, i in timeline["compactions"]:
+        c = parser.compactions[i]
+        compaction_entries.append((ts_ms, {
+            "kind": "compaction",
+            "timestamp": c.timestamp,
+            "ts_ms": ts_ms,
+            "clock": c.clock,
+            "compaction_kind": c.kind,
+            "pre_tokens": c.pre_tokens,
+        }))
+
+    # Each source is in time order (ungrouped subagents keep the order they
+    # were grouped in), so merging them is enough
+    entries = [entry for _, entry in merge(
+        skill_entries, overhead_entries, ((u["ts_ms"], u) for u in ungrouped), compaction_entries,
+    )]
+
+    return DashboardSnapshot(
+        session_id=session_id,
+        active_skill=parser.active_skill,
+        used_skills=frozenset(parser.used_skills),
+        entries=tuple(entries),
+        total_cost=aggregator.total_cost,
+        total_input=aggregator.total_input,
+        total_output=aggregator.total_output,
+        total_cache_read=aggregator.total_cache_read,
+        per_skill=tuple(aggregator.per_skill()),
+        tool_counts=dict(parser.tool_counts),
+        subagent_count=len(parser.subagents),
+        compactions=tuple(parser.compactions),
+        context_tokens=parser.last_context_tokens,
+        session_count=parser.session_count,
+        skill_count=len(parser.skill_events),
+        subagent_totals=aggregator.subagent_totals,
+        model_stats=tuple(aggregator.model_stats()),
+        loading=loading,
+        versions=versions,
+    )
@@ -0,0 +1,198 @@
+"""Incremental field extraction for JSONL lines too large to decode whole.
+
+``extract_entry`` tokenizes a line from an iterator of byte chunks and builds
+only the parts of the entry the parser reads: top-level keys outside
+``ENTRY_FIELDS`` are skipped without creating their values, and strings
+longer than ``max_string`` bytes keep just a head and tail window. Memory
+use is bounded by the chunk size plus the kept fields, however long the
+line is.
+"""
+import json
+import re
+from typing import Iterable
+
+# Top-level keys any SessionParser handler or subagent parser reads.
+ENTRY_FIELDS = frozenset({
+    "type", "subtype", "timestamp", "isMeta", "message", "content", "data",
+    "compactMetadata", "microcompactMetadata", "durationMs", "parentToolUseID",
+})
+
+# Longest string kept verbatim. Longer ones keep half of this from each end;
+# the tail matters because Task results end with their agentId trailer.
+MAX_STRING = 8192
+
+_WS_RE = re.compile(rb"[ \t\r\n]*")
+_SCALAR_RE = re.compile(rb"-?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null")
+_ESCAPE_RE = re.compile(r"\\(u[0-9a-fA-F]{4}|.)", re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+_SCALAR_LOOKAHEAD = 64
+
+
+class StreamingDecodeError(ValueError):
+    """The line is not a well-formed JSON object."""
+
+
+def _unescape_lossy(raw: bytes) -> str:
+    """Decode a JSON string body that may be cut mid-escape or mid-character."""
+    text = raw.decode("utf-8", "replace")
+    text = _ESCAPE_RE.sub(
+        lambda m: chr(int(m.group(1)[1:], 16)) if len(m.group(1)) == 5 else _ESCAPES.get(m.group(1), m.group(1)),
+        text,
+    )
+    # Re-pair surrogate halves that arrived as two separate \uXXXX escapes
+    return text.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+
+
+class _Scanner:
+    def __init__(self, chunks: Iterable[bytes], max_string: int):
+        self._chunks = iter(chunks)
+        self._max_string = max_string
+        self.buf = b""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed bytes. False at end of input."""
+        for chunk in self._chunks:
+            if chunk:
+                self.buf = self.buf[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self) -> int:
+        """Skip whitespace and return the next byte without consuming it."""
+        while True:
+            self.pos = _WS_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise StreamingDecodeError("unexpected end of line")
+
+    def expect(self, byte: int):
+        if self.peek() != byte:
+            raise StreamingDecodeError(f"expected {chr(byte)!r} at byte {self.pos}")
+        self.pos += 1
+
+    def value(self, build: bool):
+        c = self.peek()
+        if c == 0x7B:  # {
+            return self.object(build)
+        if c == 0x5B:  # [
+            return self.array(build)
+        if c == 0x22:  # "
+            return self.string(build)
+        return self.scalar()
+
+    def object(self, build: bool, keep: frozenset | None = None) -> dict | None:
+        self.expect(0x7B)
+        result = {} if build else None
+        if self.peek() == 0x7D:
+            self.pos += 1
+            return result
+        while True:
+            if self.peek() != 0x22:
+                raise StreamingDecodeError(f"expected a key at byte {self.pos}")
+            key = self.string(True)
+            self.expect(0x3A)  # :
+            wanted = build and (keep is None or key in keep)
+            value = self.value(wanted)
+            if wanted:
+                result[key] = value
+            c = self.peek()
+            self.pos += 1
+            if c == 0x7D:  # }
+                return result
+            if c != 0x2C:  # ,
+                raise StreamingDecodeError(f"expected ',' or '}}' at byte {self.pos - 1}")
+
+    def array(self, build: bool) -> list | None:
+        self.expect(0x5B)
+        result = [] if build else None
+        if self.peek() == 0x5D:
+            self.pos += 1
+            return result
+        while True:
+            value = self.value(build)
+            if build:
+                result.append(value)
+            c = self.peek()
+            self.pos += 1
+            if c == 0x5D:  # ]
+                return result
+            if c != 0x2C:
+                raise StreamingDecodeError(f"expected ',' or ']' at byte {self.pos - 1}")
+
+    def scalar(self):
+        while len(self.buf) - self.pos < _SCALAR_LOOKAHEAD and self._fill():
+            pass
+        m = _SCALAR_RE.match(self.buf, self.pos)
+        if m is None:
+            raise StreamingDecodeError(f"unexpected byte at {self.pos}")
+        self.pos = m.end()
+        return json.loads(m.group())
+
+    def string(self, build: bool) -> str | None:
+        """Consume a string; quotes are located with ``bytes.find``, so long
+        string bodies are skipped in C rather than byte by byte."""
+        self.expect(0x22)
+        cap = self._max_string
+        half = cap // 2
+        head = bytearray()
+        tail = b""
+        total = 0
+        carry = 0  # backslashes ending the previous buffer
+        while True:
+            buf, start = self.buf, self.pos
+            end = buf.find(b'"', start)
+            while end >= 0:
+                k = end
+                while k > start and buf[k - 1] == 0x5C:
+                    k -= 1
+                run = end - k + (carry if k == start else 0)
+                if run % 2 == 0:
+                    break
+                end = buf.find(b'"', end + 1)
+            stop = end if end >= 0 else len(buf)
+            if build and stop > start:
+                segment = buf[start:stop]
+                total += len(segment)
+                if len(head) < cap:
+                    head += segment[:cap - len(head)]
+                tail = (tail + segment[-half:])[-half:]
+            if end >= 0:
+                self.pos = end + 1
+                break
+            k = stop
+            while k > start and buf[k - 1] == 0x5C:
+                k -= 1
+            carry = stop - k + (carry if k == start else 0)
+            self.pos = stop
+            if not self._fill():
+                raise StreamingDecodeError("unterminated string")
+        if not build:
+            return None
+        if total <= cap:
+            try:
+                return json.loads(b'"' + bytes(head) + b'"')
+            except ValueError:
+                return _unescape_lossy(bytes(head))
+        return _unescape_lossy(bytes(head[:half])) + "…" + _unescape_lossy(tail)
+
+
+def extract_entry(
+    chunks: Iterable[bytes],
+    keep: frozenset | None = ENTRY_FIELDS,
+    max_string: int = MAX_STRING,
+) -> dict:
+    """Build a pruned entry dict from the chunks of one JSONL line.
+
+    Only top-level keys in ``keep`` are built (all of them when None); nested
+    values under kept keys are built in full except that strings longer than
+    ``max_string`` bytes are shortened to ``head…tail``.
+
+    Raises StreamingDecodeError if the line is not a JSON object.
+    """
+    scanner = _Scanner(chunks, max_string)
+    if scanner.peek() != 0x7B:
+        raise StreamingDecodeError("line is not a JSON object")
+    return scanner.object(True, keep)
@@ -0,0 +1,46 @@
+"""Process-wide symbol tables for names repeated across many events."""
+import sys
+
+
+class SymbolTable:
+    """Numbers each distinct name in the order it is first seen.
+
+    Numbers are only meaningful within this process: anything pickled
+    must carry names, and look their numbers up again when loaded.
+    """
+
+    def __init__(self):
+        self.names: list[str] = []
+        self._numbers: dict[str, int] = {}
+
+    def number(self, name: str) -> int:
+        number = self._numbers.get(name)
+        if number is None:
+            number = self._numbers[name] = len(self.names)
+            self.names.append(sys.intern(name))
+        return number
+
+    def bit(self, name: str) -> int:
+        """The bit standing for ``name`` in a set of names kept as a bitmask."""
+        return 1 << self.number(name)
+
+    def mask(self, names) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.bit(name)
+        return mask
+
+    def names_in(self, mask: int) -> tuple[str, ...]:
+        """The names of the bits set in ``mask``, in the order they were first seen."""
+        names = []
+        number = 0
+        while mask:
+            if mask & 1:
+                names.append(self.names[number])
+            mask >>= 1
+            number += 1
+        return tuple(names)
+
+
+# Model ids, so a skill event's models are a small int instead of a set
+MODELS = SymbolTable()
@@ -0,0 +1,193 @@
+"""Partial-line-safe binary tail reader for append-only JSONL files."""
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+# Lines longer than this are not buffered; they are handed out as LargeLine
+# handles and read back in chunks by whoever consumes them.
+DEFAULT_MAX_LINE_BYTES = 2 << 20  # 2 MiB
+
+
+class LargeLine:
+    """A line longer than the reader's ``max_line_bytes``, read back on demand.
+
+    Holds only the line's position; the bytes are re-read from the file with
+    ``os.pread``. Valid until the reader that produced it is closed.
+    """
+
+    __slots__ = ("_fd", "start", "length")
+
+    def __init__(self, fd: int, start: int, length: int):
+        self._fd = fd
+        self.start = start
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def head(self, size: int) -> bytes:
+        """Return up to ``size`` bytes from the start of the line."""
+        return os.pread(self._fd, min(size, self.length), self.start)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        pos, end = self.start, self.start + self.length
+        while pos < end:
+            chunk = os.pread(self._fd, min(chunk_size, end - pos), pos)
+            if not chunk:
+                return
+            pos += len(chunk)
+            yield chunk
+
+
+class TailReader:
+    """Incrementally reads complete lines from a file that is being appended to.
+
+    The file is opened in binary mode and the handle is kept open between
+    reads. Bytes after the last newline are buffered until the writer finishes
+    the line, so a half-written entry is never handed to the parser. If the
+    file shrinks or the path is replaced by a new inode, reading restarts from
+    byte 0 and ``rotated`` is set for the caller to react to.
+
+    Lines longer than ``max_line_bytes`` are never held in memory: once a
+    line outgrows the limit its bytes are skipped until the newline turns
+    up, and it is yielded as a ``LargeLine`` instead of ``bytes``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        offset: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_line_bytes: int = DEFAULT_MAX_LINE_BYTES,
+    ):
+        self.path = path
+        self.offset = offset  # end of the last complete line handed out
+        self.rotated = False
+        self.max_line_bytes = max_line_bytes
+        self._chunk_size = chunk_size
+        self._file: BinaryIO | None = None
+        self._inode: int | None = None
+        self._partial = b""
+        self._skipped = 0  # bytes of an oversized line read past offset
+
+    def __enter__(self) -> "TailReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes read past ``offset`` that do not yet form a complete line."""
+        return len(self._partial) + self._skipped
+
+    def close(self) -> None:
+        """Close the handle; reading later reopens the file at ``offset``.
+
+        The inode is remembered, so a file replaced while closed is still
+        detected as rotated.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._partial = b""
+        self._skipped = 0
+
+    def read_lines(self) -> list[bytes | LargeLine]:
+        """Return all complete lines appended since the previous call."""
+        return list(self.iter_lines())
+
+    def iter_lines(self) -> Iterator[bytes | LargeLine]:
+        """Yield complete, non-empty lines (without the newline) as they are read.
+
+        ``offset`` is advanced before each line is yielded, so a consumer that
+        stops early resumes right after the last line it received.
+        """
+        self.rotated = False
+        size = self._check_file()
+        if size is None:
+            return
+        f = self._file
+        read_pos = self.offset + self.pending_bytes
+        try:
+            while read_pos < size:
+                chunk = f.read(min(self._chunk_size, size - read_pos))
+                if not chunk:
+                    break
+                read_pos += len(chunk)
+                if self._skipped:
+                    end = chunk.find(b"\n")
+                    if end < 0:
+                        self._skipped += len(chunk)
+                        continue
+                    length = self._skipped + end
+                    self._skipped = 0
+                    yield self._large_line(length)
+                    chunk = chunk[end + 1:]
+                data = self._partial + chunk if self._partial else chunk
+                end = data.rfind(b"\n")
+                if end < 0:
+                    self._partial = data
+                else:
+                    self._partial = data[end + 1:]
+                    for line in data[:end].split(b"\n"):
+                        if len(line) > self.max_line_bytes:
+                            yield self._large_line(len(line))
+                            continue
+                        self.offset += len(line) + 1
+                        if line and not line.isspace():
+                            yield line
+                if len(self._partial) > self.max_line_bytes:
+                    # Stop buffering; just look for where this line ends
+                    self._skipped = len(self._partial)
+                    self._partial = b""
+        except GeneratorExit:
+            # Consumer stopped mid-chunk: drop the read-ahead so the next call
+            # resumes exactly after the last line that was handed out.
+            self._partial = b""
+            self._skipped = 0
+            f.seek(self.offset)
+            raise
+
+    def _large_line(self, length: int) -> LargeLine:
+        line = LargeLine(self._file.fileno(), self.offset, length)
+        self.offset += length + 1
+        return line
+
+    def _check_file(self) -> int | None:
+        """Open or validate the handle and return the current file size.
+
+        Returns None when the file does not exist (yet).
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if self._inode is not None and st.st_ino != self._inode:
+            self._restart()
+        if self._file is None:
+            if st.st_ino == self._inode and st.st_size == self.offset:
+                return st.st_size  # closed and nothing appended: don't reopen
+            try:
+                self._file = open(self.path, "rb")
+            except OSError:
+                return None
+            st = os.fstat(self._file.fileno())
+            self._inode = st.st_ino
+            if self.offset > st.st_size:
+                self._restart(reopen=False)
+            self._file.seek(self.offset)
+        elif st.st_size < self.offset + self.pending_bytes:
+            self._restart(reopen=False)
+            self._file.seek(0)
+        return st.st_size
+
+    def _restart(self, reopen: bool = True) -> None:
+        if reopen:
+            self.close()
+            self._inode = None
+        self.offset = 0
+        self._partial = b""
+        self._skipped = 0
+        self.rotated = True
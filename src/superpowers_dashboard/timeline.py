@@ -0,0 +1,79 @@
+"""Time-ordered views of the parser's event lists, kept up to date incrementally."""
+import heapq
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Iterable, Iterator, TypeVar
+
+from superpowers_dashboard.watcher import SessionParser
+
+T = TypeVar("T")
+
+# Parser lists followed by ParserTimeline, in the order their entries sort
+# when times are equal.
+SOURCES = ("skill_events", "overhead_segments", "subagents", "compactions")
+
+
+class Timeline:
+    """Items kept sorted by epoch-millisecond time as they are added.
+
+    Items nearly always arrive in order and are appended. One older than
+    the newest so far (from a concurrent session, or history merged in) is
+    inserted after any items with the same time.
+    """
+
+    def __init__(self):
+        self._times: list[int] = []
+        self._items: list = []
+        self.out_of_order = 0  # items that had to be inserted
+
+    def add(self, ts_ms: int, item):
+        if not self._times or ts_ms >= self._times[-1]:
+            self._times.append(ts_ms)
+            self._items.append(item)
+            return
+        i = bisect_right(self._times, ts_ms)
+        self._times.insert(i, ts_ms)
+        self._items.insert(i, item)
+        self.out_of_order += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[tuple[int, object]]:
+        return zip(self._times, self._items)
+
+
+def merge(*sources: Iterable[tuple[int, T]]) -> Iterator[tuple[int, T]]:
+    """Lazily merge sorted (ts_ms, item) streams; ties keep source order."""
+    return heapq.merge(*sources, key=itemgetter(0))
+
+
+class ParserTimeline:
+    """A Timeline of list positions for each of a parser's event lists.
+
+    The parser only ever appends to these lists, so ``sync`` adds just the
+    items that arrived since the previous call. Call ``attach`` again when
+    the parser is replaced or merged into, which reorders its lists.
+    """
+
+    def __init__(self, parser: SessionParser | None = None):
+        self.attach(parser if parser is not None else SessionParser())
+
+    def attach(self, parser: SessionParser):
+        self.parser = parser
+        self._timelines = {name: Timeline() for name in SOURCES}
+        self._synced = dict.fromkeys(SOURCES, 0)
+        self.sync()
+
+    def sync(self):
+        """Add the items appended to the parser's lists since the last sync."""
+        for name in SOURCES:
+            items = getattr(self.parser, name)
+            timeline = self._timelines[name]
+            for i in range(self._synced[name], len(items)):
+                timeline.add(items[i].ts_ms, i)
+            self._synced[name] = len(items)
+
+    def __getitem__(self, name: str) -> Timeline:
+        """Positions in ``parser.<name>``, in time order."""
+        return self._timelines[name]
@@ -0,0 +1,44 @@
+"""Session timestamps, parsed once into integer epoch milliseconds."""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+UNKNOWN_CLOCK = "??:??:??"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MS = timedelta(milliseconds=1)
+
+
+def parse_timestamp(timestamp: str) -> int | None:
+    """Epoch milliseconds of an ISO 8601 timestamp, or None if it is not one.
+
+    Timestamps without an offset are taken to be UTC, as Claude Code
+    writes them.
+    """
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _MS
+
+
+@lru_cache(maxsize=4096)
+def format_clock(ts_ms: int) -> str:
+    """UTC time of day of an epoch-millisecond time, e.g. '22:16:50'."""
+    seconds = ts_ms // 1000 % 86400
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def stamp(timestamp: str) -> tuple[int, str]:
+    """Epoch milliseconds and display form of ``timestamp``.
+
+    An empty timestamp gives (0, "") and one that cannot be parsed
+    (0, "??:??:??"), so both sort before any real time.
+    """
+    if not timestamp:
+        return 0, ""
+    ts_ms = parse_timestamp(timestamp)
+    if ts_ms is None:
+        return 0, UNKNOWN_CLOCK
+    return ts_ms, format_clock(ts_ms)
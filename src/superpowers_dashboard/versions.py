@@ -0,0 +1,93 @@
+"""Per-widget input versions, so the UI only re-renders what changed."""
+from typing import NamedTuple
+
+from superpowers_dashboard.events import (
+    Compaction, SessionEvent, SkillStarted, SubagentDispatched, SubagentResolved, TokensAccrued, ToolUsed,
+)
+from superpowers_dashboard.watcher import SessionParser
+
+
+class WidgetVersions(NamedTuple):
+    """Version of the state each part of the UI reads; equal means unchanged."""
+    skills: int = 0  # active and used skills
+    timeline: int = 0  # workflow entries
+    stats: int = 0  # totals, per-skill, tools, subagents, compactions, models
+    header: int = 0  # session id, total cost, loading progress
+
+
+# Inputs each parser event changes. HookFired changes none of them.
+_EVENT_INPUTS = {
+    SkillStarted: ("skills", "timeline", "stats", "header"),
+    TokensAccrued: ("timeline", "stats", "header"),
+    ToolUsed: ("timeline", "stats"),
+    SubagentDispatched: ("timeline", "stats"),
+    SubagentResolved: ("timeline",),
+    Compaction: ("timeline", "stats"),
+}
+
+
+class VersionTracker:
+    """Bumps per-widget version counters as a parser's events arrive.
+
+    State that changes without a parser event (subagent details, loading
+    progress) is reported with ``bump``.
+    """
+
+    def __init__(self, parser: SessionParser | None = None):
+        self._counters = dict.fromkeys(WidgetVersions._fields, 0)
+        self.parser = SessionParser()
+        self._unsubscribe = None
+        self.attach(parser if parser is not None else self.parser)
+
+    def attach(self, parser: SessionParser):
+        """Follow ``parser`` instead; everything counts as changed."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+        self.parser = parser
+        self._active_skill = parser.active_skill
+        self._session_count = parser.session_count
+        self.bump(*WidgetVersions._fields)
+        self._unsubscribe = parser.subscribe(self._on_event)
+
+    def bump(self, *inputs: str):
+        for name in inputs:
+            self._counters[name] += 1
+
+    def _on_event(self, event: SessionEvent):
+        self.bump(*_EVENT_INPUTS.get(type(event), ()))
+
+    def sync(self):
+        """Pick up changes no event reports; call before reading ``current``.
+
+        Switching between concurrent sessions changes the active skill and
+        session count without an event of its own.
+        """
+        parser = self.parser
+        if parser.active_skill != self._active_skill:
+            self._active_skill = parser.active_skill
+            self.bump("skills", "timeline")
+        if parser.session_count != self._session_count:
+            self._session_count = parser.session_count
+            self.bump("stats")
+
+    @property
+    def current(self) -> WidgetVersions:
+        return WidgetVersions(**self._counters)
+
+
+class RenderStats:
+    """Counts renders performed and skipped per widget."""
+
+    def __init__(self):
+        self.performed: dict[str, int] = dict.fromkeys(WidgetVersions._fields, 0)
+        self.skipped: dict[str, int] = dict.fromkeys(WidgetVersions._fields, 0)
+
+    def record(self, widget: str, rendered: bool):
+        counts = self.performed if rendered else self.skipped
+        counts[widget] += 1
+
+    def __str__(self) -> str:
+        return ", ".join(
+            f"{name} {self.performed[name]} rendered/{self.skipped[name]} skipped"
+            for name in WidgetVersions._fields
+        )
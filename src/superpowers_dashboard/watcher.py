@@ -1,12 +1,76 @@
 """JSONL session watcher and parser for skill invocation detection."""
-import json
 import re
-from dataclasses import dataclass, field
-from datetime import datetime
+import sys
+from array import array
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
+
+from superpowers_dashboard.decoding import DECODE_ERRORS, loads
+from superpowers_dashboard.events import (
+    Compaction, HookFired, SessionEvent, SkillStarted, SubagentDispatched, SubagentResolved,
+    Subscriber, TokensAccrued, ToolUsed,
+)
+from superpowers_dashboard.ledger import NO_SEGMENT, OVERHEAD, TOKEN_COLUMNS, UsageLedger
+from superpowers_dashboard.streaming import StreamingDecodeError, extract_entry
+from superpowers_dashboard.symbols import MODELS
+from superpowers_dashboard.tail import LargeLine, TailReader
+from superpowers_dashboard.timestamps import parse_timestamp, stamp
+
+# Byte-level sniffing of raw JSONL lines. Before the first nested object
+# (and after the last one) every key is top-level, so a "type" found there
+# is certainly the entry type. The same text inside a JSON string has
+# escaped quotes and cannot match.
+_TYPE_RE = re.compile(rb'"type"\s*:\s*"([A-Za-z_-]+)"')
+_SUBTYPE_RE = re.compile(rb'"subtype"\s*:\s*"(compact_boundary|microcompact_boundary|local_command|turn_duration)"')
+_DATA_TYPE_RE = re.compile(rb'"data"\s*:\s*(\{)\s*"type"\s*:\s*"([A-Za-z_-]+)"')
+_IS_META_RE = re.compile(rb'"isMeta"\s*:\s*true')
+_AGENT_ID_RE = re.compile(r"agentId:\s*([a-f0-9]+)")
+
+# How much of an oversized line is read to find its entry type. Claude Code
+# writes the top-level "type" ahead of the message body.
+LARGE_LINE_SNIFF_BYTES = 64 * 1024
+
+
+def sniff_type(line: bytes) -> bytes | None:
+    """Return the top-level entry type of a raw JSONL line, or None if unsure.
+
+    Only the bytes before the first nested object and after the last one are
+    searched, so huge message bodies in between are never scanned.
+    """
+    first = line.find(b"{", 1)
+    m = _TYPE_RE.search(line, 0, first if first > 0 else len(line))
+    if m:
+        return m.group(1)
+    if first > 0:
+        last = line.rfind(b"}", 0, line.rfind(b"}"))
+        m = _TYPE_RE.search(line, max(last, first))
+        if m:
+            return m.group(1)
+    return None
+
+
+def _sniff_prefix(head: bytes) -> bytes | None:
+    """Entry type from the head of a line alone, or None if unsure."""
+    first = head.find(b"{", 1)
+    m = _TYPE_RE.search(head, 0, first if first > 0 else len(head))
+    return m.group(1) if m else None
 
 
-@dataclass
+def _decode_line(line: str | bytes | LargeLine) -> dict | None:
+    """Decode a JSONL line; oversized lines go through the streaming extractor."""
+    try:
+        if isinstance(line, LargeLine):
+            entry = extract_entry(line.iter_chunks())
+        else:
+            entry = loads(line)
+    except (*DECODE_ERRORS, StreamingDecodeError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+@dataclass(slots=True)
 class SkillEvent:
     """A single skill invocation with accumulated metrics."""
     skill_name: str
@@ -16,24 +80,58 @@ class SkillEvent:
     output_tokens: int = 0
     cache_read_tokens: int = 0
     cache_write_tokens: int = 0
-    models: set = field(default_factory=set)
+    model_mask: int = 0  # bits of symbols.MODELS
     duration_ms: int = 0
+    ts_ms: int = field(default=0, init=False)  # epoch ms, parsed from timestamp once
+    clock: str = field(default="", init=False)  # HH:MM:SS
+
+    def __post_init__(self):
+        self.ts_ms, self.clock = stamp(self.timestamp)
 
     @property
-    def start_time(self) -> datetime:
-        return datetime.fromisoformat(self.timestamp.replace("Z", "+00:00"))
+    def models(self) -> tuple[str, ...]:
+        """Models that served this skill, in the order the process first saw them."""
+        return MODELS.names_in(self.model_mask)
 
+    def add_model(self, model: str):
+        self.model_mask |= MODELS.bit(model)
 
-@dataclass
+    @property
+    def start_time(self) -> datetime:
+        return datetime.fromtimestamp(self.ts_ms / 1000, tz=timezone.utc)
+
+    def __getstate__(self) -> tuple:
+        # Model bits are only valid in this process; pickles carry the names
+        return (
+            self.skill_name, self.args, self.timestamp, self.input_tokens, self.output_tokens,
+            self.cache_read_tokens, self.cache_write_tokens, self.models, self.duration_ms,
+            self.ts_ms, self.clock,
+        )
+
+    def __setstate__(self, state: tuple):
+        (
+            self.skill_name, self.args, self.timestamp, self.input_tokens, self.output_tokens,
+            self.cache_read_tokens, self.cache_write_tokens, models, self.duration_ms,
+            self.ts_ms, self.clock,
+        ) = state
+        self.model_mask = MODELS.mask(models)
+
+
+@dataclass(slots=True)
 class CompactionEvent:
     """A context compaction or microcompaction event."""
     timestamp: str
     pre_tokens: int
     trigger: str
     kind: str = "compaction"  # "compaction" or "microcompaction"
+    ts_ms: int = field(default=0, init=False)  # epoch ms, parsed from timestamp once
+    clock: str = field(default="", init=False)  # HH:MM:SS
 
+    def __post_init__(self):
+        self.ts_ms, self.clock = stamp(self.timestamp)
 
-@dataclass
+
+@dataclass(slots=True)
 class SubagentEvent:
     """A subagent dispatch event."""
     timestamp: str
@@ -43,9 +141,16 @@ class SubagentEvent:
     tool_use_id: str = ""
     detail: "SubagentDetail | None" = None
     role: str = ""
+    status: str = "running"  # "complete" once the Task's tool_result arrives
+    session_id: str = ""  # session the Task was dispatched from
+    ts_ms: int = field(default=0, init=False)  # epoch ms, parsed from timestamp once
+    clock: str = field(default="", init=False)  # HH:MM:SS
 
+    def __post_init__(self):
+        self.ts_ms, self.clock = stamp(self.timestamp)
 
-@dataclass
+
+@dataclass(slots=True)
 class SubagentDetail:
     """Parsed metrics from a subagent's JSONL transcript."""
     agent_id: str
@@ -57,9 +162,10 @@ class SubagentDetail:
     cache_write_tokens: int = 0
     duration_ms: int = 0
     cost: float = 0.0
+    finished: bool = False  # last assistant turn ended the conversation
 
 
-@dataclass
+@dataclass(slots=True)
 class OverheadSegment:
     """A segment of work done without any skill active."""
     timestamp: str
@@ -69,12 +175,43 @@ class OverheadSegment:
     cache_write_tokens: int = 0
     duration_ms: int = 0
     tool_count: int = 0
+    ts_ms: int = field(default=0, init=False)  # epoch ms, parsed from timestamp once
+    clock: str = field(default="", init=False)  # HH:MM:SS
+
+    def __post_init__(self):
+        self.ts_ms, self.clock = stamp(self.timestamp)
+
+
+@dataclass
+class _SessionState:
+    """Skill state of a session whose lines are not currently being fed."""
+    active_skill: str | None = None
+    pending_skill: dict | None = None
+    current_overhead: OverheadSegment | None = None
+    current_event: SkillEvent | None = None
+    current_index: int | None = None  # of current_event in skill_events
+    current_segment: int = NO_SEGMENT  # ledger number of current_overhead
 
 
 class SessionParser:
-    """Parses JSONL lines and tracks skill state."""
+    """Parses JSONL lines and tracks skill state.
 
-    def __init__(self):
+    Lines are attributed to the session selected with ``select_session``.
+    Totals are shared, but each session has its own active skill, pending
+    invocation and open overhead segment, so interleaving lines from
+    concurrent sessions does not bleed one session's turns into another's
+    skill.
+
+    Besides its lists and dicts, the parser reports each change as a typed
+    event (see ``superpowers_dashboard.events``) to callbacks registered
+    with ``subscribe``.
+    """
+
+    def __init__(self, session_id: str = ""):
+        self.session_id = session_id
+        self._sessions: dict[str, _SessionState] = {}  # parked state of other sessions
+        self._current_event: SkillEvent | None = None  # event of the active skill
+        self._current_index: int | None = None  # its position in skill_events
         self.skill_events: list[SkillEvent] = []
         self.active_skill: str | None = None
         self.used_skills: set[str] = set()
@@ -87,15 +224,190 @@ class SessionParser:
         self.last_context_tokens: int = 0
         self.overhead_segments: list[OverheadSegment] = []
         self._current_overhead: OverheadSegment | None = None
+        self._current_segment = NO_SEGMENT
+        # Ledger segment number of each of overhead_segments; numbers go by
+        # the order segments were opened in, which is not their closing order
+        self.segment_numbers = array("i")
+        self._segments_opened = 0
         self.session_count: int = 1
         self.agent_id_map: dict[str, str] = {}  # tool_use_id -> agent_id
+        self._open_tasks: set[str] = set()  # Task tool_use_ids awaiting their tool_result
         self.hook_events: list[dict] = []
-        self.model_usage: dict[str, dict[str, int]] = {}
+        self.usage = UsageLedger()  # every assistant turn, for breakdowns not kept above
+        self._subscribers: list[Subscriber] = []
+
+    def __getstate__(self) -> dict:
+        # Subscribers belong to this process; checkpoints and pool results go without them
+        state = self.__dict__.copy()
+        state["_subscribers"] = []
+        return state
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Call ``callback`` with every event from now on; returns an unsubscribe function.
+
+        ``merge`` emits nothing: subscribers that keep derived state should
+        rebuild it from the merged parser.
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def _emit(self, event: SessionEvent):
+        for callback in self._subscribers:
+            callback(event)
+
+    def select_session(self, session_id: str):
+        """Attribute the following lines to ``session_id``.
+
+        The current session's skill state is parked and the selected one's
+        restored; a session not seen before starts with no skill active and
+        counts towards ``session_count``.
+        """
+        if session_id == self.session_id:
+            return
+        if not self.session_id:
+            # Nothing was attributed to a named session yet: adopt the name
+            self.session_id = session_id
+            return
+        self._sessions[self.session_id] = self._park()
+        state = self._sessions.pop(session_id, None)
+        if state is None:
+            state = _SessionState()
+            self.session_count += 1
+        self._restore(session_id, state)
+
+    def _park(self) -> _SessionState:
+        return _SessionState(
+            self.active_skill, self._pending_skill, self._current_overhead,
+            self._current_event, self._current_index, self._current_segment,
+        )
+
+    def _restore(self, session_id: str, state: _SessionState):
+        self.session_id = session_id
+        self.active_skill = state.active_skill
+        self._pending_skill = state.pending_skill
+        self._current_overhead = state.current_overhead
+        self._current_segment = state.current_segment
+        self._current_event = state.current_event
+        self._current_index = state.current_index
+
+    def merge(self, other: "SessionParser"):
+        """Absorb the parse state of a later session file into this one.
+
+        Session boundary rules: a new session starts with no skill active, so
+        this parser's active skill becomes used and its open overhead segment
+        is closed. The rest of this session's state is parked, so its file can
+        still be fed after ``select_session``, and its Task dispatches stay
+        open since sessions may run concurrently. The later session's active
+        skill, pending skill and open overhead segment carry on as the current
+        session, so lines appended to that file can keep being fed to the
+        merged parser.
+        """
+        self._close_overhead()
+        if self.active_skill:
+            self.used_skills.add(self.active_skill)
+        if self.session_id and self.session_id != other.session_id:
+            self._sessions[self.session_id] = self._park()
+        # The later session's skill events and overhead segments go after
+        # ours, and so do their indices and numbers
+        offset, segment_offset = len(self.skill_events), self._segments_opened
+        for session_id, state in other._sessions.items():
+            self._sessions[session_id] = _shifted(state, offset, segment_offset)
+
+        self.usage.extend(other.usage, skill_event_offset=offset, segment_offset=segment_offset)
+        self.skill_events.extend(other.skill_events)
+        self.used_skills |= other.used_skills
+        self._restore(other.session_id, _shifted(other._park(), offset, segment_offset))
+
+        for key, value in other.overhead_tokens.items():
+            self.overhead_tokens[key] = self.overhead_tokens.get(key, 0) + value
+        self.overhead_duration_ms += other.overhead_duration_ms
+        for name, count in other.tool_counts.items():
+            self.tool_counts[name] = self.tool_counts.get(name, 0) + count
+        self.compactions.extend(other.compactions)
+        self.subagents.extend(other.subagents)
+        if other.last_context_tokens:
+            self.last_context_tokens = other.last_context_tokens
+        self.overhead_segments.extend(other.overhead_segments)
+        self.segment_numbers.extend(array("i", [n + segment_offset for n in other.segment_numbers]))
+        self._segments_opened += other._segments_opened
+        self.session_count += other.session_count
+        self.agent_id_map.update(other.agent_id_map)
+        self._open_tasks |= other._open_tasks
+        self.hook_events.extend(other.hook_events)
 
-    def process_line(self, line: str):
-        try:
-            entry = json.loads(line)
-        except json.JSONDecodeError:
+    @property
+    def model_usage(self) -> dict[str, dict[str, int]]:
+        """Token totals per model id over every turn, Skill calls included."""
+        return {
+            model: dict(zip(TOKEN_COLUMNS, totals))
+            for model, totals in self.usage.by_model().items() if model
+        }
+
+    def _open_overhead(self, timestamp: str) -> OverheadSegment:
+        """The current overhead segment, opening one at ``timestamp`` if there is none."""
+        if self._current_overhead is None:
+            self._current_overhead = OverheadSegment(timestamp=timestamp)
+            self._current_segment = self._segments_opened
+            self._segments_opened += 1
+        return self._current_overhead
+
+    def _close_overhead(self):
+        if self._current_overhead is not None:
+            self.overhead_segments.append(self._current_overhead)
+            self.segment_numbers.append(self._current_segment)
+            self._current_overhead = None
+            self._current_segment = NO_SEGMENT
+
+    def wants_line(self, line: bytes | LargeLine) -> bool:
+        """Cheap byte-level check whether any handler could use this line.
+
+        Skips entry types nothing handles, system entries with an unhandled
+        subtype, progress entries other than hook_progress, and user entries
+        that carry neither a pending skill's isMeta marker nor the result of
+        an open Task dispatch.
+        Anything that cannot be classified with certainty is decoded.
+
+        Oversized lines are only classified from their head; checks that
+        would need to scan the whole line assume a match.
+        """
+        if isinstance(line, LargeLine):
+            head = line.head(LARGE_LINE_SNIFF_BYTES)
+            kind, text = _sniff_prefix(head), None
+        else:
+            head = text = line
+            kind = sniff_type(line)
+        if kind is None or kind == b"assistant":
+            return True
+        if kind == b"system":
+            return text is None or _SUBTYPE_RE.search(text) is not None
+        if kind == b"progress":
+            first = head.find(b"{", 1)
+            m = _DATA_TYPE_RE.search(head, 0, first + 256) if first > 0 else None
+            if m is None or m.start(1) != first:
+                return True
+            if m.group(2) == b"agent_progress":
+                return self._awaits_agent_id(text)
+            return m.group(2) == b"hook_progress"
+        if kind == b"user":
+            if text is None:
+                return bool(self._pending_skill or self._open_tasks)
+            if self._pending_skill and _IS_META_RE.search(text):
+                return True
+            return any(tool_use_id.encode() in text for tool_use_id in self._open_tasks)
+        return False
+
+    def _awaits_agent_id(self, line: bytes | None) -> bool:
+        """Whether ``line`` may name an open Task whose agent is still unknown."""
+        unmapped = [t for t in self._open_tasks if t not in self.agent_id_map]
+        if line is None:
+            return bool(unmapped)
+        return any(tool_use_id.encode() in line for tool_use_id in unmapped)
+
+    def process_line(self, line: str | bytes | LargeLine):
+        if not isinstance(line, str) and not self.wants_line(line):
+            return
+        entry = _decode_line(line)
+        if entry is None:
             return
 
         entry_type = entry.get("type")
@@ -128,12 +440,14 @@ class SessionParser:
             # Track all tool usage
             if tool_name:
                 self.tool_counts[tool_name] = self.tool_counts.get(tool_name, 0) + 1
+                if self._subscribers:
+                    self._emit(ToolUsed(self.session_id, entry.get("timestamp", ""), tool_name))
 
             # Skill invocations
             if tool_name == "Skill":
                 skill_input = item.get("input", {})
                 skill_full = skill_input.get("skill", "")
-                skill_name = skill_full.split(":")[-1] if ":" in skill_full else skill_full
+                skill_name = sys.intern(skill_full.split(":")[-1] if ":" in skill_full else skill_full)
                 self._pending_skill = {
                     "skill_name": skill_name,
                     "args": skill_input.get("args", ""),
@@ -150,50 +464,60 @@ class SessionParser:
             # Subagent dispatches
             if tool_name == "Task":
                 task_input = item.get("input", {})
-                self.subagents.append(SubagentEvent(
+                subagent = SubagentEvent(
                     timestamp=entry.get("timestamp", ""),
                     description=task_input.get("description", ""),
-                    subagent_type=task_input.get("subagent_type", ""),
-                    model=task_input.get("model", "inherit"),
+                    subagent_type=sys.intern(task_input.get("subagent_type", "")),
+                    model=sys.intern(task_input.get("model", "inherit")),
                     tool_use_id=item.get("id", ""),
-                ))
+                    session_id=self.session_id,
+                )
+                self.subagents.append(subagent)
+                if item.get("id"):
+                    self._open_tasks.add(item["id"])
+                if self._subscribers:
+                    self._emit(SubagentDispatched(
+                        self.session_id, subagent.timestamp, subagent.tool_use_id,
+                        subagent.description, subagent.subagent_type, subagent.model,
+                    ))
 
         # Count overhead tools when no skill is active
-        if not (self.skill_events and self.active_skill):
+        if not (self._current_event is not None and self.active_skill):
             tool_count = sum(1 for item in content if item.get("type") == "tool_use")
             if tool_count > 0:
                 timestamp = entry.get("timestamp", "")
-                if self._current_overhead is None:
-                    self._current_overhead = OverheadSegment(timestamp=timestamp)
-                self._current_overhead.tool_count += tool_count
+                self._open_overhead(timestamp).tool_count += tool_count
 
         self._accumulate_tokens(usage, model, entry.get("timestamp", ""))
 
     def _process_user(self, entry: dict):
-        # Extract agent IDs from tool_result entries
-        message = entry.get("message", {})
-        content = message.get("content", [])
-        if isinstance(content, list):
-            for item in content:
-                if isinstance(item, dict) and item.get("type") == "tool_result":
+        # Extract agent IDs from the tool_results of open Task dispatches
+        if self._open_tasks:
+            message = entry.get("message", {})
+            content = message.get("content", [])
+            if isinstance(content, list):
+                for item in content:
+                    if not isinstance(item, dict) or item.get("type") != "tool_result":
+                        continue
                     tool_use_id = item.get("tool_use_id", "")
-                    result_content = item.get("content", "")
-                    result_text = ""
-                    if isinstance(result_content, str):
-                        result_text = result_content
-                    elif isinstance(result_content, list):
-                        result_text = " ".join(
-                            c.get("text", "") for c in result_content if isinstance(c, dict)
-                        )
-                    agent_id = extract_agent_id(result_text)
-                    if agent_id and tool_use_id:
+                    if tool_use_id not in self._open_tasks:
+                        continue
+                    self._open_tasks.discard(tool_use_id)
+                    agent_id = _find_agent_id(item.get("content", ""))
+                    if agent_id:
                         self.agent_id_map[tool_use_id] = agent_id
+                    for subagent in reversed(self.subagents):
+                        if subagent.tool_use_id == tool_use_id:
+                            subagent.status = "complete"
+                            break
+                    if self._subscribers:
+                        self._emit(SubagentResolved(
+                            self.session_id, tool_use_id, self.agent_id_map.get(tool_use_id), "complete",
+                        ))
 
         if entry.get("isMeta") and self._pending_skill:
             # Finalize any current overhead segment before starting the skill
-            if self._current_overhead is not None:
-                self.overhead_segments.append(self._current_overhead)
-                self._current_overhead = None
+            self._close_overhead()
 
             if self.active_skill:
                 self.used_skills.add(self.active_skill)
@@ -209,33 +533,52 @@ class SessionParser:
             )
             model = skill.get("model", "")
             if model:
-                event.models.add(model)
+                event.add_model(model)
             self.skill_events.append(event)
+            self.usage.append(
+                event.ts_ms, model, self.session_id, len(self.skill_events) - 1, NO_SEGMENT,
+                event.input_tokens, event.output_tokens, event.cache_read_tokens, event.cache_write_tokens,
+            )
+            self._current_event = event
+            self._current_index = len(self.skill_events) - 1
             self.active_skill = skill["skill_name"]
             self._pending_skill = None
+            if self._subscribers:
+                self._emit(SkillStarted(
+                    self.session_id, event.timestamp, event.skill_name, event.args,
+                    len(self.skill_events) - 1, model,
+                    event.input_tokens, event.output_tokens, event.cache_read_tokens, event.cache_write_tokens,
+                ))
+
+    def _add_compaction(self, compaction: CompactionEvent):
+        self.compactions.append(compaction)
+        if self._subscribers:
+            self._emit(Compaction(
+                self.session_id, compaction.timestamp, compaction.kind, compaction.pre_tokens, compaction.trigger,
+            ))
 
     def _process_system(self, entry: dict):
         subtype = entry.get("subtype", "")
         if subtype == "compact_boundary":
             meta = entry.get("compactMetadata", {})
-            self.compactions.append(CompactionEvent(
+            self._add_compaction(CompactionEvent(
                 timestamp=entry.get("timestamp", ""),
                 pre_tokens=meta.get("preTokens", 0),
-                trigger=meta.get("trigger", "unknown"),
+                trigger=sys.intern(meta.get("trigger", "unknown")),
                 kind="compaction",
             ))
         elif subtype == "microcompact_boundary":
             meta = entry.get("microcompactMetadata", {})
-            self.compactions.append(CompactionEvent(
+            self._add_compaction(CompactionEvent(
                 timestamp=entry.get("timestamp", ""),
                 pre_tokens=meta.get("preTokens", 0),
-                trigger=meta.get("trigger", "unknown"),
+                trigger=sys.intern(meta.get("trigger", "unknown")),
                 kind="microcompaction",
             ))
         elif subtype == "local_command":
             content = entry.get("content", "")
             if "<command-name>/clear</command-name>" in content:
-                self.compactions.append(CompactionEvent(
+                self._add_compaction(CompactionEvent(
                     timestamp=entry.get("timestamp", ""),
                     pre_tokens=0,
                     trigger="manual",
@@ -243,22 +586,33 @@ class SessionParser:
                 ))
         elif subtype == "turn_duration":
             duration = entry.get("durationMs", 0)
-            if self.skill_events and self.active_skill:
-                self.skill_events[-1].duration_ms += duration
+            if self._current_event is not None and self.active_skill:
+                self._current_event.duration_ms += duration
             else:
                 self.overhead_duration_ms += duration
-                if self._current_overhead is None:
-                    self._current_overhead = OverheadSegment(timestamp=entry.get("timestamp", ""))
-                self._current_overhead.duration_ms += duration
+                self._open_overhead(entry.get("timestamp", "")).duration_ms += duration
 
     def _process_progress(self, entry: dict):
         data = entry.get("data", {})
         if data.get("type") == "hook_progress":
-            self.hook_events.append({
-                "event": data.get("hookEventName", ""),
-                "hook_type": data.get("hookType", ""),
+            hook = {
+                "event": sys.intern(data.get("hookEventName", "")),
+                "hook_type": sys.intern(data.get("hookType", "")),
                 "timestamp": entry.get("timestamp", ""),
-            })
+            }
+            hook["ts_ms"], hook["clock"] = stamp(hook["timestamp"])
+            self.hook_events.append(hook)
+            if self._subscribers:
+                self._emit(HookFired(self.session_id, hook["timestamp"], hook["event"], hook["hook_type"]))
+        elif data.get("type") == "agent_progress":
+            # Streamed while a Task runs, so its transcript can be found
+            # before the agentId trailer arrives with the result
+            tool_use_id = entry.get("parentToolUseID", "")
+            agent_id = data.get("agentId", "")
+            if tool_use_id in self._open_tasks and agent_id and tool_use_id not in self.agent_id_map:
+                self.agent_id_map[tool_use_id] = agent_id
+                if self._subscribers:
+                    self._emit(SubagentResolved(self.session_id, tool_use_id, agent_id, "running"))
 
     def _accumulate_tokens(self, usage: dict, model: str, timestamp: str = ""):
         input_tok = usage.get("input_tokens", 0)
@@ -266,14 +620,16 @@ class SessionParser:
         cache_read = usage.get("cache_read_input_tokens", 0)
         cache_write = usage.get("cache_creation_input_tokens", 0)
 
-        if self.skill_events and self.active_skill:
-            event = self.skill_events[-1]
+        skill_index = None
+        if self._current_event is not None and self.active_skill:
+            event = self._current_event
+            skill_index = self._current_index
             event.input_tokens += input_tok
             event.output_tokens += output_tok
             event.cache_read_tokens += cache_read
             event.cache_write_tokens += cache_write
             if model:
-                event.models.add(model)
+                event.add_model(model)
         else:
             self.overhead_tokens["input"] += input_tok
             self.overhead_tokens["output"] += output_tok
@@ -281,21 +637,31 @@ class SessionParser:
             self.overhead_tokens["cache_write"] += cache_write
 
             # Also track on the current overhead segment
-            if self._current_overhead is None:
-                self._current_overhead = OverheadSegment(timestamp=timestamp)
-            self._current_overhead.input_tokens += input_tok
-            self._current_overhead.output_tokens += output_tok
-            self._current_overhead.cache_read_tokens += cache_read
-            self._current_overhead.cache_write_tokens += cache_write
-
-        # Track per-model usage
-        if model:
-            if model not in self.model_usage:
-                self.model_usage[model] = {"input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0}
-            self.model_usage[model]["input_tokens"] += input_tok
-            self.model_usage[model]["output_tokens"] += output_tok
-            self.model_usage[model]["cache_read_tokens"] += cache_read
-            self.model_usage[model]["cache_write_tokens"] += cache_write
+            segment = self._open_overhead(timestamp)
+            segment.input_tokens += input_tok
+            segment.output_tokens += output_tok
+            segment.cache_read_tokens += cache_read
+            segment.cache_write_tokens += cache_write
+
+        self.usage.append(
+            (parse_timestamp(timestamp) or 0) if timestamp else 0, model, self.session_id,
+            OVERHEAD if skill_index is None else skill_index, self._current_segment,
+            input_tok, output_tok, cache_read, cache_write,
+        )
+
+        if self._subscribers:
+            self._emit(TokensAccrued(
+                self.session_id, timestamp, model, input_tok, output_tok, cache_read, cache_write, skill_index,
+            ))
+
+
+def _shifted(state: _SessionState, offset: int, segment_offset: int) -> _SessionState:
+    """``state`` with its skill event index and overhead segment number moved along."""
+    return replace(
+        state,
+        current_index=None if state.current_index is None else state.current_index + offset,
+        current_segment=NO_SEGMENT if state.current_segment == NO_SEGMENT else state.current_segment + segment_offset,
+    )
 
 
 def extract_agent_id(text: str) -> str | None:
@@ -303,30 +669,75 @@ def extract_agent_id(text: str) -> str | None:
 
     The format is: agentId: a82030d (for resuming ...)
     """
-    m = re.search(r"agentId:\s*([a-f0-9]+)", text)
+    m = _AGENT_ID_RE.search(text)
     return m.group(1) if m else None
 
 
-def parse_subagent_transcript(path: Path) -> SubagentDetail:
-    """Parse a subagent JSONL file and extract metrics.
+def _find_agent_id(result_content) -> str | None:
+    """Find the agentId trailer in a Task tool_result's content.
+
+    The trailer is appended after the subagent's output, so text blocks are
+    searched last-first with ``rfind`` and only the trailer itself is
+    matched, without joining or regex-scanning the whole result.
+    """
+    if isinstance(result_content, str):
+        blocks = [result_content]
+    elif isinstance(result_content, list):
+        blocks = [c.get("text", "") for c in reversed(result_content) if isinstance(c, dict)]
+    else:
+        return None
+    for text in blocks:
+        if not isinstance(text, str):
+            continue
+        pos = text.rfind("agentId:")
+        if pos >= 0:
+            m = _AGENT_ID_RE.match(text, pos)
+            if m:
+                return m.group(1)
+    return None
+
 
-    For each line:
+class SubagentTranscript:
+    """Incrementally parses a subagent's JSONL transcript as it is written.
+
+    The file stays open between updates and only newly appended lines are
+    folded into ``detail``:
     - assistant messages: accumulate tokens from usage, count tools, extract skill names
     - system messages with subtype turn_duration: accumulate duration_ms
     """
-    stem = path.stem  # e.g. "agent-abc123"
-    agent_id = stem.removeprefix("agent-")
-
-    detail = SubagentDetail(agent_id=agent_id)
 
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+    def __init__(self, path: Path):
+        self.path = path
+        # File name is e.g. "agent-abc123.jsonl"
+        self.detail = SubagentDetail(agent_id=path.stem.removeprefix("agent-"))
+        self._reader = TailReader(path)
+
+    def close(self):
+        self._reader.close()
+
+    def update(self) -> bool:
+        """Read lines appended since the last update; return whether there were any.
+
+        If the file was truncated or replaced, ``detail`` is replaced by a
+        fresh one built from the new contents.
+        """
+        detail = self.detail
+        changed = False
+        for line in self._reader.iter_lines():
+            if not changed and self._reader.rotated:
+                detail = self.detail = SubagentDetail(agent_id=detail.agent_id)
+            changed = True
+            if isinstance(line, LargeLine):
+                kind = _sniff_prefix(line.head(LARGE_LINE_SNIFF_BYTES))
+            else:
+                kind = sniff_type(line)
+            if kind == b"system":
+                if isinstance(line, bytes) and b"turn_duration" not in line:
+                    continue
+            elif kind not in (None, b"assistant"):
                 continue
-            try:
-                entry = json.loads(line)
-            except json.JSONDecodeError:
+            entry = _decode_line(line)
+            if entry is None:
                 continue
 
             entry_type = entry.get("type")
@@ -340,6 +751,8 @@ def parse_subagent_transcript(path: Path) -> SubagentDetail:
                 detail.output_tokens += usage.get("output_tokens", 0)
                 detail.cache_read_tokens += usage.get("cache_read_input_tokens", 0)
                 detail.cache_write_tokens += usage.get("cache_creation_input_tokens", 0)
+                if message.get("stop_reason"):
+                    detail.finished = message["stop_reason"] == "end_turn"
 
                 for item in content:
                     if item.get("type") != "tool_use":
@@ -350,7 +763,7 @@ def parse_subagent_transcript(path: Path) -> SubagentDetail:
                     if tool_name == "Skill":
                         skill_input = item.get("input", {})
                         skill_full = skill_input.get("skill", "")
-                        skill_name = skill_full.split(":")[-1] if ":" in skill_full else skill_full
+                        skill_name = sys.intern(skill_full.split(":")[-1] if ":" in skill_full else skill_full)
                         detail.skills_invoked.append(skill_name)
 
             elif entry_type == "system":
@@ -358,7 +771,17 @@ def parse_subagent_transcript(path: Path) -> SubagentDetail:
                 if subtype == "turn_duration":
                     detail.duration_ms += entry.get("durationMs", 0)
 
-    return detail
+        return changed
+
+
+def parse_subagent_transcript(path: Path) -> SubagentDetail:
+    """Parse a whole subagent JSONL file and extract metrics."""
+    transcript = SubagentTranscript(path)
+    try:
+        transcript.update()
+    finally:
+        transcript.close()
+    return transcript.detail
 
 
 def find_subagent_file(project_dir: Path, session_id: str, agent_id: str) -> Path | None:
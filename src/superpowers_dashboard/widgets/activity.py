@@ -1,14 +1,11 @@
 """Activity log widget showing chronological skill invocation feed."""
-from datetime import datetime
 from textual.widgets import RichLog
 
+from superpowers_dashboard.timestamps import UNKNOWN_CLOCK, stamp
+
 
 def _parse_time(timestamp: str) -> str:
-    try:
-        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-        return dt.strftime("%H:%M:%S")
-    except (ValueError, AttributeError):
-        return "??:??:??"
+    return stamp(timestamp)[1] or UNKNOWN_CLOCK
 
 
 def format_log_entry(timestamp: str, skill_name: str, args: str) -> str:
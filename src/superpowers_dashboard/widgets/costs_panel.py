@@ -114,7 +114,7 @@ class StatsWidget(Static):
             lines.append(f"    {m['model']:<14} {tok_str:>6} tok ${m['cost']:>7.2f}")
         return "\n".join(lines)
 
-    def update_stats(self, summary: str, per_skill: list[dict], tool_counts: dict[str, int] | None = None, subagent_count: int = 0, compactions: list | None = None, context_tokens: int = 0, session_count: int = 1, skill_count: int = 0, subagent_details: list | None = None, model_stats: list[dict] | None = None):
+    def update_stats(self, summary: str, per_skill: list[dict], tool_counts: dict[str, int] | None = None, subagent_count: int = 0, compactions: list | None = None, context_tokens: int = 0, session_count: int = 1, skill_count: int = 0, subagent_details: list | None = None, model_stats: list[dict] | None = None, subagent_totals=None):
         parts = [summary, "  " + "\u2500" * 38]
 
         # Context window usage right after summary
@@ -147,7 +147,12 @@ class StatsWidget(Static):
                 parts.append(f"    {name:<20} {count:>4}")
 
         # Subagent stats section
-        if subagent_details:
+        if subagent_totals is not None and subagent_totals.count:
+            # Aggregated upstream (see aggregates.SubagentTotals)
+            parts.append("")
+            parts.append("  " + "\u2500" * 38)
+            parts.append(self.format_subagent_stats(*subagent_totals))
+        elif subagent_details:
             parts.append("")
             parts.append("  " + "\u2500" * 38)
             agg_count = len(subagent_details)
@@ -1,14 +1,25 @@
 """Workflow timeline widget showing skill invocation history."""
-from datetime import datetime
-from textual.widgets import Static
+from functools import lru_cache
+
+from rich.cells import cell_len
+from rich.segment import Segment
+from textual.cache import LRUCache
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from superpowers_dashboard.timestamps import UNKNOWN_CLOCK, stamp
 
 
 def _parse_time(timestamp: str) -> str:
-    try:
-        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-        return dt.strftime("%H:%M:%S")
-    except (ValueError, AttributeError):
-        return "??:??:??"
+    return stamp(timestamp)[1] or UNKNOWN_CLOCK
+
+
+def _clock(timestamp: str, clock: str | None) -> str:
+    """Display time of an entry: the form parsed at ingest when there is one."""
+    if clock is not None:
+        return clock
+    return _parse_time(timestamp) if timestamp else ""
 
 
 def format_tokens(count: int) -> str:
@@ -28,16 +39,63 @@ def format_duration_minutes(seconds: float) -> str:
         return f"{hours}h {mins}m"
     return f"{minutes}m"
 
+@lru_cache(maxsize=1024)
 def _cost_bar(cost: float, max_cost: float, width: int = 14) -> str:
     if max_cost <= 0:
         return "\u2591" * width
     filled = int((cost / max_cost) * width)
     return "\u2588" * filled + "\u2591" * (width - filled)
 
-class WorkflowWidget(Static):
-    """Displays vertical timeline of skill invocations."""
+def _entry_key(e: dict, kind: str, skill_index: int, max_cost: float) -> tuple:
+    """Everything ``entry``'s rows depend on, task groups aside."""
+    timestamp = e.get("timestamp", "")
+    if kind == "overhead":
+        return (kind, timestamp, e.get("input_tokens", 0), e.get("output_tokens", 0), e.get("cost", 0),
+                e.get("duration_seconds", 0), e.get("tool_summary", ""))
+    if kind == "subagent":
+        return (kind, e.get("description", ""), e.get("total_tokens", 0), e.get("cost", 0),
+                tuple(e.get("skills_invoked", ())))
+    if kind == "compaction":
+        return (kind, timestamp, e.get("compaction_kind", "compaction"), e.get("pre_tokens", 0))
+    return (kind, timestamp, skill_index, e["skill_name"], e.get("args", ""), e.get("total_tokens", 0),
+            e.get("cost", 0), e.get("duration_seconds", 0), max_cost, e.get("is_active", False))
+
+
+def _group_key(group, is_last: bool) -> tuple:
+    return ("group", group.task_number, group.label, is_last, tuple(
+        (sa["role"], sa.get("total_tokens", 0), sa.get("cost", 0), sa.get("status", "complete"))
+        for sa in group.subagents
+    ))
+
+
+class WorkflowWidget(ScrollView):
+    """Displays vertical timeline of skill invocations.
+
+    The timeline is kept as a list of rows, one per screen line, and drawn
+    with the line API: only the rows in view are rendered, so scrolling and
+    refreshing cost the same however long the history gets.
+    """
+
+    DEFAULT_CSS = """
+    WorkflowWidget {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rows: list[str] = []
+        self._strips: LRUCache[str, Strip] = LRUCache(1024)  # by row text
+        self._cached_rows: dict[tuple, list[str]] = {}  # see update_timeline
+        self._previous_rows: dict[tuple, list[str]] = {}
+        self.render_misses = 0  # entries and task groups formatted so far
+
+    @property
+    def rows(self) -> list[str]:
+        """The timeline, one string per line."""
+        return self._rows
 
-    def format_entry(self, index: int, skill_name: str, args: str, total_tokens: int, cost: float, duration_seconds: float, max_cost: float, is_active: bool, timestamp: str = "") -> str:
+    def format_entry(self, index: int, skill_name: str, args: str, total_tokens: int, cost: float, duration_seconds: float, max_cost: float, is_active: bool, timestamp: str = "", clock: str | None = None) -> str:
         tok_str = format_tokens(total_tokens)
         dur_str = format_duration_minutes(duration_seconds)
         bar = _cost_bar(cost, max_cost)
@@ -45,7 +103,7 @@ class WorkflowWidget(Static):
         args_display = f'"{args[:30]}..."' if len(args) > 30 else f'"{args}"' if args else ""
         num = "\u2460\u2461\u2462\u2463\u2464\u2465\u2466\u2467\u2468\u2469"
         idx_char = num[index - 1] if 1 <= index <= 10 else f"({index})"
-        time_str = _parse_time(timestamp) if timestamp else ""
+        time_str = _clock(timestamp, clock)
         time_prefix = f"{time_str}  " if time_str else ""
         result = f"{time_prefix}{idx_char} {skill_name:<24} {tok_str:>6} tok  ${cost:.2f}\n"
         if args_display:
@@ -61,12 +119,12 @@ class WorkflowWidget(Static):
         result += f"  \u2514 {skills_line}"
         return result
 
-    def format_overhead(self, input_tokens: int, output_tokens: int, cost: float, duration_seconds: float, tool_summary: str, timestamp: str = "") -> str:
+    def format_overhead(self, input_tokens: int, output_tokens: int, cost: float, duration_seconds: float, tool_summary: str, timestamp: str = "", clock: str | None = None) -> str:
         """Render an overhead segment (work done without any skill active)."""
         total_tokens = input_tokens + output_tokens
         tok_str = format_tokens(total_tokens)
         dur_str = format_duration_minutes(duration_seconds)
-        time_str = _parse_time(timestamp) if timestamp else ""
+        time_str = _clock(timestamp, clock)
         time_prefix = f"{time_str}  " if time_str else ""
         result = f"{time_prefix}   \u2500\u2500 no skill \u2500\u2500        {tok_str:>6} tok  ${cost:.2f}\n"
         if tool_summary:
@@ -74,9 +132,9 @@ class WorkflowWidget(Static):
         result += f"   \u2503  {dur_str}"
         return result
 
-    def format_compaction(self, timestamp: str, kind: str, pre_tokens: int) -> str:
+    def format_compaction(self, timestamp: str, kind: str, pre_tokens: int, clock: str | None = None) -> str:
         """Render a compaction event in the timeline."""
-        time_str = _parse_time(timestamp) if timestamp else ""
+        time_str = _clock(timestamp, clock)
         time_prefix = f"{time_str}  " if time_str else ""
         if kind == "microcompaction":
             label = "MICROCOMPACTION"
@@ -141,56 +199,112 @@ class WorkflowWidget(Static):
 
     def update_timeline(self, entries: list[dict]):
         if not entries:
-            self.update("  No skills invoked yet.")
+            self._set_rows(["  No skills invoked yet."])
             return
         max_cost = max(e.get("cost", 0) for e in entries)
-        parts = []
+        # Rows are cached by the values an entry or task group displays, so
+        # only entries whose numbers changed since the last update (usually
+        # just the active skill and its running task groups) are formatted
+        # again. Entries no longer shown drop out of the cache.
+        self._previous_rows, self._cached_rows = self._cached_rows, {}
+        rows: list[str] = []
         skill_index = 0
         for e in entries:
             kind = e.get("kind", "skill")
-            timestamp = e.get("timestamp", "")
-            if kind == "overhead":
-                text = self.format_overhead(
-                    input_tokens=e.get("input_tokens", 0),
-                    output_tokens=e.get("output_tokens", 0),
-                    cost=e.get("cost", 0),
-                    duration_seconds=e.get("duration_seconds", 0),
-                    tool_summary=e.get("tool_summary", ""),
-                    timestamp=timestamp,
-                )
-            elif kind == "subagent":
-                text = self.format_subagent_entry(
-                    description=e.get("description", ""),
-                    total_tokens=e.get("total_tokens", 0),
-                    cost=e.get("cost", 0),
-                    skills_invoked=e.get("skills_invoked", []),
-                )
-            elif kind == "compaction":
-                text = self.format_compaction(
-                    timestamp=timestamp,
-                    kind=e.get("compaction_kind", "compaction"),
-                    pre_tokens=e.get("pre_tokens", 0),
-                )
-            else:
+            if kind == "skill":
                 skill_index += 1
-                text = self.format_entry(
-                    index=skill_index,
-                    skill_name=e["skill_name"],
-                    args=e.get("args", ""),
-                    total_tokens=e.get("total_tokens", 0),
-                    cost=e.get("cost", 0),
-                    duration_seconds=e.get("duration_seconds", 0),
-                    max_cost=max_cost,
-                    is_active=e.get("is_active", False),
-                    timestamp=timestamp,
-                )
-                # Append task groups if present
-                task_groups = e.get("task_groups")
-                if task_groups:
-                    sorted_groups = sorted(task_groups.values(), key=lambda g: g.task_number)
-                    for i, group in enumerate(sorted_groups):
-                        is_last = i == len(sorted_groups) - 1
-                        text += "\n" + self.format_task_group(group, is_last=is_last)
-            parts.append(text)
-        separator = "\n   \u25bc\n"
-        self.update(separator.join(parts))
+            if rows:
+                rows.append("   \u25bc")
+            key = _entry_key(e, kind, skill_index, max_cost)
+            entry_rows = self._lookup(key)
+            if entry_rows is None:
+                entry_rows = self._store(key, self._format_timeline_entry(e, kind, skill_index, max_cost))
+            rows.extend(entry_rows)
+
+            # Append task groups if present
+            task_groups = e.get("task_groups") if kind == "skill" else None
+            if task_groups:
+                sorted_groups = sorted(task_groups.values(), key=lambda g: g.task_number)
+                for i, group in enumerate(sorted_groups):
+                    is_last = i == len(sorted_groups) - 1
+                    key = _group_key(group, is_last)
+                    group_rows = self._lookup(key)
+                    if group_rows is None:
+                        group_rows = self._store(key, self.format_task_group(group, is_last=is_last))
+                    rows.extend(group_rows)
+        self._previous_rows = {}
+        self._set_rows(rows)
+
+    def _lookup(self, key: tuple) -> list[str] | None:
+        entry_rows = self._previous_rows.get(key)
+        if entry_rows is None:
+            return self._cached_rows.get(key)
+        self._cached_rows[key] = entry_rows
+        return entry_rows
+
+    def _store(self, key: tuple, text: str) -> list[str]:
+        self.render_misses += 1
+        entry_rows = self._cached_rows[key] = text.split("\n")
+        return entry_rows
+
+    def _format_timeline_entry(self, e: dict, kind: str, skill_index: int, max_cost: float) -> str:
+        timestamp = e.get("timestamp", "")
+        if kind == "overhead":
+            return self.format_overhead(
+                input_tokens=e.get("input_tokens", 0),
+                output_tokens=e.get("output_tokens", 0),
+                cost=e.get("cost", 0),
+                duration_seconds=e.get("duration_seconds", 0),
+                tool_summary=e.get("tool_summary", ""),
+                timestamp=timestamp,
+                clock=e.get("clock"),
+            )
+        if kind == "subagent":
+            return self.format_subagent_entry(
+                description=e.get("description", ""),
+                total_tokens=e.get("total_tokens", 0),
+                cost=e.get("cost", 0),
+                skills_invoked=e.get("skills_invoked", []),
+            )
+        if kind == "compaction":
+            return self.format_compaction(
+                timestamp=timestamp,
+                kind=e.get("compaction_kind", "compaction"),
+                pre_tokens=e.get("pre_tokens", 0),
+                clock=e.get("clock"),
+            )
+        return self.format_entry(
+            index=skill_index,
+            skill_name=e["skill_name"],
+            args=e.get("args", ""),
+            total_tokens=e.get("total_tokens", 0),
+            cost=e.get("cost", 0),
+            duration_seconds=e.get("duration_seconds", 0),
+            max_cost=max_cost,
+            is_active=e.get("is_active", False),
+            timestamp=timestamp,
+            clock=e.get("clock"),
+        )
+
+    def _set_rows(self, rows: list[str]):
+        self._rows = rows
+        self.virtual_size = Size(max(map(cell_len, rows), default=0), len(rows))
+        self.refresh()
+
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._strips.clear()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        index = scroll_y + y
+        width = self.size.width
+        rich_style = self.rich_style
+        if index >= len(self._rows):
+            return Strip.blank(width, rich_style)
+        row = self._rows[index]
+        strip = self._strips.get(row)
+        if strip is None:
+            strip = Strip([Segment(row, rich_style)], cell_len(row))
+            self._strips[row] = strip
+        return strip.crop_extend(scroll_x, scroll_x + width, rich_style).apply_offsets(scroll_x, index)
@@ -0,0 +1,152 @@
+# tests/test_aggregates.py
+import json
+
+import pytest
+
+from superpowers_dashboard.aggregates import Aggregator, SubagentTotals
+from superpowers_dashboard.config import DEFAULT_PRICING
+from superpowers_dashboard.costs import calculate_cost
+from superpowers_dashboard.watcher import SessionParser, SubagentDetail
+
+TS = "2026-02-07T10:00:00.000Z"
+
+
+def _assistant(content, input_tokens=100, model="claude-opus-4-6"):
+    return json.dumps({
+        "type": "assistant",
+        "message": {"model": model, "content": content, "usage": {"input_tokens": input_tokens, "output_tokens": 10}},
+        "timestamp": TS,
+    })
+
+
+def _skill(name, tool_use_id):
+    return [
+        _assistant([{"type": "tool_use", "id": tool_use_id, "name": "Skill", "input": {"skill": f"superpowers:{name}"}}]),
+        json.dumps({"type": "user", "isMeta": True, "message": {"content": "x"}, "timestamp": TS}),
+    ]
+
+
+LINES = [
+    _assistant([{"type": "text", "text": "hi"}], input_tokens=1000),
+    *_skill("brainstorming", "toolu_1"),
+    _assistant([{"type": "text", "text": "a"}], input_tokens=300),
+    _assistant([{"type": "text", "text": "b"}], input_tokens=50, model="claude-haiku-4-5"),
+    *_skill("writing-plans", "toolu_2"),
+    _assistant([{"type": "text", "text": "c"}], input_tokens=700, model="claude-sonnet-4-5"),
+    *_skill("brainstorming", "toolu_3"),
+    _assistant([{"type": "text", "text": "d"}], input_tokens=20),
+]
+
+
+def _rows_match(actual: list[dict], expected: list[dict]):
+    assert len(actual) == len(expected)
+    for row, want in zip(actual, expected):
+        assert row == {k: pytest.approx(v) if isinstance(v, float) else v for k, v in want.items()}
+
+
+def _same(incremental: Aggregator, rebuilt: Aggregator):
+    assert incremental.total_input == rebuilt.total_input
+    assert incremental.total_output == rebuilt.total_output
+    assert incremental.total_cache_read == rebuilt.total_cache_read
+    assert incremental.total_cost == pytest.approx(rebuilt.total_cost)
+    _rows_match(incremental.per_skill(), rebuilt.per_skill())
+    _rows_match(incremental.model_stats(), rebuilt.model_stats())
+    for i in range(len(incremental.parser.skill_events)):
+        assert incremental.event_cost(i) == pytest.approx(rebuilt.event_cost(i))
+    for i in range(len(incremental.parser.overhead_segments)):
+        assert incremental.segment_cost(i) == pytest.approx(rebuilt.segment_cost(i))
+
+
+def test_incremental_matches_rebuild():
+    parser = SessionParser(session_id="s1")
+    aggregator = Aggregator(DEFAULT_PRICING, parser)
+    for line in LINES:
+        parser.process_line(line)
+        _same(aggregator, Aggregator(DEFAULT_PRICING, parser))
+    assert {s["name"] for s in aggregator.per_skill()} == {"brainstorming", "writing-plans"}
+    assert aggregator.total_input == 1000 + 100 * 3 + 300 + 50 + 700 + 20
+
+
+def test_attach_follows_a_merged_parser():
+    first, second = SessionParser(session_id="s1"), SessionParser(session_id="s2")
+    for line in LINES[:4]:
+        first.process_line(line)
+    for line in LINES[4:]:
+        second.process_line(line)
+    aggregator = Aggregator(DEFAULT_PRICING, first)
+    first.merge(second)
+    aggregator.attach(first)
+    first.process_line(_assistant([{"type": "text", "text": "e"}], input_tokens=9))
+    _same(aggregator, Aggregator(DEFAULT_PRICING, first))
+    assert aggregator.total_input == 1000 + 100 * 3 + 300 + 50 + 700 + 20 + 9
+
+
+def test_update_subagent_replaces_previous_share():
+    parser = SessionParser(session_id="s1")
+    parser.process_line(_assistant([{"type": "tool_use", "id": "toolu_t", "name": "Task", "input": {"description": "d", "model": "haiku"}}]))
+    aggregator = Aggregator(DEFAULT_PRICING, parser)
+    subagent = parser.subagents[0]
+    assert aggregator.subagent_totals == SubagentTotals()
+
+    subagent.detail = SubagentDetail(agent_id="a", input_tokens=5, output_tokens=1, cost=0.5)
+    aggregator.update_subagent(subagent)
+    subagent.detail.input_tokens += 10
+    subagent.detail.skills_invoked.append("x")
+    subagent.detail.cost = 0.75
+    aggregator.update_subagent(subagent)
+
+    assert aggregator.subagent_totals == SubagentTotals(count=1, skills_used=1, cost=0.75, tokens=16)
+    _rows_match(aggregator.model_stats(), Aggregator(DEFAULT_PRICING, parser).model_stats())
+
+
+def test_segment_cost_is_priced_once():
+    parser = SessionParser(session_id="s1")
+    aggregator = Aggregator(DEFAULT_PRICING, parser)
+    for line in LINES[:3]:
+        parser.process_line(line)
+    assert len(parser.overhead_segments) == 1
+    cost = aggregator.segment_cost(0)
+    assert cost > 0
+
+    aggregator.pricing = {}
+    assert aggregator.segment_cost(0) == cost
+
+
+OPUS, SONNET, HAIKU = "claude-opus-4-6", "claude-sonnet-4-5-20250929", "claude-haiku-4-5-20251001"
+
+
+def _cost(model, input_tokens):
+    return calculate_cost(model, input_tokens, 10, 0, 0, DEFAULT_PRICING)
+
+
+def test_turns_are_priced_at_their_own_model():
+    parser = SessionParser(session_id="s1")
+    aggregator = Aggregator(DEFAULT_PRICING, parser)
+    lines = [
+        _assistant([{"type": "text", "text": "plan"}], input_tokens=1_000_000, model=SONNET),
+        *_skill("brainstorming", "toolu_1"),
+        _assistant([{"type": "text", "text": "a"}], input_tokens=1_000_000, model=HAIKU),
+        _assistant([{"type": "text", "text": "b"}], input_tokens=200_000),
+    ]
+    for line in lines:
+        parser.process_line(line)
+
+    assert aggregator.segment_cost(0) == pytest.approx(_cost(SONNET, 1_000_000))
+    assert aggregator.overhead_cost == pytest.approx(_cost(SONNET, 1_000_000))
+    assert aggregator.event_cost(0) == pytest.approx(_cost(OPUS, 100) + _cost(HAIKU, 1_000_000) + _cost(OPUS, 200_000))
+    assert sum(m["cost"] for m in aggregator.model_stats()) == pytest.approx(aggregator.total_cost)
+    assert {m["model"] for m in aggregator.model_stats()} == {"opus", "sonnet", "haiku"}
+    _same(aggregator, Aggregator(DEFAULT_PRICING, parser))
+
+
+def test_merged_segments_keep_their_costs():
+    first, second = SessionParser(session_id="s1"), SessionParser(session_id="s2")
+    first.process_line(_assistant([{"type": "text", "text": "a"}], input_tokens=1000, model=HAIKU))
+    second.process_line(_assistant([{"type": "text", "text": "b"}], input_tokens=3000, model=SONNET))
+    second.process_line(_skill("brainstorming", "toolu_1")[0])
+    second.process_line(_skill("brainstorming", "toolu_1")[1])
+    first.merge(second)
+    aggregator = Aggregator(DEFAULT_PRICING, first)
+
+    assert aggregator.segment_cost(0) == pytest.approx(_cost(HAIKU, 1000))
+    assert aggregator.segment_cost(1) == pytest.approx(_cost(SONNET, 3000))
@@ -0,0 +1,72 @@
+# tests/test_analytics.py
+import random
+from array import array
+
+import pytest
+
+from superpowers_dashboard.analytics import BACKEND, _select_backend, sum_by
+
+RATES = [(5.0, 25.0, 0.5, 6.25), (1.0, 5.0, 0.1, 1.25), (0.0, 0.0, 0.0, 0.0)]
+
+
+def _columns(rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    keys = array("i", (rng.randrange(-1, 50) for _ in range(rows)))
+    models = array("H", (rng.randrange(len(RATES)) for _ in range(rows)))
+    tokens = [array("I", (rng.randrange(100_000) for _ in range(rows))) for _ in range(4)]
+    return keys, models, tokens
+
+
+def _backends():
+    names = ["python"]
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        names.append("numpy")
+    return names
+
+
+def _expected_costs(keys, models, tokens) -> dict[int, float]:
+    costs: dict[int, float] = {}
+    for key, model, *counts in zip(keys, models, *tokens):
+        costs[key] = costs.get(key, 0.0) + sum(c * r for c, r in zip(counts, RATES[model])) / 1_000_000
+    return costs
+
+
+@pytest.mark.parametrize("name", _backends())
+def test_group_sums_match_a_plain_loop(name):
+    backend, group_sums, _ = _select_backend(name)
+    assert backend == name
+    keys, _, tokens = _columns(5000)
+    assert group_sums(keys, tokens) == sum_by(keys, tokens)
+    assert group_sums(array("i"), tokens[:0]) == {}
+
+
+@pytest.mark.parametrize("name", _backends())
+def test_group_sums_bucket_sparse_keys(name):
+    _, group_sums, _ = _select_backend(name)
+    hour = 3_600_000
+    times = array("q", [1_770_000_000_000 + i * 600_000 for i in range(50)] + [1_800_000_000_000])
+    tokens = [array("I", [1] * len(times))]
+    sums = group_sums(times, tokens, bucket=hour)
+    assert sums == sum_by(times, tokens, bucket=hour)
+    assert sum(v[0] for v in sums.values()) == len(times)
+    assert all(t % hour == 0 for t in sums)
+
+
+@pytest.mark.parametrize("name", _backends())
+def test_group_costs_price_each_row_at_its_model(name):
+    _, _, group_costs = _select_backend(name)
+    keys, models, tokens = _columns(5000, seed=1)
+    costs = group_costs(keys, models, tokens, RATES)
+    expected = _expected_costs(keys, models, tokens)
+    assert costs.keys() == expected.keys()
+    for key, cost in expected.items():
+        assert costs[key] == pytest.approx(cost)
+
+
+def test_python_backend_can_be_forced():
+    assert _select_backend("python")[0] == "python"
+    assert BACKEND in ("numpy", "python")
@@ -0,0 +1,157 @@
+# tests/test_cache.py
+import json
+import os
+
+from superpowers_dashboard.cache import CheckpointCache, parse_session_file
+
+
+def _assistant(input_tokens: int, tool: str = "Read", timestamp: str = "2026-02-06T22:00:00.000Z") -> str:
+    return json.dumps({
+        "type": "assistant",
+        "message": {
+            "model": "claude-opus-4-6",
+            "content": [{"type": "tool_use", "id": "t", "name": tool, "input": {}}],
+            "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+        },
+        "timestamp": timestamp,
+    })
+
+
+def _write(path, lines):
+    with open(path, "a") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+
+def test_parse_session_file_without_cache(tmp_path):
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100), _assistant(200)])
+    parser, reader = parse_session_file(session)
+    assert parser.overhead_tokens["input"] == 300
+    assert reader.offset == session.stat().st_size
+    reader.close()
+
+
+def test_unchanged_file_loads_from_checkpoint(tmp_path):
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100)])
+    cache = CheckpointCache(tmp_path / "cache")
+    parse_session_file(session, cache)[1].close()
+
+    checkpoint = cache.load(session)
+    assert checkpoint is not None
+    assert checkpoint.offset == session.stat().st_size
+    assert checkpoint.parser.overhead_tokens["input"] == 100
+
+    parser, reader = parse_session_file(session, cache)
+    assert parser.overhead_tokens["input"] == 100
+    reader.close()
+
+
+def test_appended_file_parses_only_new_bytes(tmp_path):
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100)])
+    cache = CheckpointCache(tmp_path / "cache")
+    parse_session_file(session, cache)[1].close()
+
+    _write(session, [_assistant(50, tool="Bash")])
+    parser, reader = parse_session_file(session, cache)
+    assert parser.overhead_tokens["input"] == 150
+    assert parser.tool_counts == {"Read": 1, "Bash": 1}
+    reader.close()
+    # The refreshed checkpoint covers the appended line too
+    assert cache.load(session).parser.overhead_tokens["input"] == 150
+
+
+def test_partial_line_is_not_checkpointed(tmp_path):
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100)])
+    complete = session.stat().st_size
+    with open(session, "a") as f:
+        f.write(_assistant(7)[:20])
+    cache = CheckpointCache(tmp_path / "cache")
+    parse_session_file(session, cache)[1].close()
+    assert cache.load(session).offset == complete
+
+    with open(session, "a") as f:
+        f.write(_assistant(7)[20:] + "\n")
+    parser, reader = parse_session_file(session, cache)
+    assert parser.overhead_tokens["input"] == 107
+    reader.close()
+
+
+def test_replaced_file_is_rebuilt(tmp_path):
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100)])
+    cache = CheckpointCache(tmp_path / "cache")
+    parse_session_file(session, cache)[1].close()
+
+    replacement = tmp_path / "new.jsonl"
+    _write(replacement, [_assistant(5), _assistant(5), _assistant(5)])
+    os.replace(replacement, session)
+    assert cache.load(session) is None
+    parser, reader = parse_session_file(session, cache)
+    assert parser.overhead_tokens["input"] == 15
+    reader.close()
+
+
+def test_rewritten_prefix_is_rebuilt(tmp_path):
+    """Same inode, grown size, but the bytes before the checkpoint changed."""
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100)])
+    cache = CheckpointCache(tmp_path / "cache")
+    parse_session_file(session, cache)[1].close()
+
+    with open(session, "r+") as f:
+        f.write(_assistant(900) + "\n" + _assistant(1) + "\n")
+    assert cache.load(session) is None
+    parser, reader = parse_session_file(session, cache)
+    assert parser.overhead_tokens["input"] == 901
+    reader.close()
+
+
+def test_corrupt_entry_is_discarded(tmp_path):
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100)])
+    cache = CheckpointCache(tmp_path / "cache")
+    parse_session_file(session, cache)[1].close()
+    entry = next((tmp_path / "cache").glob("*.pkl"))
+    entry.write_bytes(b"not a pickle")
+
+    assert cache.load(session) is None
+    assert not entry.exists()
+    parser, reader = parse_session_file(session, cache)
+    assert parser.overhead_tokens["input"] == 100
+    reader.close()
+
+
+def test_stale_version_is_discarded(tmp_path, monkeypatch):
+    import superpowers_dashboard.cache as cache_module
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100)])
+    cache = CheckpointCache(tmp_path / "cache")
+    parse_session_file(session, cache)[1].close()
+    monkeypatch.setattr(cache_module, "CACHE_VERSION", cache_module.CACHE_VERSION + 1)
+    assert cache.load(session) is None
+
+
+def test_file_rotated_mid_read_is_checkpointed_on_retry(tmp_path, monkeypatch):
+    import superpowers_dashboard.cache as cache_module
+    session = tmp_path / "s.jsonl"
+    _write(session, [_assistant(100)])
+    cache = CheckpointCache(tmp_path / "cache")
+    readers = []
+
+    class RotatingOnce(cache_module.TailReader):
+        def iter_lines(self):
+            yield from super().iter_lines()
+            if not readers:
+                self.rotated = True
+            readers.append(self)
+
+    monkeypatch.setattr(cache_module, "TailReader", RotatingOnce)
+    parser, reader = parse_session_file(session, cache)
+    reader.close()
+    assert len(readers) == 2
+    assert parser.overhead_tokens["input"] == 100
+    assert cache.load(session).offset == session.stat().st_size
@@ -1,4 +1,4 @@
-from superpowers_dashboard.config import load_config, DEFAULT_PRICING
+from superpowers_dashboard.config import ConfigFile, load_config, DEFAULT_PRICING
 
 
 def test_default_pricing_has_opus():
@@ -40,3 +40,36 @@ cache_write = 12.5
     config = load_config(config_path=config_file)
     assert config["pricing"]["claude-opus-4-6"]["input"] == 10.0
     assert "claude-sonnet-4-5-20250929" in config["pricing"]
+
+
+OPUS_RATES = '''
+[pricing."claude-opus-4-6"]
+input = 10.0
+output = 50.0
+cache_read = 1.0
+cache_write = 12.5
+'''
+
+
+def test_config_file_reloads_only_when_changed(tmp_path):
+    path = tmp_path / "config.toml"
+    config_file = ConfigFile(path)
+    assert config_file.load()["pricing"] == DEFAULT_PRICING
+    assert config_file.reload() is None
+
+    path.write_text(OPUS_RATES)
+    config = config_file.reload()
+    assert config["pricing"]["claude-opus-4-6"]["input"] == 10.0
+    assert config_file.reload() is None
+
+
+def test_config_file_ignores_broken_edits(tmp_path):
+    path = tmp_path / "config.toml"
+    config_file = ConfigFile(path)
+    config_file.load()
+    path.write_text('[pricing."claude-new"\ninput = ')
+    assert config_file.reload() is None
+    path.write_text('[pricing."claude-new"]\ninput = 1.0\n')
+    assert config_file.reload() is None  # no output or cache rates yet
+    path.write_text('[pricing."claude-new"]\ninput = 1.0\noutput = 2.0\ncache_read = 0.1\ncache_write = 1.5\n')
+    assert config_file.reload()["pricing"]["claude-new"]["output"] == 2.0
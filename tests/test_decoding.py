@@ -0,0 +1,42 @@
+# tests/test_decoding.py
+import pytest
+
+import superpowers_dashboard.watcher as watcher
+from superpowers_dashboard.decoding import BACKEND, DECODE_ERRORS, _select_backend, loads
+
+
+def test_selected_backend_decodes_bytes_and_str():
+    assert BACKEND in ("orjson", "msgspec", "json")
+    assert loads(b'{"type": "user"}') == {"type": "user"}
+    assert loads('{"type": "user"}') == {"type": "user"}
+
+
+def test_selected_backend_raises_decode_error():
+    with pytest.raises(DECODE_ERRORS):
+        loads(b'{"type": ')
+
+
+def test_stdlib_backend_can_be_forced():
+    name, stdlib_loads, errors = _select_backend("json")
+    assert name == "json"
+    assert stdlib_loads(b'{"a": 1}') == {"a": 1}
+    with pytest.raises(errors):
+        stdlib_loads(b"\xff\xfe")
+
+
+def test_unknown_backend_falls_back_to_stdlib():
+    assert _select_backend("nonexistent")[0] == "json"
+
+
+@pytest.mark.parametrize("backend", ["orjson", "msgspec", "json"])
+def test_parser_ignores_undecodable_lines(backend, monkeypatch):
+    name, backend_loads, errors = _select_backend(backend)
+    if name != backend:
+        pytest.skip(f"{backend} is not installed")
+    monkeypatch.setattr(watcher, "loads", backend_loads)
+    monkeypatch.setattr(watcher, "DECODE_ERRORS", errors)
+    parser = watcher.SessionParser()
+    for line in ['{"type": "assistant", "message": {', b'{"type": "assistant", oops}', b'{"type": "assistant"\xff}']:
+        parser.process_line(line)
+    assert parser.overhead_tokens["input"] == 0
+    assert parser.skill_events == []
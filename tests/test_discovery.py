@@ -0,0 +1,179 @@
+# tests/test_discovery.py
+import os
+
+from superpowers_dashboard import discovery as discovery_module
+from superpowers_dashboard.discovery import SessionDiscovery, SubagentIndex
+
+
+def _touch(path, mtime_ns=None):
+    path.write_text("{}\n")
+    if mtime_ns is not None:
+        os.utime(path.parent, ns=(mtime_ns, mtime_ns))
+
+
+def test_subagent_index_maps_agent_ids(tmp_path):
+    subagents = tmp_path / "sess" / "subagents"
+    subagents.mkdir(parents=True)
+    _touch(subagents / "agent-abc123.jsonl")
+    _touch(subagents / "notes.txt")
+    index = SubagentIndex(tmp_path / "sess")
+    assert index.refresh()
+    assert index.get("abc123") == subagents / "agent-abc123.jsonl"
+    assert index.get("missing") is None
+
+
+def test_subagent_index_missing_directory(tmp_path):
+    index = SubagentIndex(tmp_path / "sess")
+    assert not index.refresh()
+    assert index.get("abc123") is None
+    (tmp_path / "sess" / "subagents").mkdir(parents=True)
+    _touch(tmp_path / "sess" / "subagents" / "agent-abc123.jsonl")
+    assert index.refresh()
+    assert index.get("abc123") is not None
+
+
+def test_subagent_index_rescans_only_when_mtime_changes(tmp_path, monkeypatch):
+    subagents = tmp_path / "sess" / "subagents"
+    subagents.mkdir(parents=True)
+    _touch(subagents / "agent-a.jsonl", mtime_ns=1_000_000_000)
+    index = SubagentIndex(tmp_path / "sess")
+    assert index.refresh()
+
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(discovery_module.os, "scandir", lambda p: scans.append(p) or real_scandir(p))
+    assert not index.refresh()
+    assert scans == []
+
+    _touch(subagents / "agent-b.jsonl", mtime_ns=2_000_000_000)
+    assert index.refresh()
+    assert len(scans) == 1
+    assert index.get("b") is not None
+
+
+def test_subagent_index_distrusts_recent_mtime(tmp_path):
+    """A listing taken while the directory is still changing is rescanned next time."""
+    subagents = tmp_path / "sess" / "subagents"
+    subagents.mkdir(parents=True)
+    _touch(subagents / "agent-a.jsonl")
+    index = SubagentIndex(tmp_path / "sess")
+    assert index.refresh()
+    assert index.refresh()
+
+
+def test_subagent_index_wakes_waiters_when_file_appears(tmp_path):
+    subagents = tmp_path / "sess" / "subagents"
+    subagents.mkdir(parents=True)
+    _touch(subagents / "agent-old.jsonl", mtime_ns=1_000_000_000)
+    index = SubagentIndex(tmp_path / "sess")
+    index.refresh()
+
+    found = []
+    index.wait_for("old", found.append)
+    assert found == [subagents / "agent-old.jsonl"]
+
+    index.wait_for("new", found.append)
+    assert not index.refresh()
+    assert len(found) == 1
+    _touch(subagents / "agent-new.jsonl", mtime_ns=2_000_000_000)
+    index.refresh()
+    assert found == [subagents / "agent-old.jsonl", subagents / "agent-new.jsonl"]
+    index.refresh()
+    assert len(found) == 2
+
+
+def _session(directory, name, mtime_ns):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text("{}\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    os.utime(directory, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_discovery_lists_project_sessions_oldest_first(tmp_path):
+    project = tmp_path / "-home-user-proj"
+    newer = _session(project, "b.jsonl", 2_000_000_000)
+    older = _session(project, "a.jsonl", 1_000_000_000)
+    (project / "a").mkdir()  # session directory holding subagents/
+    os.utime(project, ns=(3_000_000_000, 3_000_000_000))
+    discovery = SessionDiscovery(base_dir=tmp_path, project_cwd="/home/user/proj")
+    delta = discovery.refresh()
+    assert discovery.sessions == [older, newer]
+    assert delta.added == [older, newer] and delta.removed == []
+    assert discovery.files[0].size == 3
+    assert not discovery.refresh()
+
+
+def test_discovery_reports_added_and_removed_sessions(tmp_path):
+    project = tmp_path / "-home-user-proj"
+    first = _session(project, "a.jsonl", 1_000_000_000)
+    gone = _session(project, "b.jsonl", 2_000_000_000)
+    discovery = SessionDiscovery(base_dir=tmp_path, project_cwd="/home/user/proj")
+    discovery.refresh()
+
+    gone.unlink()
+    added = _session(project, "c.jsonl", 3_000_000_000)
+    delta = discovery.refresh()
+    assert delta.added == [added]
+    assert delta.removed == [gone]
+    assert discovery.sessions == [first, added]
+
+
+def test_discovery_does_not_rescan_unchanged_directories(tmp_path, monkeypatch):
+    project = tmp_path / "-home-user-proj"
+    for i in range(20):
+        _session(project, f"s{i}.jsonl", 1_000_000_000 + i)
+    discovery = SessionDiscovery(base_dir=tmp_path, project_cwd="/home/user/proj")
+    discovery.refresh()
+
+    calls = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(discovery_module.os, "scandir", lambda p: calls.append(p) or real_scandir(p))
+    for _ in range(5):
+        assert not discovery.refresh()
+    assert calls == []
+
+
+def test_discovery_falls_back_to_latest_project(tmp_path):
+    _session(tmp_path / "-old-proj", "a.jsonl", 1_000_000_000)
+    latest = _session(tmp_path / "-new-proj", "b.jsonl", 2_000_000_000)
+    discovery = SessionDiscovery(base_dir=tmp_path, project_cwd="/not/a/project")
+    discovery.refresh()
+    assert discovery.project_dir == tmp_path / "-new-proj"
+    assert discovery.sessions == [latest]
+
+    # The cwd's project appearing takes over
+    own = _session(tmp_path / "-not-a-project", "c.jsonl", 500_000_000)
+    delta = discovery.refresh()
+    assert discovery.sessions == [own]
+    assert delta.added == [own] and delta.removed == [latest]
+
+
+def test_discovery_restat_sees_appends(tmp_path):
+    """Appends leave the directory mtime alone; only a restat reorders by them."""
+    old_project = tmp_path / "-old-proj"
+    first = _session(old_project, "a.jsonl", 1_000_000_000)
+    second = _session(old_project, "b.jsonl", 2_000_000_000)
+    _session(tmp_path / "-new-proj", "c.jsonl", 3_000_000_000)
+    discovery = SessionDiscovery(base_dir=tmp_path, project_cwd="/not/a/project")
+    discovery.refresh()
+    assert discovery.project_dir == tmp_path / "-new-proj"
+
+    with open(first, "a") as f:
+        f.write("{}\n")
+    os.utime(first, ns=(4_000_000_000, 4_000_000_000))
+    assert not discovery.refresh()
+    assert discovery.project_dir == tmp_path / "-new-proj"
+
+    discovery.refresh(restat=True)
+    assert discovery.project_dir == old_project
+    assert discovery.sessions == [second, first]
+    assert discovery.files[-1].size == 6
+
+
+def test_discovery_without_projects(tmp_path):
+    discovery = SessionDiscovery(base_dir=tmp_path / "missing", project_cwd="/x")
+    assert not discovery.refresh()
+    assert discovery.sessions == []
+    assert discovery.project_dir is None
@@ -0,0 +1,130 @@
+# tests/test_events.py
+import json
+import pickle
+
+from superpowers_dashboard.events import (
+    Compaction, HookFired, SkillStarted, SubagentDispatched, SubagentResolved, TokensAccrued, ToolUsed,
+)
+from superpowers_dashboard.watcher import SessionParser
+
+TS = "2026-02-07T10:00:00.000Z"
+
+
+def _assistant(content, input_tokens=100, model="claude-opus-4-6"):
+    return json.dumps({
+        "type": "assistant",
+        "message": {"model": model, "content": content, "usage": {"input_tokens": input_tokens, "output_tokens": 10}},
+        "timestamp": TS,
+    })
+
+
+def _tool_use(tool_use_id, name, **tool_input):
+    return {"type": "tool_use", "id": tool_use_id, "name": name, "input": tool_input}
+
+
+def _subscribed(session_id="s1"):
+    parser = SessionParser(session_id=session_id)
+    events = []
+    parser.subscribe(events.append)
+    return parser, events
+
+
+def test_skill_and_token_events():
+    parser, events = _subscribed()
+    parser.process_line(_assistant([{"type": "text", "text": "hi"}], input_tokens=5))
+    parser.process_line(_assistant([_tool_use("toolu_s", "Skill", skill="superpowers:brainstorming", args="idea")]))
+    parser.process_line(json.dumps({"type": "user", "isMeta": True, "message": {"content": "x"}, "timestamp": TS}))
+    parser.process_line(_assistant([{"type": "text", "text": "ok"}], input_tokens=7, model="claude-haiku-4-5"))
+
+    assert events == [
+        TokensAccrued("s1", TS, "claude-opus-4-6", 5, 10, 0, 0, None),
+        ToolUsed("s1", TS, "Skill"),
+        SkillStarted("s1", TS, "brainstorming", "idea", 0, "claude-opus-4-6", 100, 10, 0, 0),
+        TokensAccrued("s1", TS, "claude-haiku-4-5", 7, 10, 0, 0, 0),
+    ]
+
+
+def test_subagent_events():
+    parser, events = _subscribed()
+    parser.process_line(_assistant([_tool_use("toolu_t", "Task", description="Do it", subagent_type="general-purpose")]))
+    parser.process_line(json.dumps({
+        "type": "progress", "parentToolUseID": "toolu_t",
+        "data": {"type": "agent_progress", "agentId": "abc123"}, "timestamp": TS,
+    }))
+    parser.process_line(json.dumps({
+        "type": "user", "timestamp": TS,
+        "message": {"content": [{"type": "tool_result", "tool_use_id": "toolu_t", "content": "done"}]},
+    }))
+    assert [e for e in events if not isinstance(e, (ToolUsed, TokensAccrued))] == [
+        SubagentDispatched("s1", TS, "toolu_t", "Do it", "general-purpose", "inherit"),
+        SubagentResolved("s1", "toolu_t", "abc123", "running"),
+        SubagentResolved("s1", "toolu_t", "abc123", "complete"),
+    ]
+
+
+def test_compaction_and_hook_events():
+    parser, events = _subscribed()
+    parser.process_line(json.dumps({
+        "type": "system", "subtype": "compact_boundary", "timestamp": TS,
+        "compactMetadata": {"trigger": "auto", "preTokens": 150000},
+    }))
+    parser.process_line(json.dumps({
+        "type": "progress", "timestamp": TS,
+        "data": {"type": "hook_progress", "hookEventName": "SessionStart", "hookType": "command"},
+    }))
+    assert events == [
+        Compaction("s1", TS, "compaction", 150000, "auto"),
+        HookFired("s1", TS, "SessionStart", "command"),
+    ]
+
+
+def test_events_carry_the_selected_session():
+    parser, events = _subscribed()
+    parser.select_session("s2")
+    parser.process_line(_assistant([{"type": "text", "text": "hi"}]))
+    assert events[0].session_id == "s2"
+
+
+def _start_skill(parser, name, tool_use_id):
+    parser.process_line(_assistant([_tool_use(tool_use_id, "Skill", skill=f"superpowers:{name}")]))
+    parser.process_line(json.dumps({"type": "user", "isMeta": True, "message": {"content": "x"}, "timestamp": TS}))
+
+
+def test_token_events_index_the_active_skill_of_their_session():
+    """Indices stay right when sessions interleave and when a later session is merged in."""
+    parser = SessionParser(session_id="s1")
+    _start_skill(parser, "brainstorming", "toolu_a")
+    parser.select_session("s2")
+    _start_skill(parser, "writing-plans", "toolu_b")
+    later = SessionParser(session_id="s3")
+    _start_skill(later, "debugging", "toolu_c")
+    later.select_session("s4")
+    _start_skill(later, "tdd", "toolu_d")
+    parser.merge(later)
+
+    events = []
+    parser.subscribe(events.append)
+    for session_id in ["s1", "s2", "s3", "s4"]:
+        parser.select_session(session_id)
+        parser.process_line(_assistant([{"type": "text", "text": "ok"}]))
+    assert [event.skill_index for event in events] == [0, 1, 2, 3]
+    assert [e.skill_name for e in parser.skill_events] == ["brainstorming", "writing-plans", "debugging", "tdd"]
+
+
+def test_unsubscribe():
+    parser, events = _subscribed()
+    other = []
+    unsubscribe = parser.subscribe(other.append)
+    unsubscribe()
+    parser.process_line(_assistant([{"type": "text", "text": "hi"}]))
+    assert len(events) == 1
+    assert other == []
+
+
+def test_subscribers_are_not_pickled():
+    parser, events = _subscribed()
+    parser.subscribe(lambda event: None)  # not picklable
+    restored = pickle.loads(pickle.dumps(parser))
+    restored.process_line(_assistant([{"type": "text", "text": "hi"}]))
+    assert events == []
+    assert restored.overhead_tokens["input"] == 100
@@ -124,3 +124,17 @@ def test_build_task_groups_subagent_status_detection():
     subs = groups[1].subagents
     assert subs[0].get("status") == "complete"
     assert subs[1].get("status") == "running"
+
+
+def test_build_task_groups_prefers_explicit_status():
+    """A status supplied by the parser wins over the token heuristic."""
+    subagent_entries = [
+        {"description": "Implement Task 1: Fix bug", "subagent_type": "general-purpose",
+         "timestamp": "2026-02-07T10:00:00Z", "total_tokens": 4000, "cost": 0.12, "skills_invoked": [],
+         "status": "running"},
+        {"description": "Review spec compliance Task 1", "subagent_type": "general-purpose",
+         "timestamp": "2026-02-07T10:05:00Z", "total_tokens": 0, "cost": 0, "skills_invoked": [],
+         "status": "complete"},
+    ]
+    groups, _ = build_task_groups(subagent_entries)
+    assert [s["status"] for s in groups[1].subagents] == ["running", "complete"]
@@ -0,0 +1,246 @@
+# tests/test_ingest.py
+import json
+import os
+import threading
+
+import pytest
+
+from superpowers_dashboard.config import DEFAULT_PRICING, ConfigFile
+from superpowers_dashboard.discovery import SessionDiscovery
+from superpowers_dashboard.ingest import IngestWorker
+from superpowers_dashboard.loader import load_sessions
+from superpowers_dashboard.watcher import SubagentDetail, SubagentEvent
+
+
+def _skill_lines(skill_name: str, tool_use_id: str) -> list[str]:
+    return [
+        json.dumps({
+            "type": "assistant",
+            "message": {
+                "model": "claude-opus-4-6",
+                "content": [{"type": "tool_use", "id": tool_use_id, "name": "Skill", "input": {"skill": f"superpowers:{skill_name}"}}],
+                "usage": {"input_tokens": 100, "output_tokens": 50},
+            },
+            "timestamp": "2026-02-07T10:00:00.000Z",
+        }),
+        json.dumps({"type": "user", "isMeta": True, "message": {"content": "skill"}, "timestamp": "2026-02-07T10:00:01.000Z"}),
+    ]
+
+
+def _write(path, lines, mode="w"):
+    with open(path, mode) as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+def _project(tmp_path):
+    project = tmp_path / "-home-user-proj"
+    project.mkdir()
+    return project
+
+
+def _worker(tmp_path, **kwargs) -> IngestWorker:
+    return IngestWorker(SessionDiscovery(base_dir=tmp_path, project_cwd="/home/user/proj"), DEFAULT_PRICING, **kwargs)
+
+
+def test_load_and_poll_without_thread(tmp_path):
+    project = _project(tmp_path)
+    _write(project / "s1.jsonl", _skill_lines("brainstorming", "toolu_a"))
+    worker = _worker(tmp_path)
+    worker.load()
+    assert [e.skill_name for e in worker.parser.skill_events] == ["brainstorming"]
+    assert not worker.poll()
+
+    _write(project / "s1.jsonl", _skill_lines("writing-plans", "toolu_b"), mode="a")
+    assert worker.poll()
+    _write(project / "s2.jsonl", _skill_lines("debugging", "toolu_c"))
+    assert worker.poll()
+    assert [e.skill_name for e in worker.parser.skill_events] == ["brainstorming", "writing-plans", "debugging"]
+    worker.close()
+
+
+def _next_snapshot(worker, ready):
+    assert ready.wait(5)
+    ready.clear()
+    return worker.take_snapshot()
+
+
+def test_thread_publishes_snapshots(tmp_path):
+    project = _project(tmp_path)
+    _write(project / "s1.jsonl", _skill_lines("brainstorming", "toolu_a"))
+    ready = threading.Event()
+    worker = _worker(tmp_path, on_snapshot=ready.set)
+    worker.start()
+    try:
+        snapshot = _next_snapshot(worker, ready)
+        if snapshot.loading is not None:
+            # Published before the session was parsed
+            assert snapshot.loading == (0, 1, (project / "s1.jsonl").stat().st_size)
+            snapshot = _next_snapshot(worker, ready)
+        assert snapshot.loading is None
+        assert snapshot.session_id == "s1"
+        assert snapshot.active_skill == "brainstorming"
+        assert worker.take_snapshot() is None
+
+        _write(project / "s1.jsonl", _skill_lines("writing-plans", "toolu_b"), mode="a")
+        worker.wake()
+        snapshot = _next_snapshot(worker, ready)
+        assert snapshot.skill_count == 2
+        assert snapshot.used_skills == {"brainstorming"}
+    finally:
+        worker.stop()
+
+
+def test_snapshots_coalesce_until_taken(tmp_path):
+    _write(_project(tmp_path) / "s1.jsonl", _skill_lines("brainstorming", "toolu_a"))
+    calls = []
+    worker = _worker(tmp_path, on_snapshot=lambda: calls.append(1))
+    worker.load()
+    worker._publish()
+    worker._publish()
+    assert len(calls) == 1
+    assert worker.take_snapshot() is not None
+    worker._publish()
+    assert len(calls) == 2
+    worker.close()
+
+
+def test_worker_error_surfaces_on_take(tmp_path, monkeypatch):
+    ready = threading.Event()
+    worker = _worker(tmp_path, on_snapshot=ready.set)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(worker, "load", fail)
+    worker.start()
+    assert ready.wait(5)
+    with pytest.raises(RuntimeError, match="boom"):
+        worker.take_snapshot()
+    worker.stop()
+
+
+def test_newest_session_loads_first_then_history_backfills(tmp_path):
+    project = _project(tmp_path)
+    paths = [project / f"s{i}.jsonl" for i in range(5)]
+    for i, path in enumerate(paths):
+        _write(path, _skill_lines(f"skill-{i}", f"toolu_{i}"))
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    worker = _worker(tmp_path)
+    worker.load()
+    assert [e.skill_name for e in worker.parser.skill_events] == ["skill-4"]
+    size = paths[0].stat().st_size
+    assert worker.progress == (1, 5, 4 * size)
+
+    assert worker.backfill(max_files=2)
+    assert [e.skill_name for e in worker.parser.skill_events] == ["skill-2", "skill-3", "skill-4"]
+    assert worker.progress == (3, 5, 2 * size)
+    while worker.backfill():
+        pass
+    assert worker.progress is None
+
+    expected, _ = load_sessions(paths)
+    parser = worker.parser
+    assert [e.skill_name for e in parser.skill_events] == [e.skill_name for e in expected.skill_events]
+    assert parser.active_skill == expected.active_skill == "skill-4"
+    assert parser.used_skills == expected.used_skills
+    assert parser.session_count == 5
+    assert parser.session_id == "s4"
+
+    # Appends to an old session and to the newest both land
+    _write(paths[0], _skill_lines("late", "toolu_late"), mode="a")
+    assert worker.poll()
+    assert worker.parser.skill_events[-1].skill_name == "late"
+    assert worker.parser.active_skill == "late"  # the session written to last
+    worker.close()
+
+
+def test_first_snapshot_shows_progress_before_parsing(tmp_path):
+    project = _project(tmp_path)
+    _write(project / "s1.jsonl", _skill_lines("brainstorming", "toolu_a"))
+    snapshots = []
+    worker = _worker(tmp_path)
+    worker._on_snapshot = lambda: snapshots.append(worker.take_snapshot())
+    worker.load()
+    assert snapshots[0].loading.describe() == f"loading 0/1 sessions, {(project / 's1.jsonl').stat().st_size} B left"
+    assert snapshots[0].skill_count == 0
+    worker.close()
+
+
+def test_snapshot_versions_move_only_with_their_inputs(tmp_path):
+    project = _project(tmp_path)
+    _write(project / "s1.jsonl", _skill_lines("brainstorming", "toolu_a"))
+    worker = _worker(tmp_path)
+    worker.load()
+    worker._publish()
+    first = worker.take_snapshot().versions
+
+    worker._publish()  # nothing new
+    assert worker.take_snapshot().versions == first
+
+    _write(project / "s1.jsonl", [json.dumps({"type": "user", "message": {"content": "hi"}, "timestamp": "2026-02-07T10:00:02.000Z"})], mode="a")
+    assert worker.poll()
+    worker._publish()
+    assert worker.take_snapshot().versions == first  # a line that changes nothing shown
+
+    _write(project / "s1.jsonl", _skill_lines("writing-plans", "toolu_b"), mode="a")
+    worker.poll()
+    worker._publish()
+    latest = worker.take_snapshot().versions
+    assert latest.skills != first.skills and latest.timeline != first.timeline
+    worker.close()
+
+
+def test_config_change_reprices_without_reparsing(tmp_path):
+    project = _project(tmp_path)
+    _write(project / "s1.jsonl", _skill_lines("brainstorming", "toolu_a"))
+    config_path = tmp_path / "config.toml"
+    config_file = ConfigFile(config_path)
+    worker = _worker(tmp_path, config=config_file)
+    worker.pricing = config_file.load()["pricing"]
+    worker.load()
+    subagent = SubagentEvent(timestamp="2026-02-07T10:00:02.000Z", description="d", subagent_type="t", model="opus")
+    subagent.detail = SubagentDetail(agent_id="a1", input_tokens=1_000_000)
+    subagent.detail.cost = worker._subagent_cost(subagent)
+    worker.parser.subagents.append(subagent)
+    worker.aggregator.update_subagent(subagent)
+    worker._publish()
+    before = worker.take_snapshot()
+    assert not worker.reload_config()
+
+    config_path.write_text('[pricing."claude-opus-4-6"]\ninput = 10.0\noutput = 50.0\ncache_read = 1.0\ncache_write = 12.5\n')
+    assert worker.reload_config()
+    assert subagent.detail.cost == pytest.approx(10.0)
+    assert worker.aggregator.subagent_totals.cost == pytest.approx(10.0)
+    worker._publish()
+    after = worker.take_snapshot()
+    assert after.total_cost == pytest.approx(2 * before.total_cost)
+    assert after.versions.timeline != before.versions.timeline and after.versions.stats != before.versions.stats
+    worker.close()
+
+
+def test_rewritten_session_drops_subagent_lookups(tmp_path):
+    project = _project(tmp_path)
+    _write(project / "s1.jsonl", [
+        json.dumps({"type": "assistant", "message": {
+            "model": "claude-opus-4-6",
+            "content": [{"type": "tool_use", "id": "toolu_t", "name": "Task", "input": {"description": "d"}}],
+            "usage": {"input_tokens": 10, "output_tokens": 5}}, "timestamp": "2026-02-07T10:00:00.000Z"}),
+        json.dumps({"type": "user", "message": {"content": [
+            {"type": "tool_result", "tool_use_id": "toolu_t", "content": "done\nagentId: abc123 (for resuming)"}]},
+            "timestamp": "2026-02-07T10:05:00.000Z"}),
+    ])
+    worker = _worker(tmp_path)
+    worker.load()
+    assert worker._awaiting_transcripts == {"toolu_t"}  # no transcript on disk yet
+
+    _write(project / "s1.jsonl", _skill_lines("brainstorming", "toolu_a")[:1])
+    assert worker.poll()
+    assert worker.parser.subagents == []
+    assert worker._awaiting_transcripts == set()
+
+    (project / "s1" / "subagents").mkdir(parents=True)
+    _write(project / "s1" / "subagents" / "agent-abc123.jsonl", [json.dumps({"type": "assistant", "message": {
+        "content": [], "usage": {"input_tokens": 1, "output_tokens": 1}}})])
+    worker.poll()
+    assert worker._subagent_transcripts == {}
+    worker.close()
@@ -0,0 +1,77 @@
+# tests/test_inotify.py
+import threading
+import time
+
+import pytest
+
+from superpowers_dashboard.inotify import ChangeNotifier, inotify_available
+
+pytestmark = pytest.mark.skipif(not inotify_available(), reason="inotify not available")
+
+
+def _wait_for(event: threading.Event, timeout: float = 2.0) -> bool:
+    return event.wait(timeout)
+
+
+def test_notifier_fires_on_session_append(tmp_path):
+    session = tmp_path / "s1.jsonl"
+    session.write_text('{"type":"user"}\n')
+    fired = threading.Event()
+    notifier = ChangeNotifier(tmp_path, fired.set)
+    assert notifier.start()
+    try:
+        start = time.monotonic()
+        with open(session, "a") as f:
+            f.write('{"type":"assistant"}\n')
+        assert _wait_for(fired)
+        assert time.monotonic() - start < 0.5
+    finally:
+        notifier.stop()
+
+
+def test_notifier_ignores_non_jsonl_files(tmp_path):
+    fired = threading.Event()
+    notifier = ChangeNotifier(tmp_path, fired.set)
+    assert notifier.start()
+    try:
+        (tmp_path / "notes.txt").write_text("hello")
+        assert not fired.wait(0.2)
+    finally:
+        notifier.stop()
+
+
+def test_notifier_follows_new_subagents_directory(tmp_path):
+    """Subagent transcripts are watched even when their directories appear later."""
+    fired = threading.Event()
+    notifier = ChangeNotifier(tmp_path, fired.set)
+    assert notifier.start()
+    try:
+        subagents = tmp_path / "session1" / "subagents"
+        subagents.mkdir(parents=True)
+        assert _wait_for(fired)
+        fired.clear()
+        (subagents / "agent-abc.jsonl").write_text('{"type":"assistant"}\n')
+        assert _wait_for(fired)
+    finally:
+        notifier.stop()
+
+
+def test_notifier_watches_existing_subagents_directory(tmp_path):
+    subagents = tmp_path / "session1" / "subagents"
+    subagents.mkdir(parents=True)
+    transcript = subagents / "agent-abc.jsonl"
+    transcript.write_text("")
+    fired = threading.Event()
+    notifier = ChangeNotifier(tmp_path, fired.set)
+    assert notifier.start()
+    try:
+        with open(transcript, "a") as f:
+            f.write('{"type":"assistant"}\n')
+        assert _wait_for(fired)
+    finally:
+        notifier.stop()
+
+
+def test_notifier_start_fails_for_missing_directory(tmp_path):
+    notifier = ChangeNotifier(tmp_path / "missing", lambda: None)
+    assert not notifier.start()
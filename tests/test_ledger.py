@@ -0,0 +1,173 @@
+# tests/test_ledger.py
+import json
+import pickle
+
+import pytest
+
+from superpowers_dashboard.config import DEFAULT_PRICING
+from superpowers_dashboard.costs import calculate_cost
+import superpowers_dashboard.ledger as ledger_module
+from superpowers_dashboard.ledger import HOUR_MS, NO_SEGMENT, OVERHEAD, TOKEN_COLUMNS, UsageLedger
+from superpowers_dashboard.timestamps import parse_timestamp
+from superpowers_dashboard.watcher import SessionParser
+
+
+def _assistant(content, input_tokens=100, model="claude-opus-4-6", ts="2026-02-07T10:00:00.000Z"):
+    return json.dumps({
+        "type": "assistant",
+        "message": {"model": model, "content": content, "usage": {
+            "input_tokens": input_tokens, "output_tokens": 10,
+            "cache_read_input_tokens": 5, "cache_creation_input_tokens": 1,
+        }},
+        "timestamp": ts,
+    })
+
+
+def _skill(name, tool_use_id, ts="2026-02-07T10:00:00.000Z"):
+    return [
+        _assistant([{"type": "tool_use", "id": tool_use_id, "name": "Skill", "input": {"skill": f"superpowers:{name}"}}], ts=ts),
+        json.dumps({"type": "user", "isMeta": True, "message": {"content": "x"}, "timestamp": ts}),
+    ]
+
+
+LINES = [
+    _assistant([{"type": "text", "text": "hi"}], input_tokens=1000),
+    *_skill("brainstorming", "toolu_1"),
+    _assistant([{"type": "text", "text": "a"}], input_tokens=300, ts="2026-02-07T11:30:00.000Z"),
+    _assistant([{"type": "text", "text": "b"}], input_tokens=50, model="claude-haiku-4-5", ts="2026-02-07T11:31:00.000Z"),
+    *_skill("writing-plans", "toolu_2", ts="2026-02-07T11:32:00.000Z"),
+    _assistant([{"type": "text", "text": "c"}], input_tokens=700, model="claude-sonnet-4-5", ts="2026-02-07T12:00:00.000Z"),
+]
+
+
+def _parse(lines, session_id="s1") -> SessionParser:
+    parser = SessionParser(session_id=session_id)
+    for line in lines:
+        parser.process_line(line)
+    return parser
+
+
+def _event_tokens(event) -> list[int]:
+    return [event.input_tokens, event.output_tokens, event.cache_read_tokens, event.cache_write_tokens]
+
+
+def _matches_parser(parser: SessionParser):
+    per_event = parser.usage.by_skill_event()
+    overhead = per_event.pop(OVERHEAD, [0, 0, 0, 0])
+    assert overhead == [parser.overhead_tokens[k] for k in ("input", "output", "cache_read", "cache_write")]
+    assert per_event == {i: _event_tokens(e) for i, e in enumerate(parser.skill_events)}
+    per_segment = parser.usage.by_segment()
+    per_segment.pop(NO_SEGMENT, None)
+    for number, segment in zip(parser.segment_numbers, parser.overhead_segments):
+        assert per_segment.pop(number, [0, 0, 0, 0]) == _event_tokens(segment)
+
+
+def test_one_row_per_assistant_turn():
+    parser = _parse(LINES)
+    assert len(parser.usage) == 6
+    assert parser.usage.totals() == (1000 + 100 + 300 + 50 + 100 + 700, 60, 30, 6)
+    _matches_parser(parser)
+
+
+def test_by_model_counts_every_turn():
+    by_model = _parse(LINES).usage.by_model()
+    assert by_model["claude-opus-4-6"][0] == 1000 + 100 + 300 + 100
+    assert by_model["claude-haiku-4-5"][0] == 50
+    assert by_model["claude-sonnet-4-5"][0] == 700
+
+
+def test_by_hour_buckets_on_the_hour():
+    by_hour = _parse(LINES).usage.by_hour()
+    ten = parse_timestamp("2026-02-07T10:00:00.000Z")
+    assert sorted(by_hour) == [ten, ten + HOUR_MS, ten + 2 * HOUR_MS]
+    assert by_hour[ten + HOUR_MS][0] == 300 + 50 + 100
+
+
+def test_merge_offsets_skill_events_and_renumbers_symbols():
+    first = _parse(LINES[:4], session_id="s1")
+    second = _parse(
+        [_assistant([{"type": "text", "text": "x"}], model="claude-haiku-4-5", input_tokens=7), *LINES[4:]],
+        session_id="s2",
+    )
+    first.merge(second)
+    _matches_parser(first)
+    assert first.usage.by_model()["claude-haiku-4-5"][0] == 7 + 50
+    assert first.usage.by_session() == {"s1": [1000 + 100 + 300, 30, 15, 3], "s2": [7 + 50 + 100 + 700, 40, 20, 4]}
+
+
+def test_row_is_compact():
+    ledger = UsageLedger()
+    for i in range(1000):
+        ledger.append(i, "claude-opus-4-6", "s1", OVERHEAD, 0, 1, 2, 3, 4)
+    assert ledger.nbytes / len(ledger) <= 40
+
+
+def test_pickles_with_its_parser():
+    parser = _parse(LINES)
+    restored = pickle.loads(pickle.dumps(parser))
+    assert restored.usage.by_model() == parser.usage.by_model()
+    assert restored.usage.by_session() == {"s1": list(parser.usage.totals())}
+
+
+def test_costs_by_prices_each_turn_at_its_model():
+    parser = _parse(LINES)
+    costs = parser.usage.costs_by("skill_event", DEFAULT_PRICING)
+    expected: dict[int, float] = {}
+    for i in range(len(parser.usage)):
+        model = parser.usage.models.names[parser.usage.column("model")[i]]
+        tokens = [parser.usage.column(name)[i] for name in TOKEN_COLUMNS]
+        key = parser.usage.column("skill_event")[i]
+        expected[key] = expected.get(key, 0.0) + calculate_cost(model, *tokens, DEFAULT_PRICING)
+    assert costs == pytest.approx(expected, abs=1e-5)  # calculate_cost rounds to 6 places
+    by_model = parser.usage.costs_by("model", DEFAULT_PRICING)
+    assert by_model["claude-haiku-4-5"] == 0.0  # not a priced model id
+    assert sum(by_model.values()) == pytest.approx(sum(costs.values()))
+
+
+def test_segments_closing_out_of_order_keep_their_turns():
+    parser = SessionParser(session_id="s1")
+    parser.process_line(_assistant([{"type": "text", "text": "a"}], input_tokens=1))
+    parser.select_session("s2")
+    parser.process_line(_assistant([{"type": "text", "text": "b"}], input_tokens=2))
+    for line in _skill("brainstorming", "toolu_1"):
+        parser.process_line(line)  # closes s2's segment, opened second
+    parser.select_session("s1")
+    parser.process_line(_assistant([{"type": "text", "text": "c"}], input_tokens=4))
+    for line in _skill("writing-plans", "toolu_2"):
+        parser.process_line(line)
+    assert [s.input_tokens for s in parser.overhead_segments] == [2, 5]
+    assert list(parser.segment_numbers) == [1, 0]
+    _matches_parser(parser)
+
+
+def _views(usage: UsageLedger) -> tuple:
+    return usage.by_skill_event(), usage.by_segment(), usage.costs_by("model", DEFAULT_PRICING)
+
+
+def test_views_follow_appends_and_merges():
+    first = _parse(LINES[:4], session_id="s1")
+    before = _views(first.usage)  # remembered, then extended below
+    assert before == _views(pickle.loads(pickle.dumps(first.usage)))
+    second = _parse(LINES[4:], session_id="s2")
+    _views(second.usage)
+    first.merge(second)
+    first.process_line(LINES[0])
+    fresh = pickle.loads(pickle.dumps(first.usage))  # pickles leave remembered views behind
+    assert _views(first.usage)[:2] == _views(fresh)[:2]
+    assert _views(first.usage)[2] == pytest.approx(_views(fresh)[2])
+    _matches_parser(first)
+
+
+def test_merging_reads_only_the_new_rows(monkeypatch):
+    later = _parse(LINES, session_id="s2")
+    later.usage.costs_by("skill_event", DEFAULT_PRICING)
+    earlier = _parse(LINES[:3], session_id="s1")
+    priced = []
+    real_group_costs = ledger_module.group_costs
+    monkeypatch.setattr(
+        ledger_module, "group_costs", lambda keys, *args: priced.append(len(keys)) or real_group_costs(keys, *args),
+    )
+    earlier.merge(later)
+    costs = earlier.usage.costs_by("skill_event", DEFAULT_PRICING)
+    assert priced == [len(_parse(LINES[:3]).usage)]
+    assert sorted(costs) == [OVERHEAD, *range(len(earlier.skill_events))]
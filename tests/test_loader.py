@@ -0,0 +1,117 @@
+# tests/test_loader.py
+import json
+
+from superpowers_dashboard.cache import CheckpointCache
+from superpowers_dashboard import loader as loader_module
+from superpowers_dashboard.loader import load_sessions
+from superpowers_dashboard.tail import TailReader
+
+
+def _skill_lines(skill_name: str, tool_use_id: str, timestamp: str) -> list[str]:
+    return [
+        json.dumps({
+            "type": "assistant",
+            "message": {
+                "model": "claude-opus-4-6",
+                "content": [{"type": "tool_use", "id": tool_use_id, "name": "Skill", "input": {"skill": f"superpowers:{skill_name}"}}],
+                "usage": {"input_tokens": 100, "output_tokens": 50},
+            },
+            "timestamp": timestamp,
+        }),
+        json.dumps({"type": "user", "isMeta": True, "message": {"content": "skill"}, "timestamp": timestamp}),
+    ]
+
+
+def _turn(input_tokens: int, model: str, timestamp: str) -> str:
+    return json.dumps({
+        "type": "assistant",
+        "message": {
+            "model": model,
+            "content": [{"type": "tool_use", "id": "x", "name": "Read", "input": {}}],
+            "usage": {"input_tokens": input_tokens, "output_tokens": 10},
+        },
+        "timestamp": timestamp,
+    })
+
+
+def _make_project(tmp_path, count: int = 4):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"s{i}.jsonl"
+        ts = f"2026-02-0{i + 1}T10:00:00.000Z"
+        lines = [_turn(1000, "claude-haiku-4-5-20251001", ts)]
+        lines += _skill_lines(f"skill-{i}", f"t{i}", ts)
+        lines += [_turn(500, "claude-opus-4-6", ts)]
+        path.write_text("\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
+
+
+def _summary(parser):
+    return {
+        "skills": [(e.skill_name, e.input_tokens) for e in parser.skill_events],
+        "overhead": dict(parser.overhead_tokens),
+        "tools": dict(parser.tool_counts),
+        "models": {k: dict(v) for k, v in parser.model_usage.items()},
+        "segments": [s.input_tokens for s in parser.overhead_segments],
+        "active": parser.active_skill,
+        "used": set(parser.used_skills),
+        "sessions": parser.session_count,
+    }
+
+
+def _fail_inline(path, cache):
+    raise AssertionError("parsed in the calling process")
+
+
+def test_load_sessions_merges_in_order(tmp_path):
+    paths = _make_project(tmp_path)
+    parser, offsets = load_sessions(paths)
+    assert [e.skill_name for e in parser.skill_events] == ["skill-0", "skill-1", "skill-2", "skill-3"]
+    assert parser.session_count == 4
+    assert parser.active_skill == "skill-3"
+    assert parser.used_skills == {"skill-0", "skill-1", "skill-2"}
+    # Leading haiku turns of every session are overhead, not the previous skill
+    assert parser.overhead_tokens["input"] == 4000
+    assert offsets == {p: p.stat().st_size for p in paths}
+    assert parser.session_id == paths[-1].stem
+
+
+def test_load_sessions_pool_matches_inline(tmp_path):
+    paths = _make_project(tmp_path)
+    inline, _ = load_sessions(paths)
+    pooled, _ = load_sessions(paths, max_workers=2, pool_min_bytes=0)
+    assert _summary(pooled) == _summary(inline)
+
+
+def test_load_sessions_isolate_uses_a_single_worker_process(tmp_path, monkeypatch):
+    paths = _make_project(tmp_path)
+    inline, _ = load_sessions(paths)
+    monkeypatch.setattr(loader_module, "parse_session_file", _fail_inline)
+    isolated, offsets = load_sessions(paths, max_workers=1, pool_min_bytes=0, isolate=True)
+    assert _summary(isolated) == _summary(inline)
+    assert offsets == {p: p.stat().st_size for p in paths}
+
+
+def test_load_sessions_uses_cache(tmp_path):
+    paths = _make_project(tmp_path)
+    cache = CheckpointCache(tmp_path / "cache")
+    first, _ = load_sessions(paths, cache)
+    assert all(cache.peek(p) is not None for p in paths)
+    second, _ = load_sessions(paths, cache)
+    assert _summary(second) == _summary(first)
+
+
+def test_load_sessions_tail_continues_last_file(tmp_path):
+    paths = _make_project(tmp_path, count=2)
+    parser, offsets = load_sessions(paths)
+    with open(paths[-1], "a") as f:
+        f.write(_turn(7, "claude-opus-4-6", "2026-02-02T11:00:00.000Z") + "\n")
+    with TailReader(paths[-1], offset=offsets[paths[-1]]) as tail:
+        for line in tail.read_lines():
+            parser.process_line(line)
+    assert parser.skill_events[-1].input_tokens == 100 + 500 + 7
+
+
+def test_load_sessions_skips_missing(tmp_path):
+    assert load_sessions([tmp_path / "missing.jsonl"]) == (None, {})
@@ -0,0 +1,152 @@
+# tests/test_scheduler.py
+import json
+
+from superpowers_dashboard.scheduler import TailScheduler
+from superpowers_dashboard.watcher import SessionParser
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _skill_lines(skill_name: str, tool_use_id: str) -> list[str]:
+    return [
+        json.dumps({
+            "type": "assistant",
+            "message": {
+                "model": "claude-opus-4-6",
+                "content": [{"type": "tool_use", "id": tool_use_id, "name": "Skill", "input": {"skill": f"superpowers:{skill_name}"}}],
+                "usage": {"input_tokens": 100, "output_tokens": 50},
+            },
+            "timestamp": "2026-02-07T10:00:00.000Z",
+        }),
+        json.dumps({"type": "user", "isMeta": True, "message": {"content": "skill"}, "timestamp": "2026-02-07T10:00:01.000Z"}),
+    ]
+
+
+def _append(path, *lines: str):
+    with open(path, "a") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+
+def test_tails_every_tracked_session(tmp_path):
+    a, b = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    a.write_text("")
+    b.write_text("")
+    scheduler = TailScheduler()
+    scheduler.track(a, active=True)
+    scheduler.track(b, active=True)
+    parser = SessionParser()
+
+    _append(a, *_skill_lines("brainstorming", "toolu_a"))
+    _append(b, *_skill_lines("writing-plans", "toolu_b"))
+    assert scheduler.poll(parser).lines == 4
+    assert sorted(e.skill_name for e in parser.skill_events) == ["brainstorming", "writing-plans"]
+    assert scheduler.poll(parser).lines == 0
+    scheduler.clear()
+
+
+def test_interleaved_sessions_keep_their_own_skill_state(tmp_path):
+    """A Skill call split across polls completes even if another session wrote in between."""
+    a, b = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    a.write_text("")
+    b.write_text("")
+    scheduler = TailScheduler()
+    scheduler.track(a, active=True)
+    scheduler.track(b, active=True)
+    parser = SessionParser()
+
+    first, meta = _skill_lines("brainstorming", "toolu_a")
+    _append(a, first)
+    scheduler.poll(parser)
+    _append(b, *_skill_lines("writing-plans", "toolu_b"))
+    scheduler.poll(parser)
+    _append(a, meta)
+    scheduler.poll(parser)
+    assert [e.skill_name for e in parser.skill_events] == ["writing-plans", "brainstorming"]
+    assert parser.session_count == 2
+    scheduler.clear()
+
+
+def test_tracking_resumes_from_offset(tmp_path):
+    path = tmp_path / "s.jsonl"
+    _append(path, *_skill_lines("brainstorming", "toolu_a"))
+    offset = path.stat().st_size
+    _append(path, *_skill_lines("writing-plans", "toolu_b"))
+    scheduler = TailScheduler()
+    scheduler.track(path, offset, active=True)
+    scheduler.track(path, 0, active=True)  # already tracked: ignored
+    parser = SessionParser()
+    assert scheduler.poll(parser).lines == 2
+    assert [e.skill_name for e in parser.skill_events] == ["writing-plans"]
+    scheduler.clear()
+
+
+def test_idle_sessions_cool_down_and_are_polled_in_batches(tmp_path):
+    clock = FakeClock()
+    paths = [tmp_path / f"s{i}.jsonl" for i in range(5)]
+    for path in paths:
+        path.write_text("")
+    scheduler = TailScheduler(hot_window=10, cold_batch=2, clock=clock)
+    scheduler.track(paths[0], active=True)
+    for path in paths[1:]:
+        scheduler.track(path)
+    parser = SessionParser()
+    assert scheduler.most_recent == paths[0]
+
+    clock.now += 11
+    scheduler.poll(parser)
+    assert scheduler.most_recent is None
+    assert len(scheduler) == 5
+
+    # An idle session that resumes is picked up within a full rotation
+    _append(paths[3], *_skill_lines("brainstorming", "toolu_a"))
+    ingested = sum(scheduler.poll(parser).lines for _ in range(3))
+    assert ingested == 2
+    assert scheduler.most_recent == paths[3]
+    scheduler.clear()
+
+
+def test_most_recent_follows_the_last_written_session(tmp_path):
+    clock = FakeClock()
+    a, b = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    a.write_text("")
+    b.write_text("")
+    scheduler = TailScheduler(clock=clock)
+    scheduler.track(a, active=True)
+    clock.now += 1
+    scheduler.track(b, active=True)
+    assert scheduler.most_recent == b
+    clock.now += 1
+    _append(a, *_skill_lines("brainstorming", "toolu_a"))
+    scheduler.poll(SessionParser())
+    assert scheduler.most_recent == a
+    scheduler.clear()
+
+
+def test_rotation_is_reported(tmp_path):
+    path = tmp_path / "s.jsonl"
+    _append(path, *_skill_lines("brainstorming", "toolu_a"))
+    scheduler = TailScheduler()
+    scheduler.track(path, active=True)
+    parser = SessionParser()
+    scheduler.poll(parser)
+    path.write_text("")
+    assert scheduler.poll(parser).rotated == [path]
+    scheduler.clear()
+
+
+def test_untrack(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_text("")
+    scheduler = TailScheduler()
+    scheduler.track(path)
+    assert path in scheduler
+    scheduler.untrack(path)
+    assert path not in scheduler
+    scheduler.untrack(path)
@@ -0,0 +1,78 @@
+# tests/test_snapshot.py
+import json
+
+from superpowers_dashboard.aggregates import Aggregator
+from superpowers_dashboard.config import DEFAULT_PRICING
+from superpowers_dashboard.snapshot import LoadProgress, build_snapshot, format_size
+from superpowers_dashboard.watcher import SessionParser, SubagentDetail
+
+
+def _feed(parser, *entries):
+    for entry in entries:
+        parser.process_line(json.dumps(entry))
+
+
+def _assistant(input_tokens, content, timestamp):
+    return {
+        "type": "assistant",
+        "message": {"model": "claude-opus-4-6", "content": content, "usage": {"input_tokens": input_tokens, "output_tokens": 10}},
+        "timestamp": timestamp,
+    }
+
+
+def test_snapshot_timeline_and_totals():
+    parser = SessionParser(session_id="s1")
+    _feed(
+        parser,
+        _assistant(1000, [{"type": "text", "text": "hi"}], "2026-02-07T10:00:00.000Z"),
+        _assistant(100, [{"type": "tool_use", "id": "t1", "name": "Skill", "input": {"skill": "superpowers:brainstorming"}}], "2026-02-07T10:01:00.000Z"),
+        {"type": "user", "isMeta": True, "message": {"content": "skill"}, "timestamp": "2026-02-07T10:01:01.000Z"},
+        _assistant(500, [{"type": "text", "text": "ok"}], "2026-02-07T10:02:00.000Z"),
+    )
+    snapshot = build_snapshot(Aggregator(DEFAULT_PRICING, parser), "s1")
+    assert [e["kind"] for e in snapshot.entries] == ["overhead", "skill"]
+    assert snapshot.active_skill == "brainstorming"
+    assert snapshot.skill_count == 1
+    assert snapshot.total_input == parser.overhead_tokens["input"] + parser.skill_events[0].input_tokens
+    assert snapshot.total_cost == sum(e["cost"] for e in snapshot.entries)
+    assert [s["name"] for s in snapshot.per_skill] == ["brainstorming"]
+
+
+def test_snapshot_does_not_share_mutable_state():
+    parser = SessionParser()
+    _feed(parser, _assistant(10, [{"type": "tool_use", "id": "toolu_t", "name": "Task", "input": {"description": "d"}}], "2026-02-07T10:00:00.000Z"))
+    detail = parser.subagents[0].detail = SubagentDetail(agent_id="a", skills_invoked=["x"], input_tokens=5)
+    snapshot = build_snapshot(Aggregator(DEFAULT_PRICING, parser))
+
+    detail.input_tokens += 100
+    detail.skills_invoked.append("y")
+    parser.tool_counts["Read"] = 1
+    parser.used_skills.add("z")
+    assert snapshot.subagent_totals.tokens == 5
+    assert snapshot.subagent_totals.skills_used == 1
+    assert snapshot.entries[0]["skills_invoked"] == ["x"]
+    assert "Read" not in snapshot.tool_counts
+    assert snapshot.used_skills == frozenset()
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1_300) == "1.3 KB"
+    assert format_size(45_600_000) == "45.6 MB"
+    assert format_size(1_300_000_000) == "1.3 GB"
+
+
+def test_load_progress_describe():
+    assert LoadProgress(14, 212, 1_300_000_000).describe() == "loading 14/212 sessions, 1.3 GB left"
+
+
+def test_snapshot_entries_sort_by_time_not_text():
+    parser = SessionParser(session_id="s1")
+    _feed(
+        parser,
+        {"type": "system", "subtype": "compact_boundary", "compactMetadata": {"preTokens": 1}, "timestamp": "2026-02-07T10:30:00.000+01:00"},
+        {"type": "system", "subtype": "compact_boundary", "compactMetadata": {"preTokens": 2}, "timestamp": "2026-02-07T10:00:00.000Z"},
+    )
+    snapshot = build_snapshot(Aggregator(DEFAULT_PRICING, parser))
+    assert [e["pre_tokens"] for e in snapshot.entries] == [1, 2]
+    assert snapshot.entries[0]["clock"] == "09:30:00"
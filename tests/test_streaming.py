@@ -0,0 +1,70 @@
+# tests/test_streaming.py
+import json
+
+import pytest
+
+from superpowers_dashboard.streaming import StreamingDecodeError, extract_entry
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+SAMPLE = {
+    "type": "assistant",
+    "isMeta": False,
+    "message": {
+        "model": "claude-opus-4-6",
+        "content": [
+            {"type": "text", "text": 'quote " backslash \\ newline \n tab \t slash /'},
+            {"type": "text", "text": "unicode é 日本 \U0001F600"},
+            {"type": "tool_use", "id": "toolu_1", "name": "Read", "input": {}},
+        ],
+        "usage": {"input_tokens": 10, "output_tokens": -5, "ratio": 1.5e3, "nested": [[], [None, True]]},
+    },
+    "timestamp": "2026-02-07T10:00:00.000Z",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_extract_matches_full_decode(chunk_size, ensure_ascii):
+    """Every chunk boundary, including inside escapes, decodes identically."""
+    data = json.dumps(SAMPLE, ensure_ascii=ensure_ascii).encode()
+    assert extract_entry(_chunks(data, chunk_size), keep=None) == SAMPLE
+
+
+def test_extract_skips_unkept_top_level_fields():
+    data = json.dumps({"type": "user", "toolUseResult": {"file": {"content": "x" * 10_000}}, "timestamp": "t"}).encode()
+    assert extract_entry(_chunks(data, 100)) == {"type": "user", "timestamp": "t"}
+
+
+def test_extract_caps_long_strings_keeping_head_and_tail():
+    text = "start " + "y" * 100_000 + " agentId: abc123 (for resuming)"
+    data = json.dumps({"type": "user", "content": text}).encode()
+    content = extract_entry(_chunks(data, 4096), max_string=1024)["content"]
+    assert len(content) <= 1025
+    assert content.startswith("start ")
+    assert content.endswith("agentId: abc123 (for resuming)")
+    assert "…" in content
+
+
+def test_extract_caps_escaped_strings_losslessly_at_the_ends():
+    text = "a\n" * 50_000 + "end é"
+    data = json.dumps({"content": text}).encode()
+    content = extract_entry(_chunks(data, 333), keep=None, max_string=64)["content"]
+    assert content.startswith("a\na\n")
+    assert content.endswith("a\nend é")
+
+
+def test_extract_escaped_quote_across_chunk_boundary():
+    data = b'{"content": "a\\\\\\"b\\\\", "type": "x"}'
+    expected = json.loads(data)
+    for size in range(1, len(data)):
+        assert extract_entry(_chunks(data, size), keep=None) == expected
+
+
+@pytest.mark.parametrize("data", [b"", b"[1, 2]", b'{"a": ', b'{"a": "unterminated', b'{"a" 1}', b'{"a": nope}'])
+def test_extract_rejects_malformed_lines(data):
+    with pytest.raises(StreamingDecodeError):
+        extract_entry(_chunks(data, 4), keep=None)
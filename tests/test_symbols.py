@@ -0,0 +1,54 @@
+# tests/test_symbols.py
+import pickle
+import sys
+
+from superpowers_dashboard.symbols import MODELS, SymbolTable
+from superpowers_dashboard.watcher import CompactionEvent, OverheadSegment, SkillEvent, SubagentDetail, SubagentEvent
+
+
+def test_symbol_table_numbers_names_in_first_seen_order():
+    table = SymbolTable()
+    assert table.number("opus") == 0
+    assert table.number("haiku") == 1
+    assert table.number("opus") == 0
+    assert table.mask(["haiku", "opus"]) == 0b11
+    assert table.names_in(table.bit("haiku")) == ("haiku",)
+    assert table.names_in(0b11) == ("opus", "haiku")
+    assert table.names_in(0) == ()
+
+
+def test_symbol_table_interns_names():
+    table = SymbolTable()
+    name = "".join(["claude-", "opus"])
+    table.number(name)
+    assert table.names[0] is sys.intern("claude-opus")
+
+
+def test_skill_event_models_are_a_bitmask():
+    event = SkillEvent(skill_name="s", args="", timestamp="")
+    event.add_model("claude-opus-4-6")
+    event.add_model("claude-haiku-4-5")
+    event.add_model("claude-opus-4-6")
+    assert set(event.models) == {"claude-opus-4-6", "claude-haiku-4-5"}
+    assert event.model_mask == MODELS.mask(["claude-opus-4-6", "claude-haiku-4-5"])
+
+
+def test_skill_event_pickles_model_names_not_bits():
+    event = SkillEvent(skill_name="s", args="a", timestamp="2026-02-07T10:00:00.000Z", input_tokens=5)
+    event.add_model("claude-opus-4-6")
+    state = event.__getstate__()
+    assert ("claude-opus-4-6",) in state
+    restored = pickle.loads(pickle.dumps(event))
+    assert restored == event
+    assert restored.models == ("claude-opus-4-6",)
+
+
+def test_events_have_no_instance_dict():
+    for event in [
+        SkillEvent(skill_name="s", args="", timestamp=""),
+        CompactionEvent(timestamp="", pre_tokens=0, trigger="auto"),
+        SubagentEvent(timestamp="", description="d", subagent_type="t", model="m"),
+        SubagentDetail(agent_id="a"),
+        OverheadSegment(timestamp=""),
+    ]:
+        assert not hasattr(event, "__dict__")
@@ -0,0 +1,169 @@
+# tests/test_tail.py
+import os
+
+from superpowers_dashboard.tail import LargeLine, TailReader
+
+
+def test_tail_reads_complete_lines(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":2}\n')
+    reader = TailReader(path)
+    assert reader.read_lines() == [b'{"a":1}', b'{"b":2}']
+    assert reader.offset == path.stat().st_size
+    reader.close()
+
+
+def test_tail_buffers_partial_line_until_complete(tmp_path):
+    """A half-written line is held back, not dropped, and the offset stays before it."""
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":')
+    reader = TailReader(path)
+    assert reader.read_lines() == [b'{"a":1}']
+    assert reader.offset == 8
+    assert reader.pending_bytes == 5
+
+    with open(path, "ab") as f:
+        f.write(b'2}\n')
+    assert reader.read_lines() == [b'{"b":2}']
+    assert reader.offset == path.stat().st_size
+    assert reader.pending_bytes == 0
+    reader.close()
+
+
+def test_tail_returns_only_new_lines(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n')
+    reader = TailReader(path)
+    reader.read_lines()
+    assert reader.read_lines() == []
+    with open(path, "ab") as f:
+        f.write(b'{"c":3}\n')
+    assert reader.read_lines() == [b'{"c":3}']
+    reader.close()
+
+
+def test_tail_skips_blank_lines(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n\n  \n{"b":2}\n')
+    with TailReader(path) as reader:
+        assert reader.read_lines() == [b'{"a":1}', b'{"b":2}']
+
+
+def test_tail_line_spanning_chunks(tmp_path):
+    """Lines larger than the read chunk are reassembled."""
+    path = tmp_path / "s.jsonl"
+    long_line = b'{"x":"' + b"y" * 100 + b'"}'
+    path.write_bytes(long_line + b"\n" + b'{"z":1}\n')
+    with TailReader(path, chunk_size=16) as reader:
+        assert reader.read_lines() == [long_line, b'{"z":1}']
+
+
+def test_tail_detects_truncation(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":2}\n')
+    reader = TailReader(path)
+    reader.read_lines()
+    path.write_bytes(b'{"n":1}\n')
+    assert reader.read_lines() == [b'{"n":1}']
+    assert reader.rotated
+    assert reader.read_lines() == []
+    assert not reader.rotated
+    reader.close()
+
+
+def test_tail_detects_inode_replacement(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n')
+    reader = TailReader(path)
+    reader.read_lines()
+    replacement = tmp_path / "new.jsonl"
+    replacement.write_bytes(b'{"r":1}\n{"r":2}\n')
+    os.replace(replacement, path)
+    assert reader.read_lines() == [b'{"r":1}', b'{"r":2}']
+    assert reader.rotated
+    reader.close()
+
+
+def test_tail_missing_file(tmp_path):
+    reader = TailReader(tmp_path / "missing.jsonl")
+    assert reader.read_lines() == []
+    (tmp_path / "missing.jsonl").write_bytes(b'{"a":1}\n')
+    assert reader.read_lines() == [b'{"a":1}']
+    reader.close()
+
+
+def test_tail_resumes_from_offset(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":2}\n')
+    with TailReader(path, offset=8) as reader:
+        assert reader.read_lines() == [b'{"b":2}']
+
+
+def test_tail_early_stop_resumes_after_last_line(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":2}\n{"c":3}\n')
+    with TailReader(path) as reader:
+        for line in reader.iter_lines():
+            break
+        assert line == b'{"a":1}'
+        assert reader.read_lines() == [b'{"b":2}', b'{"c":3}']
+
+
+def test_tail_hands_out_oversized_lines_as_large_lines(tmp_path):
+    path = tmp_path / "s.jsonl"
+    big = b'{"x":"' + b"y" * 200 + b'"}'
+    path.write_bytes(b'{"a":1}\n' + big + b'\n{"b":2}\n')
+    with TailReader(path, chunk_size=16, max_line_bytes=64) as reader:
+        lines = reader.read_lines()
+        assert lines[0] == b'{"a":1}'
+        assert isinstance(lines[1], LargeLine)
+        assert (lines[1].start, len(lines[1])) == (8, len(big))
+        assert b"".join(lines[1].iter_chunks(chunk_size=50)) == big
+        assert lines[1].head(6) == b'{"x":"'
+        assert lines[2] == b'{"b":2}'
+        assert reader.offset == path.stat().st_size
+
+
+def test_tail_does_not_buffer_growing_oversized_line(tmp_path):
+    """A huge line still being written is skipped, not held, until it completes."""
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"x":"' + b"y" * 500)
+    with TailReader(path, chunk_size=64, max_line_bytes=100) as reader:
+        assert reader.read_lines() == []
+        assert reader.offset == 0
+        assert reader.pending_bytes == 506
+        assert len(reader._partial) <= 100 + 64
+        with open(path, "ab") as f:
+            f.write(b'"}\n{"b":2}\n')
+        lines = reader.read_lines()
+        assert isinstance(lines[0], LargeLine) and len(lines[0]) == 508
+        assert lines[1:] == [b'{"b":2}']
+        assert reader.offset == path.stat().st_size
+
+
+def test_tail_reopens_closed_reader_at_offset(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":')
+    reader = TailReader(path)
+    assert reader.read_lines() == [b'{"a":1}']
+    reader.close()
+    assert reader.read_lines() == []
+    with open(path, "ab") as f:
+        f.write(b'2}\n')
+    assert reader.read_lines() == [b'{"b":2}']
+    assert not reader.rotated
+    reader.close()
+
+
+def test_tail_detects_replacement_while_closed(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b'{"a":1}\n')
+    reader = TailReader(path)
+    reader.read_lines()
+    reader.close()
+    replacement = tmp_path / "new.jsonl"
+    replacement.write_bytes(b'{"r":1}\n{"r":2}\n')
+    os.replace(replacement, path)
+    assert reader.read_lines() == [b'{"r":1}', b'{"r":2}']
+    assert reader.rotated
+    reader.close()
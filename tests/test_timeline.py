@@ -0,0 +1,48 @@
+# tests/test_timeline.py
+import json
+
+from superpowers_dashboard.timeline import ParserTimeline, Timeline, merge
+from superpowers_dashboard.watcher import SessionParser
+
+
+def _compaction(timestamp, pre_tokens):
+    return json.dumps({
+        "type": "system", "subtype": "compact_boundary",
+        "compactMetadata": {"preTokens": pre_tokens}, "timestamp": timestamp,
+    })
+
+
+def test_timeline_appends_in_order_and_inserts_stragglers():
+    timeline = Timeline()
+    for ts_ms, item in [(10, "a"), (20, "b"), (20, "c"), (15, "d"), (20, "e")]:
+        timeline.add(ts_ms, item)
+    assert list(timeline) == [(10, "a"), (15, "d"), (20, "b"), (20, "c"), (20, "e")]
+    assert timeline.out_of_order == 1
+    assert len(timeline) == 5
+
+
+def test_merge_keeps_source_order_on_ties():
+    merged = merge([(1, "skill"), (3, "skill")], [(1, "overhead"), (2, "overhead")])
+    assert [item for _, item in merged] == ["skill", "overhead", "overhead", "skill"]
+
+
+def test_parser_timeline_syncs_only_new_items():
+    parser = SessionParser(session_id="s1")
+    parser.process_line(_compaction("2026-02-07T10:00:00.000Z", 1))
+    timeline = ParserTimeline(parser)
+    parser.process_line(_compaction("2026-02-07T09:00:00.000Z", 2))
+    parser.process_line(_compaction("2026-02-07T11:00:00.000Z", 3))
+    timeline.sync()
+    timeline.sync()
+    assert [parser.compactions[i].pre_tokens for _, i in timeline["compactions"]] == [2, 1, 3]
+    assert timeline["compactions"].out_of_order == 1
+
+
+def test_parser_timeline_attach_rebuilds():
+    first, second = SessionParser(session_id="s1"), SessionParser(session_id="s2")
+    first.process_line(_compaction("2026-02-07T10:00:00.000Z", 1))
+    second.process_line(_compaction("2026-02-07T11:00:00.000Z", 2))
+    timeline = ParserTimeline(second)
+    first.merge(second)
+    timeline.attach(first)
+    assert [i for _, i in timeline["compactions"]] == [0, 1]
@@ -0,0 +1,35 @@
+# tests/test_timestamps.py
+from superpowers_dashboard.timestamps import UNKNOWN_CLOCK, format_clock, parse_timestamp, stamp
+from superpowers_dashboard.watcher import CompactionEvent, OverheadSegment, SkillEvent, SubagentEvent
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("1970-01-01T00:00:01.500Z") == 1500
+    assert parse_timestamp("2026-02-06T22:16:50.558Z") == 1770416210558
+    assert parse_timestamp("2026-02-06T23:16:50.558+01:00") == 1770416210558
+    assert parse_timestamp("2026-02-06T22:16:50.558") == 1770416210558  # naive means UTC
+    assert parse_timestamp("yesterday") is None
+
+
+def test_format_clock():
+    assert format_clock(1770416210558) == "22:16:50"
+    assert format_clock(0) == "00:00:00"
+
+
+def test_stamp():
+    assert stamp("2026-02-06T22:16:50.558Z") == (1770416210558, "22:16:50")
+    assert stamp("") == (0, "")
+    assert stamp("garbage") == (0, UNKNOWN_CLOCK)
+
+
+def test_events_parse_their_timestamp_once():
+    ts = "2026-02-06T22:16:50.558Z"
+    events = [
+        SkillEvent(skill_name="s", args="", timestamp=ts),
+        CompactionEvent(timestamp=ts, pre_tokens=0, trigger="auto"),
+        SubagentEvent(timestamp=ts, description="d", subagent_type="t", model="m"),
+        OverheadSegment(timestamp=ts),
+    ]
+    for event in events:
+        assert (event.ts_ms, event.clock) == (1770416210558, "22:16:50")
+    assert events[0].start_time.timestamp() == 1770416210.558
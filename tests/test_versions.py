@@ -0,0 +1,79 @@
+# tests/test_versions.py
+import json
+
+from superpowers_dashboard.versions import RenderStats, VersionTracker, WidgetVersions
+from superpowers_dashboard.watcher import SessionParser
+
+TS = "2026-02-07T10:00:00.000Z"
+
+
+def _assistant(content, input_tokens=100):
+    return json.dumps({
+        "type": "assistant",
+        "message": {"model": "claude-opus-4-6", "content": content, "usage": {"input_tokens": input_tokens, "output_tokens": 10}},
+        "timestamp": TS,
+    })
+
+
+def _changed(before: WidgetVersions, after: WidgetVersions) -> set[str]:
+    return {name for name in WidgetVersions._fields if getattr(before, name) != getattr(after, name)}
+
+
+def test_events_bump_only_the_inputs_they_change():
+    parser = SessionParser(session_id="s1")
+    tracker = VersionTracker(parser)
+
+    before = tracker.current
+    parser.process_line(_assistant([{"type": "text", "text": "hi"}]))
+    assert _changed(before, tracker.current) == {"timeline", "stats", "header"}
+
+    before = tracker.current
+    parser.process_line(_assistant([{"type": "tool_use", "id": "toolu_s", "name": "Skill", "input": {"skill": "superpowers:brainstorming"}}]))
+    parser.process_line(json.dumps({"type": "user", "isMeta": True, "message": {"content": "x"}, "timestamp": TS}))
+    assert _changed(before, tracker.current) == {"skills", "timeline", "stats", "header"}
+
+    before = tracker.current
+    parser.process_line(json.dumps({"type": "user", "message": {"content": "plain"}, "timestamp": TS}))
+    assert _changed(before, tracker.current) == set()
+
+
+def test_sync_picks_up_a_session_switch():
+    parser = SessionParser(session_id="s1")
+    parser.process_line(_assistant([{"type": "tool_use", "id": "toolu_s", "name": "Skill", "input": {"skill": "superpowers:brainstorming"}}]))
+    parser.process_line(json.dumps({"type": "user", "isMeta": True, "message": {"content": "x"}, "timestamp": TS}))
+    tracker = VersionTracker(parser)
+
+    before = tracker.current
+    parser.select_session("s2")
+    tracker.sync()
+    assert _changed(before, tracker.current) == {"skills", "timeline", "stats"}
+
+
+def test_attach_and_bump():
+    tracker = VersionTracker()
+    before = tracker.current
+    tracker.attach(SessionParser())
+    assert _changed(before, tracker.current) == set(WidgetVersions._fields)
+
+    before = tracker.current
+    tracker.bump("header")
+    assert _changed(before, tracker.current) == {"header"}
+
+
+def test_attach_stops_following_the_previous_parser():
+    old = SessionParser(session_id="s1")
+    tracker = VersionTracker(old)
+    tracker.attach(SessionParser())
+    before = tracker.current
+    old.process_line(_assistant([{"type": "text", "text": "hi"}]))
+    assert tracker.current == before
+
+
+def test_render_stats():
+    stats = RenderStats()
+    stats.record("timeline", True)
+    stats.record("timeline", False)
+    stats.record("timeline", False)
+    assert stats.performed["timeline"] == 1
+    assert stats.skipped["timeline"] == 2
+    assert "timeline 1 rendered/2 skipped" in str(stats)
@@ -1,9 +1,10 @@
 # tests/test_watcher.py
 import json
 from pathlib import Path
+from superpowers_dashboard.tail import DEFAULT_MAX_LINE_BYTES, TailReader
 from superpowers_dashboard.watcher import (
     SessionParser, SkillEvent, CompactionEvent, OverheadSegment,
-    SubagentDetail, SubagentEvent,
+    SubagentDetail, SubagentEvent, SubagentTranscript,
     extract_agent_id, parse_subagent_transcript, find_subagent_file,
 )
 
@@ -636,9 +637,21 @@ def test_parser_extracts_agent_id_from_tool_result():
 def test_parser_handles_tool_result_list_content():
     """Process a tool_result where content is a list of dicts with text.
 
-    The parser should still extract the agent_id from the joined text.
+    The parser should still extract the agent_id from the trailing text block.
     """
     parser = SessionParser()
+    parser.process_line(json.dumps({
+        "type": "assistant",
+        "message": {
+            "model": "claude-opus-4-6",
+            "content": [{"type": "tool_use", "id": "toolu_task2", "name": "Task", "input": {
+                "description": "Review feature X",
+                "subagent_type": "general-purpose",
+            }}],
+            "usage": {"input_tokens": 10, "output_tokens": 5, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0},
+        },
+        "timestamp": "2026-02-07T10:09:00.000Z",
+    }))
     parser.process_line(json.dumps({
         "type": "user",
         "message": {
@@ -673,6 +686,7 @@ def test_parser_detects_hook_events():
     assert parser.hook_events[0]["event"] == "PreToolUse"
     assert parser.hook_events[0]["hook_type"] == "pre_tool_use"
     assert parser.hook_events[0]["timestamp"] == "2026-02-07T12:00:00.000Z"
+    assert parser.hook_events[0]["ts_ms"] == 1770465600000
 
 
 def test_parser_ignores_non_hook_progress():
@@ -745,3 +759,411 @@ def test_subagent_event_has_role_field():
         model="inherit",
     )
     assert event.role == ""
+
+
+def test_parser_accepts_bytes_lines():
+    """Lines straight from the binary tail reader are parsed like str lines."""
+    parser = SessionParser()
+    for line in _make_skill_invocation("brainstorming", tool_use_id="t1"):
+        parser.process_line(line.encode())
+    assert parser.active_skill == "brainstorming"
+
+
+def test_parse_subagent_transcript_ignores_partial_last_line(tmp_path):
+    """An unterminated trailing line is still being written and is not parsed."""
+    transcript = tmp_path / "agent-abc123.jsonl"
+    complete = json.dumps({
+        "type": "assistant",
+        "message": {"content": [], "usage": {"input_tokens": 100, "output_tokens": 10}},
+    })
+    transcript.write_text(complete + "\n" + '{"type": "assistant", "message": {"usage": {"input_')
+    detail = parse_subagent_transcript(transcript)
+    assert detail.input_tokens == 100
+
+
+def test_merge_combines_session_totals():
+    """Merging per-file parsers sums counts and concatenates events in order."""
+    first = SessionParser()
+    for line in _make_skill_invocation("brainstorming", tool_use_id="t1", timestamp="2026-02-06T22:00:00.000Z"):
+        first.process_line(line)
+    second = SessionParser()
+    second.process_line(json.dumps({
+        "type": "system", "subtype": "compact_boundary",
+        "compactMetadata": {"preTokens": 1000, "trigger": "auto"},
+        "timestamp": "2026-02-07T08:00:00.000Z",
+    }))
+    for line in _make_skill_invocation("writing-plans", tool_use_id="t2", timestamp="2026-02-07T09:00:00.000Z"):
+        second.process_line(line)
+
+    first.merge(second)
+    assert [e.skill_name for e in first.skill_events] == ["brainstorming", "writing-plans"]
+    assert first.tool_counts == {"Skill": 2}
+    assert len(first.compactions) == 1
+    assert first.session_count == 2
+    assert first.active_skill == "writing-plans"
+    assert "brainstorming" in first.used_skills
+
+
+def test_merge_starts_later_session_without_active_skill():
+    """Tokens in a new session are overhead even if the previous session ended mid-skill."""
+    first = SessionParser()
+    for line in _make_skill_invocation("brainstorming", tool_use_id="t1"):
+        first.process_line(line)
+    second = SessionParser()
+    second.process_line(json.dumps({
+        "type": "assistant",
+        "message": {"model": "claude-opus-4-6", "content": [], "usage": {"input_tokens": 700, "output_tokens": 10}},
+        "timestamp": "2026-02-07T10:00:00.000Z",
+    }))
+
+    first.merge(second)
+    assert first.active_skill is None
+    assert "brainstorming" in first.used_skills
+    assert first.skill_events[0].input_tokens == 100
+    assert first.overhead_tokens["input"] == 700
+    assert first.model_usage["claude-opus-4-6"]["input_tokens"] == 100 + 700  # the Skill call counts too
+
+
+def test_merge_closes_open_overhead_and_continues_later_state():
+    first = SessionParser()
+    first.process_line(json.dumps({
+        "type": "assistant",
+        "message": {"model": "claude-opus-4-6", "content": [{"type": "tool_use", "id": "r", "name": "Read", "input": {}}],
+                    "usage": {"input_tokens": 10, "output_tokens": 1}},
+        "timestamp": "2026-02-07T10:00:00.000Z",
+    }))
+    second = SessionParser()
+    for line in _make_skill_invocation("brainstorming", tool_use_id="t1")[:1]:
+        second.process_line(line)
+
+    first.merge(second)
+    assert len(first.overhead_segments) == 1
+    assert first.overhead_segments[0].input_tokens == 10
+    # The later file's pending skill survives, so its isMeta line can still land
+    for line in _make_skill_invocation("brainstorming", tool_use_id="t1")[1:]:
+        first.process_line(line)
+    assert first.active_skill == "brainstorming"
+
+
+def test_sniff_type_reads_leading_or_trailing_top_level_type():
+    from superpowers_dashboard.watcher import sniff_type
+    user = b'{"parentUuid":"p","type":"user","message":{"content":[{"type":"tool_result","content":"x"}]}}'
+    assistant = b'{"parentUuid":"p","message":{"type":"message","content":[{"type":"text"}]},"type":"assistant","uuid":"u"}'
+    assert sniff_type(user) == b"user"
+    assert sniff_type(assistant) == b"assistant"
+    assert sniff_type(b'{"type": "system", "subtype": "turn_duration"}') == b"system"
+
+
+def test_sniff_type_ignores_escaped_and_unsure_positions():
+    from superpowers_dashboard.watcher import sniff_type
+    # "type" only inside a string value: no certain answer
+    assert sniff_type(b'{"a":{"b":1},"text":"\\"type\\":\\"user\\"","c":{"d":2}}') is None
+    # Top-level type sandwiched between nested objects is not guessed at
+    assert sniff_type(b'{"a":{"type":"user"},"type":"assistant","c":{"d":2}}') is None
+
+
+def test_wants_line_skips_unhandled_entries():
+    parser = SessionParser()
+    assert not parser.wants_line(b'{"type":"file-history-snapshot","snapshot":{"files":{}}}')
+    assert not parser.wants_line(b'{"type":"progress","data":{"type":"bash_progress","output":"x"}}')
+    assert parser.wants_line(b'{"type":"progress","data":{"type":"hook_progress","hookEventName":"Stop"}}')
+    assert not parser.wants_line(b'{"type":"system","subtype":"informational","content":"hi"}')
+    assert parser.wants_line(b'{"type":"system","subtype":"turn_duration","durationMs":5}')
+    assert not parser.wants_line(b'{"type":"user","message":{"content":[{"type":"tool_result","content":"big"}]}}')
+    assert parser.wants_line(b'{"message":{"content":[]},"type":"assistant"}')
+
+
+def test_wants_line_keeps_is_meta_only_while_skill_pending():
+    parser = SessionParser()
+    meta = b'{"type":"user","isMeta":true,"message":{"content":"# skill"}}'
+    assert not parser.wants_line(meta)
+    parser.process_line(_make_skill_invocation("brainstorming", tool_use_id="t1")[0].encode())
+    assert parser.wants_line(meta)
+
+
+def test_prefiltered_bytes_match_str_parsing():
+    """Skipping lines at the byte level must not change the parse result."""
+    lines = _make_skill_invocation("brainstorming", tool_use_id="t1")
+    lines.append(json.dumps({"type": "progress", "data": {"type": "bash_progress"}, "timestamp": "2026-02-06T22:17:00.000Z"}))
+    lines.append(json.dumps({"type": "progress", "data": {"type": "hook_progress", "hookEventName": "Stop"}, "timestamp": "2026-02-06T22:17:00.000Z"}))
+    lines.append(json.dumps({"type": "system", "subtype": "turn_duration", "durationMs": 100, "timestamp": "2026-02-06T22:18:00.000Z"}))
+    from_str, from_bytes = SessionParser(), SessionParser()
+    for line in lines:
+        from_str.process_line(line)
+        from_bytes.process_line(line.encode())
+    assert from_bytes.skill_events == from_str.skill_events
+    assert from_bytes.hook_events == from_str.hook_events
+    assert from_bytes.tool_counts == from_str.tool_counts
+
+
+def _task_dispatch(tool_use_id: str) -> str:
+    return json.dumps({
+        "type": "assistant",
+        "message": {
+            "model": "claude-opus-4-6",
+            "content": [{"type": "tool_use", "id": tool_use_id, "name": "Task", "input": {
+                "description": "Do the thing",
+                "subagent_type": "general-purpose",
+            }}],
+            "usage": {"input_tokens": 10, "output_tokens": 5, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0},
+        },
+        "timestamp": "2026-02-07T10:00:00.000Z",
+    })
+
+
+def _tool_result(tool_use_id: str, content) -> str:
+    return json.dumps({
+        "type": "user",
+        "message": {"role": "user", "content": [{
+            "type": "tool_result", "tool_use_id": tool_use_id, "content": content,
+        }]},
+        "timestamp": "2026-02-07T10:05:00.000Z",
+    })
+
+
+def test_parser_ignores_agent_id_in_non_task_results():
+    """Only results of Task dispatches are searched for an agentId trailer."""
+    parser = SessionParser()
+    parser.process_line(_tool_result("toolu_bash1", "cat log\nagentId: deadbeef (for resuming)"))
+    assert parser.agent_id_map == {}
+
+
+def test_parser_closes_task_after_its_result():
+    """A Task result is matched once; later results reusing the id are ignored."""
+    parser = SessionParser()
+    parser.process_line(_task_dispatch("toolu_t1"))
+    assert parser._open_tasks == {"toolu_t1"}
+    parser.process_line(_tool_result("toolu_t1", "done\nagentId: abc123 (for resuming)"))
+    assert parser.agent_id_map == {"toolu_t1": "abc123"}
+    assert parser._open_tasks == set()
+    assert not parser.wants_line(_tool_result("toolu_t1", "agentId: fff (for resuming)").encode())
+
+
+def test_parser_uses_last_agent_id_trailer():
+    """The trailer follows the subagent's output, which may itself mention agentIds."""
+    parser = SessionParser()
+    parser.process_line(_task_dispatch("toolu_t2"))
+    parser.process_line(_tool_result("toolu_t2", [
+        {"type": "text", "text": "Earlier agent was agentId: 111111 (for resuming)"},
+        {"type": "text", "text": "agentId: 222222 (for resuming)"},
+    ]))
+    assert parser.agent_id_map == {"toolu_t2": "222222"}
+
+
+def test_wants_line_skips_user_lines_without_open_tasks():
+    parser = SessionParser()
+    line = _tool_result("toolu_x", "agentId: abc123").encode()
+    assert not parser.wants_line(line)
+    parser.process_line(_task_dispatch("toolu_x"))
+    assert parser.wants_line(line)
+    assert not parser.wants_line(_tool_result("toolu_other", "agentId: abc123").encode())
+
+
+def _parse_with_limit(path, max_line_bytes):
+    parser = SessionParser()
+    with TailReader(path, max_line_bytes=max_line_bytes) as reader:
+        for line in reader.iter_lines():
+            parser.process_line(line)
+    return parser
+
+
+def test_oversized_lines_parse_like_regular_ones(tmp_path):
+    """Lines above the reader's limit go through the streaming extractor with the same result."""
+    path = tmp_path / "s.jsonl"
+    huge = "x" * 50_000
+    lines = [
+        _task_dispatch("toolu_big"),
+        json.dumps({"type": "assistant", "message": {"model": "claude-opus-4-6", "content": [
+            {"type": "text", "text": huge},
+            {"type": "tool_use", "id": "toolu_r", "name": "Read", "input": {"file_path": "/a"}}],
+            "usage": {"input_tokens": 100, "output_tokens": 50, "cache_read_input_tokens": 7, "cache_creation_input_tokens": 3}},
+            "timestamp": "2026-02-07T10:01:00.000Z", "toolUseResult": {"file": {"content": huge}}}),
+        _tool_result("toolu_r", huge),
+        _tool_result("toolu_big", [{"type": "text", "text": huge + "\nagentId: abc123 (for resuming)"}]),
+        json.dumps({"type": "file-history-snapshot", "snapshot": {"blob": huge}}),
+    ]
+    path.write_text("\n".join(lines) + "\n")
+
+    regular = _parse_with_limit(path, 1 << 30)
+    streamed = _parse_with_limit(path, 1024)
+    assert streamed.agent_id_map == regular.agent_id_map == {"toolu_big": "abc123"}
+    assert streamed.tool_counts == regular.tool_counts == {"Task": 1, "Read": 1}
+    assert streamed.model_usage == regular.model_usage
+    assert streamed.overhead_tokens == regular.overhead_tokens
+
+
+def test_wants_line_classifies_large_lines_from_their_head(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_text(
+        _tool_result("toolu_r", "x" * 5000) + "\n"
+        + json.dumps({"type": "file-history-snapshot", "snapshot": {"blob": "x" * 5000}}) + "\n"
+    )
+    parser = SessionParser()
+    with TailReader(path, max_line_bytes=1024) as reader:
+        user, snapshot = reader.read_lines()
+        assert not parser.wants_line(user)
+        assert not parser.wants_line(snapshot)
+        parser._open_tasks.add("toolu_other")
+        assert parser.wants_line(user)
+
+
+def test_subagent_transcript_with_oversized_line(tmp_path):
+    path = tmp_path / "agent-abc.jsonl"
+    path.write_text(json.dumps({"type": "assistant", "message": {"content": [
+        {"type": "text", "text": "x" * (DEFAULT_MAX_LINE_BYTES + 1)},
+        {"type": "tool_use", "name": "Bash", "input": {"command": "ls"}}],
+        "usage": {"input_tokens": 10, "output_tokens": 5}}}) + "\n")
+    detail = parse_subagent_transcript(path)
+    assert detail.tool_counts == {"Bash": 1}
+    assert detail.input_tokens == 10
+
+
+def _agent_progress(parent_tool_use_id: str, agent_id: str) -> str:
+    return json.dumps({
+        "type": "progress",
+        "data": {"type": "agent_progress", "agentId": agent_id, "prompt": "Do the thing",
+                 "message": {"type": "assistant", "message": {"content": [{"type": "text", "text": "working"}]}}},
+        "parentToolUseID": parent_tool_use_id,
+        "toolUseID": "agent_msg_1",
+        "timestamp": "2026-02-07T10:01:00.000Z",
+    })
+
+
+def test_parser_marks_subagent_complete_on_result():
+    parser = SessionParser()
+    parser.process_line(_task_dispatch("toolu_t3"))
+    assert parser.subagents[0].status == "running"
+    parser.process_line(_tool_result("toolu_t3", "done\nagentId: abc123 (for resuming)"))
+    assert parser.subagents[0].status == "complete"
+
+
+def test_parser_maps_agent_id_from_agent_progress():
+    """agent_progress entries reveal a running subagent's id before its result arrives."""
+    parser = SessionParser()
+    parser.process_line(_task_dispatch("toolu_t4"))
+    assert parser.wants_line(_agent_progress("toolu_t4", "fed123").encode())
+    parser.process_line(_agent_progress("toolu_t4", "fed123").encode())
+    assert parser.agent_id_map == {"toolu_t4": "fed123"}
+    assert parser.subagents[0].status == "running"
+    # Once mapped, further progress for that Task is not decoded
+    assert not parser.wants_line(_agent_progress("toolu_t4", "fed123").encode())
+    assert not parser.wants_line(_agent_progress("toolu_unknown", "999").encode())
+
+
+def test_merge_keeps_dispatches_of_both_sessions_open():
+    """Sessions may run concurrently, so an earlier session's Task can still finish."""
+    earlier = SessionParser()
+    earlier.process_line(_task_dispatch("toolu_old"))
+    later = SessionParser()
+    later.process_line(_task_dispatch("toolu_new"))
+    earlier.merge(later)
+    assert earlier._open_tasks == {"toolu_old", "toolu_new"}
+    earlier.process_line(_tool_result("toolu_old", "done\nagentId: abc123 (for resuming)"))
+    assert [s.status for s in earlier.subagents] == ["complete", "running"]
+
+
+def _subagent_turn(input_tokens: int, tool: str | None = None, stop_reason: str | None = None) -> str:
+    content = [{"type": "tool_use", "name": tool, "input": {}}] if tool else [{"type": "text", "text": "ok"}]
+    return json.dumps({"type": "assistant", "message": {
+        "content": content, "stop_reason": stop_reason,
+        "usage": {"input_tokens": input_tokens, "output_tokens": 1}}})
+
+
+def test_subagent_transcript_reads_appended_lines_only(tmp_path):
+    path = tmp_path / "agent-abc123.jsonl"
+    path.write_text(_subagent_turn(100, tool="Read", stop_reason="tool_use") + "\n")
+    transcript = SubagentTranscript(path)
+    assert transcript.update()
+    assert transcript.detail.agent_id == "abc123"
+    assert transcript.detail.input_tokens == 100
+    assert not transcript.detail.finished
+    assert not transcript.update()
+
+    with open(path, "a") as f:
+        f.write(_subagent_turn(50, tool="Bash") + "\n")
+        f.write(_subagent_turn(25, stop_reason="end_turn") + "\n")
+    assert transcript.update()
+    assert transcript.detail.input_tokens == 175
+    assert transcript.detail.tool_counts == {"Read": 1, "Bash": 1}
+    assert transcript.detail.finished
+    transcript.close()
+
+
+def test_subagent_transcript_restarts_when_rewritten(tmp_path):
+    path = tmp_path / "agent-abc123.jsonl"
+    path.write_text(_subagent_turn(100) + "\n" + _subagent_turn(100) + "\n")
+    transcript = SubagentTranscript(path)
+    transcript.update()
+    first = transcript.detail
+    path.write_text(_subagent_turn(7) + "\n")
+    assert transcript.update()
+    assert transcript.detail is not first
+    assert transcript.detail.input_tokens == 7
+    transcript.close()
+
+
+def _broken_lines(line: str) -> list[str]:
+    """A truncated copy of ``line`` and one that is not JSON past its type."""
+    return [line[: len(line) // 2], '{"type": "assistant", "message": {"usage": oops}}']
+
+
+def test_malformed_lines_are_skipped(tmp_path):
+    good = json.dumps({"type": "assistant", "message": {
+        "model": "claude-opus-4-6", "content": [{"type": "text", "text": "x" * 5000}],
+        "usage": {"input_tokens": 100, "output_tokens": 1}}, "timestamp": "2026-02-07T10:00:00.000Z"})
+    parser = SessionParser()
+    for bad in _broken_lines(good):
+        parser.process_line(bad)
+        parser.process_line(bad.encode())
+    parser.process_line(good)
+    assert parser.overhead_tokens["input"] == 100
+
+    path = tmp_path / "s.jsonl"
+    path.write_text("\n".join([*_broken_lines(good), good]) + "\n")
+    assert _parse_with_limit(path, 1024).overhead_tokens["input"] == 100  # the truncated line is a LargeLine
+
+
+def test_subagent_transcript_skips_malformed_lines(tmp_path):
+    small = _subagent_turn(100)
+    large = json.dumps({"type": "assistant", "message": {
+        "content": [{"type": "text", "text": "x" * (2 * DEFAULT_MAX_LINE_BYTES + 2)}],
+        "usage": {"input_tokens": 10, "output_tokens": 1}}})
+    path = tmp_path / "agent-abc123.jsonl"
+    path.write_text("\n".join([*_broken_lines(small), *_broken_lines(large), small, large]) + "\n")
+    transcript = SubagentTranscript(path)
+    assert transcript.update()
+    assert transcript.detail.input_tokens == 110
+    transcript.close()
+
+
+def test_select_session_keeps_skill_state_per_session():
+    """Interleaved lines from two sessions each resolve against their own skill state."""
+    parser = SessionParser(session_id="s1")
+    parser.process_line(_make_skill_invocation("brainstorming", tool_use_id="toolu_a")[0])
+    parser.select_session("s2")
+    assert parser.active_skill is None
+    for line in _make_skill_invocation("writing-plans", tool_use_id="toolu_b"):
+        parser.process_line(line)
+    parser.select_session("s1")
+    # The Skill call made in s1 completes with s1's own isMeta line
+    parser.process_line(_make_skill_invocation("brainstorming", tool_use_id="toolu_a")[2])
+    assert [e.skill_name for e in parser.skill_events] == ["writing-plans", "brainstorming"]
+    assert parser.active_skill == "brainstorming"
+    parser.select_session("s2")
+    assert parser.active_skill == "writing-plans"
+    assert parser.session_count == 2
+
+
+def test_select_session_adopts_first_name():
+    parser = SessionParser()
+    parser.select_session("s1")
+    assert parser.session_id == "s1"
+    assert parser.session_count == 1
+
+
+def test_subagents_record_their_session():
+    parser = SessionParser(session_id="s1")
+    parser.process_line(_task_dispatch("toolu_t1"))
+    parser.select_session("s2")
+    parser.process_line(_task_dispatch("toolu_t2"))
+    assert [(s.tool_use_id, s.session_id) for s in parser.subagents] == [("toolu_t1", "s1"), ("toolu_t2", "s2")]
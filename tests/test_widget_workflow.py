@@ -124,7 +124,7 @@ def test_workflow_timeline_with_overhead():
         },
     ]
     w.update_timeline(entries)
-    content = w._Static__content
+    content = "\n".join(w.rows)
     # Skill entries should use circled numbers
     assert "\u2460" in content  # ① for first skill
     assert "brainstorming" in content
@@ -167,7 +167,7 @@ def test_workflow_timeline_with_compaction():
         },
     ]
     w.update_timeline(entries)
-    content = w._Static__content
+    content = "\n".join(w.rows)
     assert "COMPACTION" in content
     assert "169,162" in content
     assert "brainstorming" in content
@@ -188,7 +188,7 @@ def test_workflow_timeline_backwards_compat():
         },
     ]
     w.update_timeline(entries)
-    content = w._Static__content
+    content = "\n".join(w.rows)
     assert "brainstorming" in content
     assert "\u2460" in content
 
@@ -257,7 +257,7 @@ def test_workflow_timeline_with_subagent():
         },
     ]
     w.update_timeline(entries)
-    content = w._Static__content
+    content = "\n".join(w.rows)
     # Skill entries should use circled numbers
     assert "\u2460" in content  # ① for first skill
     assert "brainstorming" in content
@@ -344,7 +344,7 @@ def test_workflow_timeline_with_task_groups():
         },
     ]
     w.update_timeline(entries)
-    content = w._Static__content
+    content = "\n".join(w.rows)
     assert "subagent-driven-development" in content
     assert "Task 1" in content
     assert "Fix bug" in content
@@ -379,6 +379,61 @@ def test_workflow_timeline_ungrouped_still_works():
         },
     ]
     w.update_timeline(entries)
-    content = w._Static__content
+    content = "\n".join(w.rows)
     assert "\u25b6" in content  # ▶
     assert "Explore skills" in content
+
+
+def test_workflow_timeline_rows():
+    """The timeline is one row per line, with a separator row between entries."""
+    w = WorkflowWidget()
+    w.update_timeline([
+        {"kind": "compaction", "timestamp": "2026-02-07T10:00:00.000Z", "compaction_kind": "compaction", "pre_tokens": 1000},
+        {"kind": "compaction", "timestamp": "2026-02-07T10:01:00.000Z", "compaction_kind": "clear", "pre_tokens": 2000},
+    ])
+    assert len(w.rows) == 3
+    assert w.rows[1] == "   ▼"
+    assert "CLEAR" in w.rows[2]
+    assert w.virtual_size.height == 3
+    assert w.virtual_size.width == max(len(row) for row in w.rows)
+
+    w.update_timeline([])
+    assert w.rows == ["  No skills invoked yet."]
+
+
+def _skill_entry(name, cost, timestamp, is_active=False):
+    return {
+        "kind": "skill", "timestamp": timestamp, "skill_name": name, "args": "",
+        "total_tokens": 1000, "cost": cost, "duration_seconds": 60, "is_active": is_active,
+    }
+
+
+def test_workflow_timeline_reformats_only_changed_entries():
+    w = WorkflowWidget()
+    finished = _skill_entry("brainstorming", 0.50, "2026-02-07T10:00:00.000Z")
+    w.update_timeline([finished, _skill_entry("writing-plans", 0.10, "2026-02-07T10:05:00.000Z", is_active=True)])
+    assert w.render_misses == 2
+
+    w.update_timeline([dict(finished), _skill_entry("writing-plans", 0.20, "2026-02-07T10:05:00.000Z", is_active=True)])
+    assert w.render_misses == 3
+    assert "$0.20" in "\n".join(w.rows)
+
+    w.update_timeline([dict(finished), _skill_entry("writing-plans", 0.20, "2026-02-07T10:05:00.000Z", is_active=True)])
+    assert w.render_misses == 3
+
+
+def test_workflow_timeline_reformats_changed_task_group_only():
+    from superpowers_dashboard.grouping import TaskGroup
+
+    def entry(status):
+        group = TaskGroup(task_number=1, label="Setup", subagents=[
+            {"role": "implementer", "total_tokens": 100, "cost": 0.1, "status": status},
+        ])
+        return {**_skill_entry("executing-plans", 0.5, "2026-02-07T10:00:00.000Z"), "task_groups": {1: group}}
+
+    w = WorkflowWidget()
+    w.update_timeline([entry("running")])
+    assert w.render_misses == 2
+    w.update_timeline([entry("complete")])
+    assert w.render_misses == 3
+    assert "✓" in "\n".join(w.rows)